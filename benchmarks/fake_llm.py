@@ -0,0 +1,62 @@
+# benchmarks/fake_llm.py
+"""
+Offline stand-in for the OpenAI client, so benchmarks measure the evaluator rather than
+the network.
+"""
+import hashlib
+import json
+import re
+import time
+from types import SimpleNamespace
+
+# Requirement lines of utils.llm_utils.build_batch_prompt, e.g. "3. Handle empty
+# datasets."
+REQUIREMENT = re.compile(r'^\s*(\d+)\. (.+)$', re.MULTILINE)
+
+
+def fake_verdict(requirement):
+    # Same verdict for the same requirement on every run and machine
+    return int(hashlib.sha256(requirement.encode('utf-8')).hexdigest()[:8], 16) % 2 == 0
+
+
+class FakeLLMClient:
+    """
+    Answers chat completion requests for batched requirement assessments like the OpenAI
+    client would, with verdicts derived from a hash of each requirement.
+    Parameters:
+        - latency: Seconds each request takes, to model a remote API; 0 answers
+          immediately.
+    """
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.requests = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, model, messages, **kwargs):
+        self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+        prompt = messages[-1]['content']
+        requirements = prompt.split('Requirements:', 1)[-1]
+        verdicts = [{'id': int(number), 'covered': fake_verdict(requirement.strip())}
+                    for number, requirement in REQUIREMENT.findall(requirements)]
+        content = json.dumps({'verdicts': verdicts})
+        # Roughly four characters per token, like the tokenizers of the OpenAI models
+        prompt_characters = sum(len(message['content']) for message in messages)
+        usage = SimpleNamespace(prompt_tokens=prompt_characters // 4,
+                                completion_tokens=len(content) // 4)
+        message = SimpleNamespace(content=content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=usage)
+
+
+def install(latency=0.0):
+    """
+    Makes utils.llm_utils use a FakeLLMClient instead of creating an OpenAI client.
+    Returns:
+        - The installed client.
+    """
+    from utils import llm_utils
+
+    llm_utils._client = FakeLLMClient(latency)
+    return llm_utils._client
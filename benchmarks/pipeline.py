@@ -0,0 +1,300 @@
+# benchmarks/pipeline.py
+"""
+Times each evaluator stage on generated projects of increasing size and compares the
+timings with a stored baseline.
+
+    python -m benchmarks.pipeline --sizes 10 100 1000 --threshold 0.25
+    python -m benchmarks.pipeline --update-baseline
+
+Each size is a synthetic project with that many test files. Every evaluation runs in a
+fresh interpreter with the caches disabled and the LLM replaced by benchmarks.fake_llm,
+so runs are repeatable offline. Exits with status 1 when a stage is slower than its
+baseline by more than --threshold (a fraction) and --min-seconds.
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BASELINE = os.path.join(PROJECT_DIR, 'benchmarks', 'baselines', 'pipeline.json')
+DEFAULT_SIZES = [10, 100, 1000]
+
+FUNCTIONS_PER_MODULE = 3
+# Exception classes of the generated src/exceptions.py; only the first one is tested
+EXCEPTION_CLASSES = ['InvalidValueError', 'ConfigurationError', 'TransportError']
+
+SOURCE_FUNCTIONS = '''
+
+def scale_{j}(value, factor={factor}):
+    if value < 0:
+        raise InvalidValueError(f"negative value: {{value}}")
+    return value * factor + {j}
+
+
+def clamp_{j}(value, low=0, high={high}):
+    if value < low:
+        return low
+    if value > high:
+        return high
+    return value
+'''
+
+TEST_FILE = '''\
+import pytest
+
+from src.exceptions import InvalidValueError
+from src.module_{module} import clamp_{j}, scale_{j}
+
+
+def test_scale_{k}():
+    assert scale_{j}({k}) == {k} * {factor} + {j}
+
+
+def test_scale_rejects_negative_{k}():
+    with pytest.raises(InvalidValueError):
+        scale_{j}(-{k} - 1)
+
+
+def test_clamp_below_{k}():
+    assert clamp_{j}(-{k} - 1) == 0
+
+
+def test_clamp_above_{k}():
+    assert clamp_{j}({high} + {k} + 1) == {high}
+
+
+def test_clamp_inside_{k}():
+    assert clamp_{j}({inside}) == {inside}
+'''
+
+
+def source_module_count(test_files):
+    # Sampling runs at least one mutant per module and operator, so src/ grows slowly to
+    # keep TCS affordable
+    return 1 + round(math.log10(max(1, test_files)))
+
+
+def write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(content)
+
+
+def benchmark_config():
+    """
+    Returns:
+        - The project's evaluation configuration with every cache disabled, the LLM in
+          batch mode and mutation testing sampled, so each stage does its full work in
+          bounded time.
+    """
+    import yaml
+
+    with open(os.path.join(PROJECT_DIR, 'config_evaluation.yml')) as f:
+        config = yaml.safe_load(f)
+    config['cache']['enabled'] = False
+    config['lint']['cache']['enabled'] = False
+    config['llm']['cache']['enabled'] = False
+    config['llm']['mode'] = 'batch'
+    config['llm']['retrieval']['enabled'] = False
+    config['mutation']['sampling'] = {'enabled': True, 'margin_of_error': 0.2,
+                                      'confidence': 0.95, 'seed': 0}
+    config['ehs']['exceptions_module'] = 'src/exceptions.py'
+    return config
+
+
+def generate_project(root, test_files):
+    """
+    Writes a synthetic project: src/ modules of small functions, test_files test modules
+    of five tests each, exception classes, edge cases and the benchmark configuration.
+    Returns:
+        - Dictionary describing the project's size.
+    """
+    import yaml
+
+    modules = source_module_count(test_files)
+    write(os.path.join(root, 'src', '__init__.py'), '')
+    write(os.path.join(root, 'tests', '__init__.py'), '')
+    write(os.path.join(root, 'src', 'exceptions.py'),
+          ''.join(f"class {name}(Exception):\n    pass\n\n\n"
+                  for name in EXCEPTION_CLASSES).rstrip() + '\n')
+    for module in range(modules):
+        functions = ''.join(SOURCE_FUNCTIONS.format(j=j, factor=j + 2,
+                                                    high=10 * (j + 1))
+                            for j in range(FUNCTIONS_PER_MODULE))
+        write(os.path.join(root, 'src', f'module_{module}.py'),
+              f"from src.exceptions import InvalidValueError\n{functions}")
+    for k in range(test_files):
+        j = (k // modules) % FUNCTIONS_PER_MODULE
+        high = 10 * (j + 1)
+        write(os.path.join(root, 'tests', f'test_generated_{k}.py'),
+              TEST_FILE.format(module=k % modules, j=j, k=k, factor=j + 2, high=high,
+                               inside=k % (high + 1)))
+
+    edge_cases = [{'id': f'EDGE-{number}',
+                   'description': f"Scaling handles input class {number} correctly."}
+                  for number in range(max(5, test_files // 10))]
+    write(os.path.join(root, 'edge_cases', 'jira_edge_cases.json'),
+          json.dumps(edge_cases, indent=4))
+    write(os.path.join(root, 'config_evaluation.yml'),
+          yaml.safe_dump(benchmark_config(), sort_keys=False))
+    return {'test_files': test_files, 'tests': 5 * test_files,
+            'source_modules': modules,
+            'edge_cases': len(edge_cases)}
+
+
+def evaluate_project(project_dir, latency=0.0):
+    """
+    Evaluates a generated project in this interpreter with the fake LLM; run in a fresh
+    one per measurement.
+    Returns:
+        - evaluate_tests.main's exit status.
+    """
+    # evaluate_tests changes into the project, so the evaluator's own packages must not
+    # be found through the cwd
+    sys.path.insert(0, PROJECT_DIR)
+    import evaluate_tests
+    from benchmarks import fake_llm
+
+    fake_llm.install(latency)
+    return evaluate_tests.main(['-C', project_dir, '--log-level', 'WARNING'])
+
+
+def time_evaluation(project_dir, latency=0.0):
+    """
+    Returns:
+        - Dictionary mapping each stage to its wall seconds, plus 'total' for the whole
+          evaluation including interpreter startup.
+    """
+    report_file = os.path.join(project_dir, 'evaluation_report.json')
+    if os.path.exists(report_file):
+        os.remove(report_file)
+    script = ('import sys; from benchmarks.pipeline import evaluate_project; '
+              'sys.exit(evaluate_project(sys.argv[1], float(sys.argv[2])))')
+    started = time.perf_counter()
+    subprocess.run([sys.executable, '-c', script, os.path.abspath(project_dir),
+                    str(latency)],
+                   cwd=PROJECT_DIR, check=True, stdout=subprocess.DEVNULL)
+    total = time.perf_counter() - started
+    with open(report_file) as f:
+        stages = json.load(f)['Run Statistics']['stages']
+    timings = {name: measurement['wall_seconds']
+               for name, measurement in stages.items()}
+    timings['total'] = total
+    return timings
+
+
+def run_benchmark(sizes=DEFAULT_SIZES, repeat=1, workdir=None, latency=0.0):
+    """
+    Returns:
+        - Dictionary with the machine the benchmark ran on and, per size, the generated
+          project's size and the median wall seconds of each stage over repeat
+          evaluations.
+    """
+    root = workdir or tempfile.mkdtemp(prefix='ufem-benchmark-')
+    results = {'machine': machine(), 'sizes': {}}
+    try:
+        for size in sizes:
+            project_dir = os.path.join(root, f'size-{size}')
+            if os.path.exists(project_dir):
+                shutil.rmtree(project_dir)
+            project = generate_project(project_dir, size)
+            runs = [time_evaluation(project_dir, latency) for _ in range(repeat)]
+            stages = {stage: statistics.median(run[stage] for run in runs)
+                      for stage in runs[0] if all(stage in run for run in runs)}
+            results['sizes'][str(size)] = {**project, 'stages': stages}
+            print(f"{size} test files: {stages['total']:.2f}s", file=sys.stderr)
+    finally:
+        if workdir is None:
+            shutil.rmtree(root, ignore_errors=True)
+    return results
+
+
+def machine():
+    return {'python': platform.python_version(), 'platform': platform.platform(),
+            'cpus': os.cpu_count()}
+
+
+def find_regressions(results, baseline, threshold, min_seconds):
+    """
+    Parameters:
+        - threshold: Allowed slowdown as a fraction of the baseline, e.g. 0.25 for 25%.
+        - min_seconds: Slowdowns smaller than this are timing noise and never count.
+    Returns:
+        - One dictionary per stage and size slower than the baseline allows.
+    """
+    regressions = []
+    for size, result in results['sizes'].items():
+        expected = baseline.get('sizes', {}).get(size, {}).get('stages', {})
+        for stage, seconds in result['stages'].items():
+            if stage not in expected:
+                continue
+            limit = max(expected[stage] * (1 + threshold),
+                        expected[stage] + min_seconds)
+            if seconds > limit:
+                slowdown = seconds / expected[stage] - 1 if expected[stage] else None
+                regressions.append({'size': size, 'stage': stage,
+                                    'baseline': expected[stage], 'seconds': seconds,
+                                    'slowdown': slowdown})
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark the evaluator's stages on synthetic projects.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help="Numbers of test files of the generated projects "
+                             "(default: 10 100 1000).")
+    parser.add_argument('--repeat', type=int, default=1,
+                        help="Evaluations per size; medians are compared.")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE,
+                        help="Baseline JSON file.")
+    parser.add_argument('--update-baseline', action='store_true',
+                        help="Store the results as the new baseline.")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="Fail when a stage is slower than its baseline by more "
+                             "than this fraction (default: 0.25).")
+    parser.add_argument('--min-seconds', type=float, default=0.1,
+                        help="Ignore slowdowns shorter than this many seconds "
+                             "(default: 0.1).")
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help="Seconds each fake LLM request takes.")
+    parser.add_argument('--workdir',
+                        help="Keep the generated projects here instead of a "
+                             "temporary directory.")
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(args.sizes, args.repeat, args.workdir, args.latency)
+    print(json.dumps(results, indent=4))
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=4)
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create "
+              "one.", file=sys.stderr)
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline.get('machine') != results['machine']:
+        print(f"Baseline was recorded on {baseline.get('machine')}; timings may not be "
+              "comparable.", file=sys.stderr)
+    regressions = find_regressions(results, baseline, args.threshold, args.min_seconds)
+    for regression in regressions:
+        print(f"{regression['size']} test files, {regression['stage']}: "
+              f"{regression['seconds']:.2f}s "
+              f"vs {regression['baseline']:.2f}s baseline", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
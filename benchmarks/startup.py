@@ -0,0 +1,85 @@
+# benchmarks/startup.py
+"""
+Measures how long the evaluator takes to start, each time in a fresh interpreter.
+
+    python -m benchmarks.startup --repeat 10 --max-seconds 0.5
+
+Exits with status 1 when a median exceeds --max-seconds.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules importing evaluate_tests must not load; the stages that need them import them
+HEAVY_MODULES = ['openai', 'httpx', 'flake8', 'mutmut', 'numpy', 'pandas', 'git',
+                 'coverage', 'yaml']
+
+SCENARIOS = {
+    'import': [sys.executable, '-c', 'import evaluate_tests'],
+    'cli_help': [sys.executable, 'evaluate_tests.py', '--help'],
+}
+
+
+def time_command(command, repeat):
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run(command, cwd=PROJECT_DIR, check=True, stdout=subprocess.DEVNULL)
+        durations.append(time.perf_counter() - started)
+    return durations
+
+
+def imported_heavy_modules():
+    # Which heavy modules a bare import of evaluate_tests pulls in
+    script = ('import json, sys, evaluate_tests; '
+              f'print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))')
+    output = subprocess.run([sys.executable, '-c', script], cwd=PROJECT_DIR, check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+def run_benchmark(repeat=5):
+    """
+    Returns:
+        - Dictionary with the median, minimum and maximum seconds of each scenario, and
+          the heavy modules a bare import loads.
+    """
+    results = {}
+    for name, command in SCENARIOS.items():
+        durations = time_command(command, repeat)
+        results[name] = {
+            'median': statistics.median(durations),
+            'min': min(durations),
+            'max': max(durations),
+        }
+    results['heavy_modules_on_import'] = imported_heavy_modules()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark evaluate_tests.py startup time.")
+    parser.add_argument('--repeat', type=int, default=5,
+                        help="Runs per scenario (default: 5).")
+    parser.add_argument('--max-seconds', type=float,
+                        help="Fail when the median of any scenario exceeds this "
+                             "many seconds.")
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(args.repeat)
+    print(json.dumps(results, indent=4))
+    failed = bool(results['heavy_modules_on_import'])
+    if args.max_seconds is not None:
+        failed = failed or any(result['median'] > args.max_seconds
+                               for name, result in results.items() if name in SCENARIOS)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
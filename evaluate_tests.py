@@ -1,152 +1,669 @@
-import subprocess
+import argparse
+import functools
 import json
 import os
 import logging
-import yaml
 import sys
-from flake8.api import legacy as flake8
-from utils.llm_utils import assess_semantic_correctness
-import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 
-# Setup logging
-logging.basicConfig(level=logging.DEBUG)
+# The evaluator's own modules and their dependencies (flake8, mutmut, numpy, the OpenAI
+# SDK) are imported by the functions that use them, so importing this module, --help, or
+# running a subset of components stays cheap.
+# Logging is configured by main().
 logger = logging.getLogger(__name__)
 
 # Load evaluation configuration
-logger.debug("Loading evaluation configuration from config_evaluation.yml...")
-with open('config_evaluation.yml', 'r') as f:
-    config = yaml.safe_load(f)
-logger.info("Configuration loaded successfully.")
+CONFIG_FILE = 'config_evaluation.yml'
+config = {}
 
 
-def calculate_code_coverage():
+def load_config(path=None):
+    # Updates the shared config in place, so a long-running evaluator can pick up edits
+    import yaml
+
+    path = path or CONFIG_FILE
+    logger.debug(f"Loading evaluation configuration from {path}...")
+    with open(path, 'r') as f:
+        loaded = yaml.safe_load(f)
+    config.clear()
+    config.update(loaded)
+    logger.info("Configuration loaded successfully.")
+    return config
+
+
+# Extra per-component results written to the report next to the scores
+component_details = {}
+# Statistics about the evaluation run itself, e.g. cache hit rates
+run_statistics = {}
+# Components that fell back to 0 because they failed; their scores are not cached
+failed_components = set()
+
+
+def component_failed(key):
+    failed_components.add(key)
+    return 0.0
+
+
+class StageFailed:
+    """
+    Result of a shared stage that failed. The components needing it fall back to 0
+    rather than running it again, and the other components are unaffected.
+    """
+
+    def __init__(self, stage, error):
+        self.stage = stage
+        self.error = error
+
+    def __repr__(self):
+        return f"StageFailed({self.stage!r}, {self.error!r})"
+
+
+# Artifacts written by the shared test execution stage
+COVERAGE_DATA_FILE = '.coverage'
+TEST_REPORT_FILE = '.report.json'
+# Which tests execute each source line, from the shared test run's coverage contexts
+LINE_INDEX_FILE = '.ufem-line-index.json'
+# Per-mutant results of the last mutation run, reused by incremental evaluations
+MUTATION_RESULTS_FILE = '.ufem-mutants.json'
+REPORT_FILE = 'evaluation_report.json'
+# NDJSON event stream of the last evaluation, which an interrupted run resumes from
+PROGRESS_FILE = '.ufem-progress.ndjson'
+EDGE_CASES_FILE = 'edge_cases/jira_edge_cases.json'
+
+
+def watched_paths():
+    # Changes to these paths can change the evaluation
+    return ['src/', 'tests/', EDGE_CASES_FILE, CONFIG_FILE]
+
+
+def pytest_arguments(targets, json_report):
+    # Per-test coverage contexts let mutation testing run only a mutant's tests
+    return [
+        *targets,
+        '--disable-warnings',
+        '--cov=src', '--cov-branch', '--cov-context=test', '--cov-report=',
+        '--json-report', f'--json-report-file={json_report}'
+    ]
+
+
+def run_pytest_subprocess(arguments, env=None):
+    from utils.instrumentation import run_command
+
+    command = [sys.executable, '-m', 'pytest', *arguments]
+    logger.debug(f"Running command: {' '.join(command)}")
+    # Keep stdout for the event stream when it is written there
+    to_stdout = progress_stream is not None and progress_stream.to_stdout
+    stdout = sys.stderr if to_stdout else None
+    # Reaped with wait4, so the run's CPU time and peak memory count for the stage
+    returncode, _ = run_command(command, env=env, stdout=stdout)
+    return returncode
+
+
+# Runs pytest with the given arguments and returns its exit code; the daemon swaps in
+# a warm runner
+test_runner = run_pytest_subprocess
+
+# Event stream of the running evaluation (see utils.progress), set by compute_ufem
+progress_stream = None
+
+# Set in batch workers: the mutants of src/ and the edge cases, loaded once per batch
+shared_mutants = None
+edge_case_descriptions = None
+
+
+def emit_progress(event, **fields):
+    if progress_stream is not None:
+        progress_stream.emit(event, **fields)
+
+
+def detect_changes(changed_since):
+    """
+    Works out what an incremental evaluation against the given git ref has to re-run.
+    The artifacts of the previous evaluation are taken to describe the code at that ref.
+    Returns:
+        - None if a full evaluation is needed, otherwise the changed files and impacted
+          tests.
+    """
+    from utils.change_impact import diff_against
+
+    if not previous_artifacts_exist():
+        return None
+    return plan_incremental_run(diff_against(changed_since, watched_paths()),
+                                changed_since)
+
+
+def previous_artifacts_exist():
+    artifacts = (COVERAGE_DATA_FILE, TEST_REPORT_FILE, LINE_INDEX_FILE, REPORT_FILE)
+    missing = [path for path in artifacts if not os.path.exists(path)]
+    if missing:
+        logger.warning(f"No previous evaluation to update ({', '.join(missing)} "
+                       "missing), running a full evaluation")
+    return not missing
+
+
+def plan_incremental_run(changes, baseline):
+    """
+    Returns:
+        - None if the changes need a full evaluation, otherwise the changed files and
+          impacted tests.
+    """
+    from utils.change_impact import find_impacted_tests
+    from utils.coverage_analysis import load_line_index
+
+    if CONFIG_FILE in changes:
+        logger.warning(f"Running a full evaluation: {CONFIG_FILE} changed")
+        return None
+    code_changes = {path: change for path, change in changes.items()
+                    if path != EDGE_CASES_FILE}
+    impact = find_impacted_tests(load_line_index(LINE_INDEX_FILE), code_changes,
+                                 'tests/')
+    if impact['full']:
+        logger.warning(f"Running a full evaluation: {impact['reason']}")
+        return None
+    logger.info(f"{len(changes)} files changed since {baseline}: re-running "
+                f"{len(impact['tests'])} impacted tests and "
+                f"{len(impact['test_files'])} changed test files")
+    return {'ref': baseline, 'files': changes, **impact}
+
+
+def inputs_changed(key, changes):
+    changed = [os.path.normpath(path) for path in changes['files']]
+    inputs = [os.path.normpath(path) for path in component_input_paths(key)]
+    return any(path == input_path or path.startswith(input_path + os.sep)
+               for path in changed for input_path in inputs)
+
+
+def run_pytest(targets, json_report, coverage_file, durations=None):
+    """
+    Runs pytest over targets under coverage, in parallel shards balanced by the tests'
+    previous durations when test_run.workers allows more than one. The shards' coverage
+    data and JSON reports are combined, so later stages read the same artifacts a single
+    run writes.
+    Parameters:
+        - targets: Test directories, files or node ids.
+        - json_report: Path of the JSON report to write.
+        - coverage_file: Path of the coverage data file to write.
+        - durations: Seconds per test node id from an earlier run, see
+          utils.sharding.read_test_durations.
+    Returns:
+        - pytest's exit code for the whole run.
+    """
+    from utils.instrumentation import bind_measurement
+    from utils.sharding import (
+        combine_coverage,
+        combine_exit_codes,
+        list_test_files,
+        merge_shard_reports,
+        plan_shards,
+    )
+
+    workers = config.get('test_run', {}).get('workers', 0) or os.cpu_count() or 1
+    files = [path for target in targets for path in list_test_files(target)]
+    shards = plan_shards(files, durations or {}, workers) if workers > 1 else []
+    if len(shards) <= 1:
+        return test_runner(pytest_arguments(targets, json_report),
+                           env=dict(os.environ, COVERAGE_FILE=coverage_file))
+
+    logger.info(f"Running {len(files)} test targets in {len(shards)} parallel shards")
+    shard_files = [(f"{coverage_file}.shard-{index}", f"{json_report}.shard-{index}")
+                   for index in range(len(shards))]
+    for path in (path for pair in shard_files for path in pair):
+        if os.path.exists(path):
+            os.remove(path)
+
+    def run_shard(index):
+        shard_coverage, shard_report = shard_files[index]
+        return test_runner(pytest_arguments(shards[index], shard_report),
+                           env=dict(os.environ, COVERAGE_FILE=shard_coverage))
+
+    # Threads only wait for the pytest processes; the test processes' usage still counts
+    # for the calling stage
+    with ThreadPoolExecutor(max_workers=len(shards)) as executor:
+        exit_codes = list(executor.map(bind_measurement(run_shard), range(len(shards))))
+    exit_code = combine_exit_codes(exit_codes)
+
+    combine_coverage(coverage_file,
+                     [shard_coverage for shard_coverage, _ in shard_files])
+    reports = []
+    for _, shard_report in shard_files:
+        if os.path.exists(shard_report):
+            with open(shard_report, 'r') as f:
+                reports.append(json.load(f))
+            os.remove(shard_report)
+    if reports:
+        with open(json_report, 'w') as f:
+            json.dump(merge_shard_reports(reports, exit_code), f)
+    return exit_code
+
+
+def run_impacted_tests(changes):
+    from utils.change_impact import merge_coverage_data, merge_test_reports
+    from utils.sharding import read_test_durations
+
+    logger.info("Running impacted tests under coverage with JSON report...")
+    partial_coverage = f"{COVERAGE_DATA_FILE}.impacted"
+    partial_report = f"{TEST_REPORT_FILE}.impacted"
+    for path in (partial_coverage, partial_report):
+        if os.path.exists(path):
+            os.remove(path)
+
+    # Changed test modules run in full; other impacted tests run by node id
+    stale = changes['stale_test_files']
+    targets = changes['test_files'] + [test for test in changes['tests']
+                                       if test.split('::')[0] not in stale]
+    succeeded = True
+    if targets:
+        returncode = run_pytest(targets, partial_report, partial_coverage,
+                                read_test_durations(TEST_REPORT_FILE))
+        # 1 only means some tests failed, which the merged report records; anything
+        # else aborted the run
+        if returncode not in (0, 1):
+            logger.error(f"Test run failed with return code {returncode}")
+            succeeded = False
+
+    partial = {}
+    if os.path.exists(partial_report):
+        with open(partial_report, 'r') as f:
+            partial = json.load(f)
+    with open(TEST_REPORT_FILE, 'r') as f:
+        previous = json.load(f)
+
+    # Fold the new results into the previous run's artifacts so every later stage
+    # reads a complete run
+    merge_coverage_data(COVERAGE_DATA_FILE, partial_coverage, COVERAGE_DATA_FILE,
+                        changes['files'], changes['tests'], changes['stale_test_files'])
+    report = merge_test_reports(previous, partial, changes['tests'],
+                                changes['stale_test_files'])
+    with open(TEST_REPORT_FILE, 'w') as f:
+        json.dump(report, f)
+    for path in (partial_coverage, partial_report):
+        if os.path.exists(path):
+            os.remove(path)
+
+    failed = any(test['outcome'] in ('failed', 'error') for test in report['tests'])
+    return {
+        'succeeded': succeeded and not failed,
+        'coverage_file': COVERAGE_DATA_FILE,
+        'json_report': TEST_REPORT_FILE,
+        'rerun_tests': sorted(test['nodeid'] for test in partial.get('tests', []))
+    }
+
+
+def run_test_suite(changes=None):
+    from utils.sharding import read_test_durations
+
+    if changes is not None:
+        return run_impacted_tests(changes)
+    logger.info("Running test suite under coverage with JSON report...")
+    # The previous run's durations balance the shards
+    durations = {}
+    if os.path.exists(TEST_REPORT_FILE):
+        durations = read_test_durations(TEST_REPORT_FILE)
+    # Clear any previous coverage data and JSON report
+    import coverage
+    coverage.Coverage(data_file=COVERAGE_DATA_FILE).erase()
+    if os.path.exists(TEST_REPORT_FILE):
+        os.remove(TEST_REPORT_FILE)
+
+    # A single (possibly sharded) pytest run provides the artifacts for CCS, TCS and ESR
+    returncode = run_pytest(['tests/'], TEST_REPORT_FILE, COVERAGE_DATA_FILE, durations)
+    succeeded = returncode == 0
+    if not succeeded:
+        logger.error(f"Test run failed with return code {returncode}")
+
+    return {
+        'succeeded': succeeded,
+        'coverage_file': COVERAGE_DATA_FILE,
+        'json_report': TEST_REPORT_FILE
+    }
+
+
+def ingest_coverage(test_run=None):
+    logger.info("Reading coverage data...")
+    if test_run is None:
+        test_run = run_test_suite()
+    if not test_run['succeeded']:
+        logger.error("Coverage data skipped because the test run failed.")
+        return None
+
+    try:
+        from utils.coverage_analysis import (
+            read_line_contexts,
+            save_line_index,
+            summarize_coverage,
+        )
+
+        summary = summarize_coverage(test_run['coverage_file'])
+        # Coverage contexts tell later stages which tests execute each line
+        line_contexts = read_line_contexts(test_run['coverage_file'])
+        save_line_index(LINE_INDEX_FILE, line_contexts)
+    except Exception as e:
+        logger.error(f"An error occurred while reading coverage data: {e}")
+        return None
+    return {'summary': summary, 'line_contexts': line_contexts,
+            'line_index_file': LINE_INDEX_FILE}
+
+
+def calculate_code_coverage(test_run=None, coverage_data=None):
     logger.info("Calculating Code Coverage Score (CCS)...")
     try:
-        # Run coverage erase to clear any previous data
-        subprocess.run(['coverage', 'erase'], check=True)
-
-        # Run tests with coverage
-        subprocess.run(['coverage', 'run', '--source=src', '-m', 'pytest', 'tests/', '--disable-warnings'], check=True)
-
-        # Generate coverage report
-        result = subprocess.run(['coverage', 'report'], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, check=True)
-
-        # Parse the coverage percentage from the output
-        coverage_output = result.stdout
-        coverage_line = [line for line in coverage_output.split('\n') if 'TOTAL' in line]
-        if coverage_line:
-            coverage_percentage = float(coverage_line[0].split()[-1].replace('%', ''))
-            logger.info(f"Code Coverage Score (CCS): {coverage_percentage:.2f}%")
-            return coverage_percentage
-        else:
-            logger.error("Coverage percentage not found in output.")
-            return 0.0
-    except subprocess.CalledProcessError as e:
-        logger.error(f"Coverage calculation failed: {e.stderr}")
-        return 0.0
+        if coverage_data is None:
+            coverage_data = ingest_coverage(test_run)
+        if coverage_data is None:
+            logger.error("Coverage calculation skipped because the test run failed.")
+            return component_failed('CCS')
+
+        summary = coverage_data['summary']
+        coverage_percentage = summary['percent_covered']
+        component_details['CCS'] = {
+            'branch_coverage': summary['branch_coverage'],
+            'totals': summary['totals'],
+            'modules': summary['modules'],
+        }
+        logger.info(f"Code Coverage Score (CCS): {coverage_percentage:.2f}%")
+        return coverage_percentage
     except Exception as e:
         logger.error(f"An error occurred while calculating code coverage: {e}")
-        return 0.0
+        return component_failed('CCS')
 
 
-def perform_mutation_testing():
+def perform_mutation_testing(test_run=None, coverage_data=None, changes=None,
+                             resumed_results=None):
     logger.info("Performing Mutation Testing for Test Correctness Score (TCS)...")
     try:
-        # Generate fresh coverage data
-        logger.debug("Generating fresh coverage data...")
-        subprocess.run(['coverage', 'erase'], check=True)
-        subprocess.run(['coverage', 'run', '--source=src', '-m', 'pytest', 'tests/'], check=True)
-
-        # Run mutmut tests with --no-progress to suppress spinner output
-        command = [
-            'mutmut', 'run',
-            '--paths-to-mutate=src/',
-            '--runner=python -m pytest tests/',
-            '--use-coverage',
-            '--no-progress'  # Suppress spinner output
-        ]
-        logger.debug(f"Running command: {' '.join(command)}")
-        result_run = subprocess.run(
-            command,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
+        from utils.change_impact import carry_over_mutant_results
+        from utils.mutation_engine import (
+            filter_covered_mutants,
+            list_mutants,
+            run_mutation_tests,
         )
-        logger.debug(f"Mutmut run return code: {result_run.returncode}")
-        logger.debug(f"Mutmut run stdout:\n{result_run.stdout}")
-        logger.debug(f"Mutmut run stderr:\n{result_run.stderr}")
-
-        # Get mutation results without 'summary' argument
-        result = subprocess.run(
-            ['mutmut', 'results'],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
+        from utils.mutation_sampling import (
+            estimate_kill_rate,
+            required_sample_size,
+            stratified_sample,
         )
+        from utils.progress import PROGRESS
+        from utils.sharding import read_test_durations
 
-        logger.debug(f"Mutmut results return code: {result.returncode}")
-        logger.debug(f"Mutmut results stdout:\n{result.stdout}")
-        logger.debug(f"Mutmut results stderr:\n{result.stderr}")
+        # Reuse the coverage data from the shared test run
+        if test_run is None:
+            test_run = run_test_suite()
+        if coverage_data is None:
+            coverage_data = ingest_coverage(test_run)
+        if coverage_data is None:
+            logger.error("Mutation testing skipped because the test run failed.")
+            return component_failed('TCS')
 
-        if result.stdout.strip() == '':
-            logger.error("Mutmut did not return any results.")
-            # Check if .mutmut-cache file exists
-            if os.path.exists('.mutmut-cache'):
-                logger.debug(".mutmut-cache file exists.")
-            else:
-                logger.debug(".mutmut-cache file does not exist.")
-            return 0.0
-
-        # Parse the results output
-        # Initialize counters
-        killed = 0
-        survived = 0
-
-        lines = result.stdout.strip().split('\n')
-        for line in lines:
-            if line.startswith('Survived'):
-                survived += 1
-            elif line.startswith('Killed'):
-                killed += 1
-            # Handle other statuses if necessary
+        settings = config.get('mutation', {})
+        paths_to_mutate = settings.get('paths_to_mutate', 'src/')
+        tests_dir = settings.get('tests_dir', 'tests/')
+
+        # The line index tells us which tests execute each mutated line
+        line_contexts = coverage_data['line_contexts']
+        durations = read_test_durations(test_run['json_report'])
+        covered_lines = {filename: set(lines)
+                         for filename, lines in line_contexts.items()}
+        if shared_mutants is not None:
+            mutants = filter_covered_mutants(shared_mutants, covered_lines)
+        else:
+            mutants = list_mutants(paths_to_mutate, tests_dir,
+                                   covered_lines=covered_lines)
+        logger.debug(f"Generated {len(mutants)} mutants for covered lines in "
+                     f"{paths_to_mutate}")
+
+        sampling = settings.get('sampling', {})
+        if sampling.get('enabled', False):
+            confidence = sampling.get('confidence', 0.95)
+            sample_size = required_sample_size(len(mutants),
+                                               sampling.get('margin_of_error', 0.05),
+                                               confidence)
+            population = mutants
+            mutants, populations = stratified_sample(population, sample_size,
+                                                     seed=sampling.get('seed'))
+            logger.info(f"Sampling {len(mutants)} of {len(population)} mutants across "
+                        f"{len(populations)} strata")
+
+        reused = []
+        if changes is not None and os.path.exists(MUTATION_RESULTS_FILE):
+            with open(MUTATION_RESULTS_FILE, 'r') as f:
+                previous_results = json.load(f)
+            reused, mutants = carry_over_mutant_results(previous_results, mutants,
+                                                        line_contexts, changes,
+                                                        test_run.get('rerun_tests', []))
+            logger.info(f"Reusing {len(reused)} mutant results, re-running "
+                        f"{len(mutants)} impacted mutants")
+        if resumed_results:
+            # Mutants an interrupted evaluation of the same inputs already ran
+            finished = {result['id']: result for result in resumed_results}
+            resumed = [finished[mutant.id] for mutant in mutants
+                       if mutant.id in finished]
+            mutants = [mutant for mutant in mutants if mutant.id not in finished]
+            reused += resumed
+            logger.info(f"Resuming mutation testing: {len(resumed)} mutants already "
+                        f"ran, {len(mutants)} left")
+            for result in resumed:
+                emit_progress(PROGRESS, stage='TCS', mutant=result, resumed=True)
+
+        total_mutants = len(reused) + len(mutants)
+        finished_mutants = [len(reused)]
+
+        def report_mutant(result):
+            file_contexts = line_contexts.get(result['filename'], {})
+            result['tests'] = file_contexts.get(result['line_number']) or None
+            finished_mutants[0] += 1
+            emit_progress(PROGRESS, stage='TCS', done=finished_mutants[0],
+                          total=total_mutants, mutant=result)
+
+        results = run_mutation_tests(
+            mutants, line_contexts, durations,
+            tests_dir=tests_dir,
+            workers=settings.get('workers') or None,
+            timeout_factor=settings.get('timeout_factor', 2.0),
+            timeout_constant=settings.get('timeout_constant', 10.0),
+            on_result=report_mutant
+        )
+        results = sorted(reused + results,
+                         key=lambda result: (result['filename'], result['line_number'],
+                                             result['id']))
+        with open(MUTATION_RESULTS_FILE, 'w') as f:
+            json.dump(results, f)
+
+        # As in mutmut, only a failing test kills a mutant; timeouts and broken test
+        # runs are reported but say nothing about the tests' strength, so they are left
+        # out of the score
+        statuses = {status: 0 for status in ('killed', 'survived', 'timeout', 'error')}
+        for result in results:
+            statuses[result['status']] = statuses.get(result['status'], 0) + 1
+        killed, survived = statuses['killed'], statuses['survived']
 
         total = killed + survived
         if total == 0:
-            logger.error("No mutants were found.")
-            return 0.0
+            # Without a killed or surviving mutant there is nothing to score, which
+            # is not a score of 0
+            logger.error(f"No mutants to score ({statuses['timeout']} timed out, "
+                         f"{statuses['error']} errors).")
+            return component_failed('TCS')
 
-        TCS = (killed / total) * 100.0
-        logger.info(f"Test Correctness Score (TCS): {TCS:.2f}%")
-        logger.info(f"Mutant summary: {killed} killed, {survived} survived")
+        if sampling.get('enabled', False):
+            sampled_result = estimate_kill_rate(results, populations, confidence)
+            sampled_result['margin_of_error'] = sampling.get('margin_of_error', 0.05)
+            component_details['TCS'] = {'mode': 'sampled', 'statuses': statuses,
+                                        **sampled_result}
+            TCS = sampled_result['estimate']
+            low, high = sampled_result['interval']
+            logger.info(f"Test Correctness Score (TCS): {TCS:.2f}% "
+                        f"({confidence:.0%} CI {low:.2f}%-{high:.2f}%)")
+        else:
+            component_details['TCS'] = {'mode': 'full', 'population': total,
+                                        'statuses': statuses}
+            TCS = (killed / total) * 100.0
+            logger.info(f"Test Correctness Score (TCS): {TCS:.2f}%")
+        logger.info(f"Mutant summary: {killed} killed, {survived} survived, "
+                    f"{statuses['timeout']} timed out, {statuses['error']} errors "
+                    "(timeouts and errors are not scored)")
 
         return TCS
 
-    except subprocess.CalledProcessError as e:
-        logger.error(f"Mutation testing failed with return code {e.returncode}")
-        logger.error(f"Command output:\n{e.output}")
-        logger.error(f"Command stderr:\n{e.stderr}")
-        logger.error(f"Exception: {e}")
-        return 0.0
     except Exception as e:
         logger.error(f"An error occurred during mutation testing: {e}")
-        return 0.0
+        return component_failed('TCS')
+
+
+def load_edge_case_descriptions():
+    if edge_case_descriptions is not None:
+        return list(edge_case_descriptions)
+    with open(EDGE_CASES_FILE) as f:
+        edge_cases = json.load(f)
+    return [case['description'] for case in edge_cases]
+
+
+def exception_requirement(exception_class):
+    return f"Tests that '{exception_class}' is properly raised and handled."
+
+
+def analyze_exceptions(settings=None):
+    # CPU-bound, so the scheduler runs it on a process executor; settings are passed in
+    # explicitly because worker processes need not share this process's config
+    logger.info("Statically analyzing exception tests...")
+    try:
+        from utils.exception_analysis import analyze_exception_tests
+
+        if settings is None:
+            settings = config['ehs']
+        analysis = analyze_exception_tests(
+            settings.get('exceptions_module', 'src/exceptions.py'),
+            'tests/',
+            settings.get('exception_classes')
+        )
+    except Exception as e:
+        logger.error(f"An error occurred during exception test analysis: {e}")
+        return StageFailed('exception_analysis', e)
+    logger.info(f"Exception classes resolved statically: {len(analysis['resolved'])}, "
+                f"left for the LLM: {len(analysis['unresolved'])}")
+    return analysis
+
+
+def assess_llm_requirements(exception_analysis=None):
+    logger.info("Assessing edge case and exception requirements with the LLM...")
+    try:
+        try:
+            descriptions = load_edge_case_descriptions()
+        except FileNotFoundError as e:
+            logger.error(f"Edge case file not found: {e}")
+            descriptions = []
+        if exception_analysis is None:
+            exception_analysis = analyze_exceptions()
+        if isinstance(exception_analysis, StageFailed):
+            # EHS falls back without verdicts; the edge cases are still assessed
+            logger.error("Assessing edge cases only because the exception analysis "
+                         "failed.")
+        else:
+            # Exceptions the tests visibly raise need no LLM verdict
+            descriptions += [exception_requirement(exception_class)
+                             for exception_class in exception_analysis['unresolved']]
+
+        # ECHS and EHS share one batched assessment over a single read of the tests
+        from utils.llm_cache import VerdictCache
+        from utils.llm_utils import LLMUsage
 
+        usage = LLMUsage()
+        settings = config.get('llm', {})
+        cache_settings = settings.get('cache', {})
+        cache = None
+        if cache_settings.get('enabled', True):
+            cache = VerdictCache(
+                cache_settings.get('path', '.ufem-llm-cache.sqlite'),
+                max_entries=cache_settings.get('max_entries', 10000),
+                ttl_seconds=cache_settings.get('ttl_seconds')
+            )
+        retriever = None
+        retrieval = settings.get('retrieval', {})
+        if retrieval.get('enabled', False):
+            # Prompts carry only the test functions most similar to each requirement
+            try:
+                from utils.embedding_index import EmbeddingIndex, openai_embedder
 
+                embedding_model = retrieval.get('embedding_model',
+                                                'text-embedding-3-small')
+                index = EmbeddingIndex(
+                    retrieval.get('index_path', 'embeddings/test_index'),
+                    openai_embedder(embedding_model),
+                    model=embedding_model
+                )
+                index.refresh('tests/')
+                retriever = functools.partial(index.retrieve,
+                                              top_k=retrieval.get('top_k', 5))
+            except Exception as e:
+                logger.error("Embedding retrieval unavailable, sending the whole test "
+                             f"suite: {e}")
 
+        if settings.get('mode', 'batch') == 'async':
+            # Fan requests out concurrently, within the provider's rate limits
+            from utils.llm_async import assess_requirements_concurrently
 
-def evaluate_edge_case_handling():
+            async_settings = settings.get('async', {})
+            verdicts = assess_requirements_concurrently(
+                'tests/', descriptions,
+                model=settings.get('model', 'gpt-4o'),
+                batch_size=async_settings.get('batch_size', 1),
+                max_concurrency=async_settings.get('max_concurrency', 8),
+                requests_per_second=async_settings.get('requests_per_second', 5.0),
+                max_retries=async_settings.get('max_retries', 3),
+                cache=cache,
+                retriever=retriever,
+                usage=usage
+            )
+        else:
+            from utils.llm_utils import assess_requirements
+
+            verdicts = assess_requirements(
+                'tests/', descriptions,
+                model=settings.get('model', 'gpt-4o'),
+                batch_size=settings.get('batch_size', 25),
+                cache=cache,
+                retriever=retriever,
+                usage=usage
+            )
+        run_statistics['llm_usage'] = usage.stats()
+        if cache is not None:
+            run_statistics['llm_cache'] = cache.stats()
+            logger.info(f"LLM verdict cache: {cache.hits} hits, {cache.misses} misses")
+        return verdicts
+    except Exception as e:
+        logger.error("An error occurred while assessing requirements with the LLM: "
+                     f"{e}")
+        return StageFailed('llm_verdicts', e)
+
+
+def evaluate_edge_case_handling(llm_verdicts=None):
     logger.info("Evaluating Edge Case Handling Score (ECHS)...")
     try:
-        with open('edge_cases/jira_edge_cases.json') as f:
-            edge_cases = json.load(f)
+        descriptions = load_edge_case_descriptions()
         covered = 0
-        total_edge_cases = len(edge_cases)
+        total_edge_cases = len(descriptions)
         logger.debug(f"Total edge cases to evaluate: {total_edge_cases}")
 
-        for case in edge_cases:
-            description = case['description']
-            logger.debug(f"Assessing edge case: {description}")
-            is_covered = assess_semantic_correctness('tests/', description)
+        if isinstance(llm_verdicts, StageFailed):
+            logger.error("Edge case evaluation skipped because the LLM assessment "
+                         "failed.")
+            return component_failed('ECHS')
+        if llm_verdicts is None:
+            from utils.llm_utils import assess_requirements
+
+            llm_verdicts = assess_requirements('tests/', descriptions)
+        unassessed = [description for description in descriptions
+                      if description not in llm_verdicts]
+        if unassessed:
+            # A score from some edge cases would be cached as if it covered them all
+            logger.error(f"Edge case evaluation skipped because {len(unassessed)} edge "
+                         "cases have no LLM verdict.")
+            return component_failed('ECHS')
+
+        for description in descriptions:
+            is_covered = llm_verdicts.get(description, False)
+            logger.debug(f"Edge case: {description} -> "
+                         f"{'covered' if is_covered else 'not covered'}")
             if is_covered:
                 covered += 1
 
@@ -155,79 +672,160 @@ def evaluate_edge_case_handling():
         return ECHS
     except FileNotFoundError as e:
         logger.error(f"Edge case file not found: {e}")
-        return 0.0
+        return component_failed('ECHS')
     except Exception as e:
         logger.error(f"An error occurred during edge case evaluation: {e}")
-        return 0.0
+        return component_failed('ECHS')
+
+
+def lint_test_files():
+    logger.info("Linting test files...")
+    from utils.lint import run_lint
+
+    settings = config.get('lint', {})
+    cache_settings = settings.get('cache', {})
+    cache_path = None
+    if cache_settings.get('enabled', True):
+        cache_path = cache_settings.get('path', '.ufem-lint-cache.json')
+    try:
+        return run_lint(
+            ['tests/'],
+            ignore=config['flake8']['ignore'],
+            workers=settings.get('workers', 0),
+            cache_path=cache_path
+        )
+    except Exception as e:
+        logger.error(f"An error occurred while linting the test files: {e}")
+        return StageFailed('lint_results', e)
 
 
-def evaluate_test_quality():
+def evaluate_test_quality(lint_results=None):
     logger.info("Evaluating Test Quality Score (TQS)...")
     try:
-        style_guide = flake8.get_style_guide(ignore=config['flake8']['ignore'])
-        report = style_guide.check_files(['tests/'])
-        total_issues_detected = report.total_errors
+        from utils.lint import count_violations
+
+        if lint_results is None:
+            lint_results = lint_test_files()
+        if isinstance(lint_results, StageFailed):
+            logger.error("Test quality evaluation skipped because linting failed.")
+            return component_failed('TQS')
+        total_issues_detected = count_violations(lint_results)
         max_allowable_issues = config['tqs']['max_allowable_issues']
         TQS = max(0.0, 100.0 - ((total_issues_detected / max_allowable_issues) * 100.0))
         logger.info(f"Test Quality Score (TQS): {TQS:.2f}%")
         return TQS
     except Exception as e:
         logger.error(f"An error occurred during test quality evaluation: {e}")
-        return 0.0
+        return component_failed('TQS')
 
 
-def evaluate_exception_handling():
+def evaluate_exception_handling(llm_verdicts=None, exception_analysis=None):
     logger.info("Evaluating Exception Handling Score (EHS)...")
     try:
-        total_exceptions_in_code = config['ehs']['total_exceptions_in_code']
-        exceptions_properly_tested = 0
+        if exception_analysis is None:
+            exception_analysis = analyze_exceptions()
+        if isinstance(exception_analysis, StageFailed):
+            logger.error("Exception handling evaluation skipped because the exception "
+                         "analysis failed.")
+            return component_failed('EHS')
+        total_exceptions_in_code = exception_analysis['total_exceptions_in_code']
+
+        descriptions = {exception_class: exception_requirement(exception_class)
+                        for exception_class in exception_analysis['unresolved']}
+        if isinstance(llm_verdicts, StageFailed) and descriptions:
+            logger.error("Exception handling evaluation skipped because the LLM "
+                         "assessment failed.")
+            return component_failed('EHS')
+        if llm_verdicts is None and descriptions:
+            from utils.llm_utils import assess_requirements
 
-        for exception_class in config['ehs']['exception_classes']:
-            description = f"Tests that '{exception_class}' is properly raised and handled."
-            is_tested = assess_semantic_correctness('tests/', description)
-            if is_tested:
-                exceptions_properly_tested += 1
+            llm_verdicts = assess_requirements('tests/', list(descriptions.values()))
+        unassessed = [description for description in descriptions.values()
+                      if description not in llm_verdicts]
+        if unassessed:
+            logger.error("Exception handling evaluation skipped because "
+                         f"{len(unassessed)} exception classes have no LLM verdict.")
+            return component_failed('EHS')
+        llm_tested = [exception_class
+                      for exception_class, description in descriptions.items()
+                      if llm_verdicts.get(description, False)]
+        exceptions_properly_tested = (len(exception_analysis['resolved'])
+                                      + len(llm_tested))
+        component_details['EHS'] = {
+            'total_exceptions_in_code': total_exceptions_in_code,
+            'static': exception_analysis['resolved'],
+            'llm': llm_tested,
+            'untested': [exception_class
+                         for exception_class in exception_analysis['unresolved']
+                         if exception_class not in llm_tested],
+        }
 
         EHS = (exceptions_properly_tested / total_exceptions_in_code) * 100.0 if total_exceptions_in_code > 0 else 0.0
         logger.info(f"Exception Handling Score (EHS): {EHS:.2f}%")
         return EHS
     except Exception as e:
         logger.error(f"An error occurred during exception handling evaluation: {e}")
-        return 0.0
+        return component_failed('EHS')
 
 
-def evaluate_duplication():
-    logger.info("Evaluating Duplication and Redundancy Score (DRS)...")
+def find_test_clones(settings=None):
+    # CPU-bound like analyze_exceptions, and run on a process executor the same way
+    logger.info("Detecting clones among the test functions...")
     try:
-        result = subprocess.run(
-            ['flake8', '--select=R', 'tests/'],
-            capture_output=True,
-            text=True,
-            check=False
+        from utils.clone_detection import collect_test_functions, find_clone_clusters
+
+        if settings is None:
+            settings = config.get('drs', {})
+        functions = collect_test_functions('tests/')
+        clusters = find_clone_clusters(
+            functions,
+            similarity_threshold=settings.get('similarity_threshold', 0.8),
+            shingle_size=settings.get('shingle_size', 5),
+            num_permutations=settings.get('num_permutations', 128),
+            bands=settings.get('bands', 16),
+            min_tokens=settings.get('min_tokens', 10)
         )
-        duplicate_code_blocks = len(result.stdout.strip().split('\n')) if result.stdout else 0
-        total_code_blocks = len([file for file in os.listdir('tests/') if file.endswith('.py')])
-        DRS = 100.0 - ((duplicate_code_blocks / total_code_blocks) * 100.0) if total_code_blocks > 0 else 100.0
+    except Exception as e:
+        logger.error(f"An error occurred during clone detection: {e}")
+        return StageFailed('clone_analysis', e)
+    return {'total_tests': len(functions), 'clone_clusters': clusters}
+
+
+def evaluate_duplication(clone_analysis=None):
+    logger.info("Evaluating Duplication and Redundancy Score (DRS)...")
+    try:
+        if clone_analysis is None:
+            clone_analysis = find_test_clones()
+        if isinstance(clone_analysis, StageFailed):
+            logger.error("Duplication evaluation skipped because clone detection "
+                         "failed.")
+            return component_failed('DRS')
+        clusters = clone_analysis['clone_clusters']
+        # Every test in a clone cluster beyond the first is redundant
+        redundant_tests = sum(len(cluster['tests']) - 1 for cluster in clusters)
+        total_tests = clone_analysis['total_tests']
+        component_details['DRS'] = {
+            'total_tests': total_tests,
+            'redundant_tests': redundant_tests,
+            'clone_clusters': clusters,
+        }
+        DRS = 100.0
+        if total_tests > 0:
+            DRS = 100.0 - ((redundant_tests / total_tests) * 100.0)
         logger.info(f"Duplication and Redundancy Score (DRS): {DRS:.2f}%")
         return DRS
     except Exception as e:
         logger.error(f"An error occurred during duplication evaluation: {e}")
-        return 0.0
+        return component_failed('DRS')
 
 
-def evaluate_execution_success_rate():
+def evaluate_execution_success_rate(test_run=None):
     logger.info("Evaluating Execution Success Rate (ESR)...")
     try:
-        # Run pytest with JSON report
-        result = subprocess.run(
-            ['pytest', 'tests/', '--disable-warnings', '--json-report', '--json-report-file=.report.json'],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
-        )
-
-        # Parse the JSON report
-        with open('.report.json', 'r') as f:
+        # Read the JSON report from the shared test run
+        if test_run is None:
+            test_run = run_test_suite()
+        with open(test_run['json_report'], 'r') as f:
             report = json.load(f)
 
         total_tests = report['summary']['total']
@@ -238,66 +836,585 @@ def evaluate_execution_success_rate():
         return ESR
     except Exception as e:
         logger.error(f"An error occurred during execution success rate evaluation: {e}")
-        return 0.0
+        return component_failed('ESR')
+
 
+def generate_report(events, components):
+    from utils.progress import assemble_report
 
-def generate_report(UFEM, component_scores):
     logger.info("Generating evaluation report...")
-    report = {
-        'UFEM Score': UFEM,
-        'Component Scores': component_scores
-    }
+    # The report holds exactly what the event stream recorded
+    report = assemble_report(events, components)
     try:
-        with open('evaluation_report.json', 'w') as f:
+        with open(REPORT_FILE, 'w') as f:
             json.dump(report, f, indent=4)
-        logger.info("Report saved to evaluation_report.json")
+        logger.info(f"Report saved to {REPORT_FILE}")
     except Exception as e:
         logger.error(f"An error occurred while saving the report: {e}")
+    return report
+
+
+COMPONENTS = ['CCS', 'TCS', 'ECHS', 'TQS', 'EHS', 'DRS', 'ESR']
+
+# Files and config sections each component's score depends on; a change to any of them
+# invalidates its cached score
+COMPONENT_INPUTS = {
+    'CCS': {'paths': ['src/', 'tests/'], 'config': []},
+    'TCS': {'paths': ['src/', 'tests/'], 'config': ['mutation']},
+    'ECHS': {'paths': ['tests/', EDGE_CASES_FILE], 'config': ['llm']},
+    'TQS': {'paths': ['tests/'], 'config': ['flake8', 'tqs']},
+    # The exceptions module is wherever ehs.exceptions_module points
+    'EHS': {'paths': ['tests/'],
+            'config_paths': [('ehs', 'exceptions_module', 'src/exceptions.py')],
+            'config': ['ehs', 'llm']},
+    'DRS': {'paths': ['tests/'], 'config': ['drs']},
+    'ESR': {'paths': ['src/', 'tests/'], 'config': []},
+}
+
+
+def component_input_paths(key):
+    inputs = COMPONENT_INPUTS[key]
+    config_paths = inputs.get('config_paths', [])
+    return inputs['paths'] + [config.get(section, {}).get(option, default)
+                              for section, option, default in config_paths]
+
+
+# Components an incremental evaluation updates from the impacted tests and mutants
+INCREMENTAL_COMPONENTS = ['CCS', 'TCS', 'ESR']
+
+
+def build_metric_tasks(changes=None, resumed_mutants=None):
+    # Each task declares the resources it needs; the scheduler runs independent tasks
+    # concurrently. Tasks waiting on test processes, the LLM or lint workers run on
+    # threads; the CPU-bound static analyses run on processes and return their results
+    # instead of setting module state.
+    from utils.scheduler import MetricTask
+
+    return [
+        MetricTask('test_run', functools.partial(run_test_suite, changes)),
+        MetricTask('coverage_data', ingest_coverage, needs=['test_run']),
+        MetricTask('CCS', calculate_code_coverage, needs=['coverage_data']),
+        MetricTask('TCS',
+                   functools.partial(perform_mutation_testing, changes=changes,
+                                     resumed_results=resumed_mutants),
+                   needs=['test_run', 'coverage_data']),
+        MetricTask('ESR', evaluate_execution_success_rate, needs=['test_run']),
+        MetricTask('exception_analysis',
+                   functools.partial(analyze_exceptions, config.get('ehs', {})),
+                   executor='process'),
+        MetricTask('llm_verdicts', assess_llm_requirements,
+                   needs=['exception_analysis']),
+        MetricTask('ECHS', evaluate_edge_case_handling, needs=['llm_verdicts']),
+        MetricTask('EHS', evaluate_exception_handling,
+                   needs=['llm_verdicts', 'exception_analysis']),
+        MetricTask('lint_results', lint_test_files),
+        MetricTask('TQS', evaluate_test_quality, needs=['lint_results']),
+        MetricTask('clone_analysis',
+                   functools.partial(find_test_clones, config.get('drs', {})),
+                   executor='process'),
+        MetricTask('DRS', evaluate_duplication, needs=['clone_analysis']),
+    ]
+
+
+def encode_resource(name, value):
+    # Stage results go into the event stream; the line contexts are already saved in the
+    # line index
+    if name == 'coverage_data' and value is not None:
+        return {key: item for key, item in value.items() if key != 'line_contexts'}
+    return value
+
+
+def decode_resource(name, value):
+    if name == 'coverage_data' and value is not None:
+        from utils.coverage_analysis import load_line_index
+
+        return dict(value, line_contexts=load_line_index(value['line_index_file']))
+    return value
+
+
+def load_resumable_results(path, inputs):
+    """
+    Reads what an interrupted evaluation of the same inputs finished.
+    Returns:
+        - (stage result events keyed by stage, results of the mutants it ran); empty if
+          the stream is missing or describes different inputs.
+    """
+    from utils.progress import PROGRESS, completed_stages, read_events
+
+    if path == '-' or not os.path.exists(path):
+        logger.warning(f"No progress stream at {path} to resume from, starting over")
+        return {}, []
+    events = read_events(path)
+    if not events or events[0].get('inputs') != inputs:
+        logger.warning(f"Inputs changed since the evaluation recorded in {path}, "
+                       "starting over")
+        return {}, []
+    results = completed_stages(events)
+    mutants = [event['mutant'] for event in events
+               if event['event'] == PROGRESS and event.get('stage') == 'TCS'
+               and 'mutant' in event]
+    logger.info(f"Resuming after {len(results)} finished stages and {len(mutants)} "
+                "finished mutants")
+    return results, mutants
+
 
+def compute_ufem(changed_since=None, file_changes=None, components=None,
+                 trace_file=None, progress_path=None, resume=False):
+    """
+    Parameters:
+        - changed_since: Git ref the previous evaluation describes; only what changed
+          since is re-evaluated.
+        - file_changes: Changes since the previous evaluation, as
+          change_impact.diff_against returns them; an alternative to changed_since for
+          callers that track changes themselves.
+        - components: Components to evaluate, defaulting to all of them. Only the stages
+          these components need are run, and the UFEM score is averaged over their
+          weights.
+        - trace_file: Where to write the stage timings as a Chrome trace; defaults to
+          instrumentation.trace_file in the configuration.
+        - progress_path: Where to stream the NDJSON events the report is assembled from
+          ('-' for stdout); defaults to progress.path in the configuration.
+        - resume: Reuse the stages and mutants the previous stream recorded, if it
+          describes the same inputs.
+    Returns:
+        - The evaluation report.
+    """
+    global progress_stream
+    from utils.eval_cache import EvaluationCache
+    from utils.instrumentation import (
+        critical_path,
+        measure,
+        process_usage,
+        write_chrome_trace,
+    )
+    from utils.progress import (
+        ERROR,
+        RESULT,
+        RUN_END,
+        RUN_START,
+        START,
+        ProgressStream,
+    )
+    from utils.scheduler import run_tasks, select_tasks
 
-def compute_ufem():
     logger.info("Starting UFEM evaluation...")
 
     try:
-        CCS = calculate_code_coverage()
-        TCS = perform_mutation_testing()
-        ECHS = evaluate_edge_case_handling()
-        TQS = evaluate_test_quality()
-        EHS = evaluate_exception_handling()
-        DRS = evaluate_duplication()
-        ESR = evaluate_execution_success_rate()
+        if not config:
+            load_config()
+        selected = list(COMPONENTS)
+        if components is not None:
+            selected = [key for key in COMPONENTS if key in components]
+        if not selected:
+            raise ValueError("No components selected")
+        component_scores = {}
+        component_details.clear()
+        run_statistics.clear()
+        failed_components.clear()
+        # Wall time, CPU time and child process usage of every stage, in the report
+        # and optionally as a trace
+        measurements = {}
+        usage_before = process_usage()
+        started = time.perf_counter()
+        changes = None
+        with measure('plan', measurements):
+            if file_changes is not None and previous_artifacts_exist():
+                changes = plan_incremental_run(file_changes, 'the previous evaluation')
+            elif changed_since:
+                changes = detect_changes(changed_since)
+        cache_settings = config.get('cache', {})
+        cache = EvaluationCache(cache_settings.get('path', '.ufem-cache.json'), config)
+        # A resumed run must evaluate exactly the same files, configuration and changes
+        inputs = {'key': cache.key(watched_paths(), list(config)),
+                  'changed_since': changes and changes['ref']}
+
+        progress_path = (progress_path
+                         or config.get('progress', {}).get('path', PROGRESS_FILE))
+        resumed, resumed_mutants = {}, []
+        if resume:
+            resumed, resumed_mutants = load_resumable_results(progress_path, inputs)
+        progress_stream = ProgressStream(progress_path)
+        emit_progress(RUN_START, inputs=inputs, components=selected,
+                      resumed_stages=sorted(resumed))
+
+        cache_keys = {}
+        if not cache_settings.get('enabled', True):
+            cache = None
+        else:
+            with measure('cache_lookup', measurements):
+                for key in selected:
+                    cache_keys[key] = cache.key(component_input_paths(key),
+                                                COMPONENT_INPUTS[key]['config'])
+                    entry = cache.get(key, cache_keys[key])
+                    if entry is not None:
+                        logger.info(f"{key}: inputs unchanged, using cached score")
+                        component_scores[key] = entry['score']
+                        if entry.get('details') is not None:
+                            component_details[key] = entry['details']
+                        emit_progress(RESULT, stage=key, value=entry['score'],
+                                      details=entry.get('details'),
+                                      source='cache')
+
+        if changes is not None:
+            # Components whose inputs did not change keep their previous score
+            with open(REPORT_FILE, 'r') as f:
+                previous_report = json.load(f)
+            previous_details = previous_report.get('Component Details', {})
+            for key, score in previous_report.get('Component Scores', {}).items():
+                if key in selected and key not in component_scores \
+                        and key not in INCREMENTAL_COMPONENTS \
+                        and not inputs_changed(key, changes):
+                    component_scores[key] = score
+                    if key in previous_details:
+                        component_details[key] = previous_details[key]
+                    emit_progress(RESULT, stage=key, value=score,
+                                  details=previous_details.get(key),
+                                  source='previous_report')
+            run_statistics['incremental'] = {
+                'changed_since': changes['ref'],
+                'changed_files': sorted(changes['files']),
+                'impacted_tests': len(changes['tests']),
+            }
+
+        # Results of the interrupted run are recorded again, so this stream is complete
+        # on its own
+        available = {}
+        for name, event in resumed.items():
+            if name in COMPONENTS:
+                if name not in selected or name in component_scores:
+                    continue
+                component_scores[name] = event['value']
+                if event.get('details') is not None:
+                    component_details[name] = event['details']
+            else:
+                available[name] = decode_resource(name, event['value'])
+            emit_progress(RESULT, stage=name, value=event['value'],
+                          details=event.get('details'),
+                          source='resumed')
+
+        def task_started(task):
+            emit_progress(START, stage=task.name)
+
+        def task_finished(task, result):
+            if isinstance(result, StageFailed):
+                # No result to resume from, so a resumed run runs the stage again
+                emit_progress(ERROR, stage=task.name, message=str(result.error),
+                              measurement=measurements.get(task.name))
+                return
+            details = None
+            if task.name in COMPONENTS:
+                details = component_details.get(task.name)
+            emit_progress(RESULT, stage=task.name,
+                          value=encode_resource(task.produces, result), details=details,
+                          measurement=measurements.get(task.name), source='run')
+
+        pending = [key for key in selected if key not in component_scores]
+        if pending:
+            max_workers = config.get('scheduler', {}).get('max_workers', 4)
+            tasks = select_tasks(build_metric_tasks(changes, resumed_mutants), pending)
+            results = run_tasks(tasks, max_workers=max_workers,
+                                measurements=measurements, resources=available,
+                                on_start=task_started, on_finish=task_finished)
+            run_statistics['critical_path'] = critical_path(tasks, measurements)
+            for key in pending:
+                component_scores[key] = results[key]
+                if cache is not None and key not in failed_components:
+                    cache.put(key, cache_keys[key], results[key],
+                              component_details.get(key))
+            if cache is not None:
+                cache.save()
+        component_scores = {key: component_scores[key] for key in selected}
 
         # Calculate UFEM using weights from the configuration
-        UFEM = (
-            (CCS * config['weights']['CCS']) +
-            (TCS * config['weights']['TCS']) +
-            (ECHS * config['weights']['ECHS']) +
-            (TQS * config['weights']['TQS']) +
-            (EHS * config['weights']['EHS']) +
-            (DRS * config['weights']['DRS']) +
-            (ESR * config['weights']['ESR'])
+        UFEM = sum(
+            component_scores[key] * config['weights'][key] for key in selected
         ) / 100.0  # Normalize the score
-
-        component_scores = {
-            'CCS': CCS,
-            'TCS': TCS,
-            'ECHS': ECHS,
-            'TQS': TQS,
-            'EHS': EHS,
-            'DRS': DRS,
-            'ESR': ESR
-        }
+        if selected != COMPONENTS:
+            # A partial evaluation scores the selected components on the same scale
+            UFEM /= sum(config['weights'][key] for key in selected)
+            run_statistics['components'] = selected
 
         logger.info(f"\nFinal UFEM Score: {UFEM:.2f}%")
         for key, value in component_scores.items():
             logger.info(f"{key}: {value:.2f}%")
 
-        generate_report(UFEM, component_scores)
+        run_statistics['stages'] = measurements
+        run_statistics['resources'] = {'wall_seconds': time.perf_counter() - started}
+        usage_after = process_usage()
+        if usage_after is not None:
+            # Max RSS is a high-water mark over the process lifetime, not this run
+            run_statistics['resources'].update({
+                'cpu_seconds': usage_after['cpu_seconds'] - usage_before['cpu_seconds'],
+                'children_cpu_seconds': (usage_after['children_cpu_seconds']
+                                         - usage_before['children_cpu_seconds']),
+                'max_rss_kb': usage_after['max_rss_kb'],
+                'children_max_rss_kb': usage_after['children_max_rss_kb'],
+            })
+        trace_file = trace_file or config.get('instrumentation', {}).get('trace_file')
+        if trace_file:
+            write_chrome_trace(trace_file, measurements)
+            logger.info(f"Stage trace saved to {trace_file}")
+
+        emit_progress(RUN_END, ufem=UFEM, statistics=run_statistics)
+        return generate_report(progress_stream.events, selected)
 
     except Exception as e:
         logger.error(f"An error occurred during UFEM evaluation: {e}")
+        emit_progress(ERROR, message=str(e))
         sys.exit(1)
+    finally:
+        if progress_stream is not None:
+            progress_stream.close()
+            progress_stream = None
+
+
+def run_daemon(socket_path=None, components=None):
+    """
+    Keeps evaluating as files change: runs a full evaluation, then re-evaluates
+    incrementally whenever the watched paths change, and serves the latest report on a
+    Unix socket (see utils.daemon).
+    """
+    global test_runner
+    from utils.daemon import DEFAULT_PRELOAD, EvaluationDaemon, WarmTestRunner
+
+    if not config:
+        load_config()
+    daemon_settings = config.get('daemon', {})
+    runner = WarmTestRunner(daemon_settings.get('preload', DEFAULT_PRELOAD))
+    runner.warm_up()
+    test_runner = runner
+
+    def evaluate(file_changes):
+        if file_changes and CONFIG_FILE in file_changes:
+            load_config()
+        try:
+            return compute_ufem(file_changes=file_changes, components=components)
+        except SystemExit:
+            # A failed evaluation must not stop the daemon; the next change triggers
+            # another attempt
+            return None
+
+    daemon = EvaluationDaemon(
+        evaluate,
+        watched_paths(),
+        socket_path or daemon_settings.get('socket_path', '.ufem-daemon.sock'),
+        poll_interval=daemon_settings.get('poll_interval', 0.5),
+        debounce=daemon_settings.get('debounce', 0.2),
+    )
+    daemon.start()
+    try:
+        daemon.wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.stop()
+
+
+# Modules every suite's evaluation imports, loaded once per batch worker instead of
+# during its first stages
+BATCH_WARM_UP = ['yaml', 'utils.scheduler', 'utils.progress', 'utils.eval_cache',
+                 'utils.coverage_analysis', 'utils.sharding', 'utils.mutation_engine',
+                 'utils.mutation_sampling', 'utils.exception_analysis', 'utils.lint',
+                 'utils.clone_detection', 'utils.llm_cache', 'utils.llm_utils']
+
+
+def _init_batch_worker(worker_config, mutants, descriptions):
+    global config, shared_mutants, edge_case_descriptions
+    import importlib
+
+    config = worker_config
+    shared_mutants = mutants
+    edge_case_descriptions = descriptions
+    for module in BATCH_WARM_UP:
+        try:
+            importlib.import_module(module)
+        except ImportError as e:
+            logger.warning(f"Could not preload {module}: {e}")
+
+
+def _evaluate_suite(workdir, components):
+    # Runs in a batch worker process; evaluations of earlier suites may have left state
+    # in the module globals
+    component_details.clear()
+    run_statistics.clear()
+    os.chdir(workdir)
+    try:
+        return compute_ufem(components=components), None
+    except SystemExit:
+        return None, f"Evaluation failed, see {os.path.join(workdir, PROGRESS_FILE)}"
+
+
+def run_batch(suite_dirs, components=None, max_workers=None):
+    """
+    Evaluates several test suites of the same project in parallel and compares them.
+    Work that does not depend on the suite is done once: the configuration and edge
+    cases are loaded and the mutants of src/ are generated in this process, and every
+    worker process imports the evaluator's modules before taking suites. Each suite is
+    evaluated in its own copy of the project (see utils.batch.prepare_workdir), so
+    coverage data and caches of concurrent evaluations stay apart.
+    Parameters:
+        - suite_dirs: Test suite directories, each evaluated in place of tests/.
+        - components: Components to evaluate, or None for all of them.
+        - max_workers: Suites evaluated at once; defaults to batch.max_workers, or one
+          per CPU.
+    Returns:
+        - The comparative report, also written to batch.report_file.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    from utils.batch import compare_reports, prepare_workdir, suite_names
+    from utils.mutation_engine import list_mutants
+
+    if not config:
+        load_config()
+    settings = config.get('batch', {})
+    root = settings.get('workdir', '.ufem-batch')
+    report_file = settings.get('report_file', 'batch_report.json')
+    selected = components or COMPONENTS
+    started = time.perf_counter()
+
+    names = suite_names(suite_dirs)
+    workdirs = [os.path.abspath(os.path.join(root, name)) for name in names]
+    # The batch root is not part of the project copies
+    top_level = os.path.relpath(os.path.abspath(root)).split(os.sep)[0]
+    for suite_dir, workdir in zip(suite_dirs, workdirs):
+        prepare_workdir('.', suite_dir, workdir, tests_dir='tests', exclude=[top_level])
+
+    mutation = config.get('mutation', {})
+    mutants = list_mutants(mutation.get('paths_to_mutate', 'src/'),
+                           mutation.get('tests_dir', 'tests/'))
+    try:
+        descriptions = load_edge_case_descriptions()
+    except FileNotFoundError as e:
+        logger.error(f"Edge case file not found: {e}")
+        descriptions = []
+    logger.info(f"Prepared {len(names)} suites: {len(mutants)} mutants, "
+                f"{len(descriptions)} edge cases")
+
+    cpus = os.cpu_count() or 1
+    max_workers = max_workers or settings.get('max_workers') or min(len(names), cpus)
+    worker_config = json.loads(json.dumps(config))
+    # Suites share the LLM verdict cache; SQLite serializes their writes
+    llm_cache = worker_config.setdefault('llm', {}).setdefault('cache', {})
+    llm_cache['path'] = os.path.abspath(llm_cache.get('path', '.ufem-llm-cache.sqlite'))
+    # Split the CPUs between the suites evaluated at once rather than giving each all
+    per_suite = max(1, cpus // max_workers)
+    for section in ('test_run', 'mutation', 'lint'):
+        if not worker_config.setdefault(section, {}).get('workers'):
+            worker_config[section]['workers'] = per_suite
+
+    suites = []
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_batch_worker,
+                             initargs=(worker_config, mutants, descriptions)) \
+            as executor:
+        futures = [executor.submit(_evaluate_suite, workdir, components)
+                   for workdir in workdirs]
+        for name, suite_dir, future in zip(names, suite_dirs, futures):
+            try:
+                report, error = future.result()
+            except Exception as e:
+                report, error = None, str(e)
+            if error:
+                logger.error(f"Suite {name} was not evaluated: {error}")
+            suites.append({'name': name, 'path': suite_dir, 'report': report,
+                           'error': error})
+
+    comparison = compare_reports(suites, selected)
+    comparison['Run Statistics'] = {'wall_seconds': time.perf_counter() - started,
+                                    'workers': max_workers, 'mutants': len(mutants)}
+    with open(report_file, 'w') as f:
+        json.dump(comparison, f, indent=4)
+    logger.info(f"Suites ranked by UFEM score: {', '.join(comparison['Ranking'])}")
+    return comparison
+
+
+def parse_components(value):
+    components = [component.strip().upper() for component in value.split(',')
+                  if component.strip()]
+    unknown = [component for component in components if component not in COMPONENTS]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown components {', '.join(unknown)} "
+                                         f"(choose from {', '.join(COMPONENTS)})")
+    return components
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Evaluate the test suite with the "
+                                                 "UnitFlo Evaluation Metric (UFEM).")
+    parser.add_argument('-C', '--project-dir', metavar='DIR', default='.',
+                        help="Evaluate the project in DIR; every other path is "
+                             "relative to it.")
+    parser.add_argument('--config', metavar='PATH', default=CONFIG_FILE,
+                        help=f"Evaluation configuration file (default: {CONFIG_FILE}).")
+    selection = parser.add_mutually_exclusive_group()
+    selection.add_argument('--only', metavar='COMPONENTS', type=parse_components,
+                           help="Comma-separated components to evaluate, e.g. CCS,TQS. "
+                                "Only the stages they need run and the UFEM score is "
+                                "averaged over their weights.")
+    selection.add_argument('--skip', metavar='COMPONENTS', type=parse_components,
+                           help="Comma-separated components not to evaluate.")
+    parser.add_argument('--changed-since', metavar='GIT_REF',
+                        help="Only re-run the tests and mutants impacted by changes "
+                             "since GIT_REF and merge the results into the previous "
+                             f"{REPORT_FILE}, which must describe the code at GIT_REF.")
+    parser.add_argument('--watch', action='store_true',
+                        help="Stay running, re-evaluate whenever src/ or tests/ change "
+                             "and serve the latest report on a Unix socket.")
+    parser.add_argument('--socket', metavar='PATH',
+                        help="Socket path for --watch (default: daemon.socket_path in "
+                             "the configuration).")
+    parser.add_argument('--batch', metavar='SUITE_DIR', nargs='+',
+                        help="Evaluate each SUITE_DIR in place of tests/, in parallel, "
+                             "and write a comparative report (batch.report_file in "
+                             "the configuration).")
+    parser.add_argument('--progress', metavar='PATH',
+                        help="Stream NDJSON progress events to PATH ('-' for stdout; "
+                             "default: progress.path in the configuration, "
+                             f"{PROGRESS_FILE}).")
+    parser.add_argument('--resume', action='store_true',
+                        help="Continue an interrupted evaluation from the stages and "
+                             "mutants its progress stream recorded, if the inputs are "
+                             "unchanged.")
+    parser.add_argument('--trace', metavar='PATH',
+                        help="Write the stage timings as a Chrome trace, viewable in "
+                             "Perfetto or chrome://tracing.")
+    parser.add_argument('--log-level', default='DEBUG',
+                        choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+                        help="Logging level (default: DEBUG).")
+    return parser
+
+
+def main(argv=None):
+    global CONFIG_FILE
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=getattr(logging, args.log_level))
+
+    os.chdir(args.project_dir)
+    CONFIG_FILE = os.path.normpath(args.config)
+    load_config()
+
+    components = args.only
+    if args.skip:
+        components = [component for component in COMPONENTS
+                      if component not in args.skip]
+        if not components:
+            parser.error("--skip leaves no components to evaluate")
+    if args.resume and args.progress == '-':
+        parser.error("--resume needs a progress file, not stdout")
+    if args.batch and (args.watch or args.changed_since or args.resume):
+        parser.error("--batch cannot be combined with --watch, --changed-since or "
+                     "--resume")
+    if args.batch:
+        run_batch(args.batch, components)
+    elif args.watch:
+        run_daemon(args.socket, components)
+    else:
+        compute_ufem(changed_since=args.changed_since, components=components,
+                     trace_file=args.trace,
+                     progress_path=args.progress, resume=args.resume)
+    return 0
 
 
 if __name__ == '__main__':
-    compute_ufem()
+    sys.exit(main())
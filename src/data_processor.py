@@ -6,27 +6,28 @@ from src.exceptions import DataProcessingError
 from src.data.data_source import DataSource
 from src.services.service_a import ServiceA
 from src.services.service_b import ServiceB
-from src.utilities import normalize_data, detect_outliers
+from src.services.pipeline import Pipeline
+from src.online_stats import QuantileSketch, RunningMoments, forward_fill
+from src.utilities import normalize_data, outlier_mask
 from src.validations import validate_dataframe
+from src.log_helpers import summarize
 import logging
 
 logger = logging.getLogger(__name__)
 
+
 class DataProcessor:
     def __init__(self, source: DataSource):
         self.source = source
         self.service_a = ServiceA()
         self.service_b = ServiceB()
+        # Enrichment and transformation run as one fused pass over the data
+        self.pipeline = Pipeline([self.service_a, self.service_b])
 
     def process(self):
         try:
-            data = self.source.fetch_data()
-
-            # Ensure data is in correct format for DataFrame
-            if isinstance(data, dict) and all(isinstance(v, (int, float)) for v in data.values()):
-                data = {k: [v] for k, v in data.items()}  # Convert scalar values to lists
-
-            df = pd.DataFrame(data)
+            df = self._to_frame(self.source.fetch_data())
+            logger.debug("Fetched %s", summarize(df))
             validate_dataframe(df)
             df = normalize_data(df)
 
@@ -39,12 +40,138 @@ class DataProcessor:
             if unknown_values.any():
                 df = df.fillna(method='ffill').fillna(method='bfill')
 
-            outliers = detect_outliers(df)
-            if outliers:
-                df = df.drop(outliers)
-            df = self.service_a.enrich_data(df)
-            df = self.service_b.transform_data(df)
-            return df
+            outliers = outlier_mask(df)
+            if outliers.any():
+                logger.info("Dropping %d outlier rows of %d", outliers.sum(), len(df))
+                # take returns a new frame rather than a slice, so the pipeline can add
+                # columns to it
+                df = df.take(np.flatnonzero(~outliers))
+            return self.pipeline.run(df)
         except Exception as e:
             logger.error(f"Data processing failed: {e}")
             raise DataProcessingError(f"Data processing failed: {e}")
+
+    @staticmethod
+    def _to_frame(data):
+        # Ensure data is in correct format for DataFrame
+        if isinstance(data, dict) \
+                and all(isinstance(v, (int, float)) for v in data.values()):
+            data = {k: [v] for k, v in data.items()}  # Convert scalar values to lists
+        return pd.DataFrame(data)
+
+    def process_stream(self, chunks, threshold=3.5, sketch_capacity=4096):
+        """
+        Chunked version of process, for data too large to hold in memory: only one chunk
+        and the running statistics are held at a time.
+        Parameters:
+            - chunks: Callable returning an iterable of chunks (DataFrames, or anything
+              process accepts from the source), e.g. functools.partial(pd.read_csv,
+              path, chunksize=100_000). It is called twice, for a statistics pass and an
+              output pass, and must yield the same data both times.
+            - threshold: The Modified Z-Score threshold of the outliers.
+            - sketch_capacity: Values kept per level of the median/MAD sketches, see
+              QuantileSketch.
+        Returns:
+            - Iterator of the processed chunks, rows numbered across chunks as process
+              numbers them.
+        Tolerance against process: means and standard deviations are exact up to
+        floating point rounding. Medians and MADs are exact while every column has at
+        most sketch_capacity values, and otherwise within a rank error of about log2(n /
+        sketch_capacity) / sketch_capacity of the n values, so only rows whose Modified
+        Z-Score is that close to the threshold may be dropped or kept differently.
+        """
+        try:
+            statistics = self._stream_statistics(chunks, sketch_capacity)
+            columns, rows, moments, sketches, first_valid = statistics
+            if rows == 0:
+                raise DataProcessingError("DataFrame is empty.")
+            mean = moments.mean
+            std = moments.std(ddof=1)
+            # A column normalizes to NaN without values, or when its standard deviation
+            # is NaN or 0
+            if not (std > 0).any():
+                logger.error("DataFrame contains only NaN values.")
+                raise DataProcessingError("DataFrame contains only NaN values.")
+
+            # Normalizing is affine per column, so it maps the raw medians and MADs into
+            # normalized units
+            with np.errstate(invalid='ignore', divide='ignore'):
+                median = np.array([sketch.median() for sketch in sketches])
+                median = (median - mean) / std
+                mad = np.array([sketch.mad() for sketch in sketches]) / std
+                first_valid = (first_valid - mean) / std
+            mad[mad == 0] = np.finfo(float).eps  # Prevent division by zero
+            limit = (threshold / 0.6745) * mad
+            logger.debug("Streaming %d rows: median %s, MAD %s", rows,
+                         summarize(median), summarize(mad))
+
+            carry = np.full(len(columns), np.nan)
+            offset = 0
+            for chunk in chunks():
+                df = self._to_frame(chunk)
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    block = (df[columns].to_numpy(dtype=np.float64) - mean) / std
+                block, carry = forward_fill(block, carry)
+                # NaNs left by the forward fill precede each column's first value, which
+                # fills them backwards
+                block = np.where(np.isnan(block), first_valid, block)
+                with np.errstate(invalid='ignore'):
+                    outliers = (np.abs(block - median) > limit).any(axis=1)
+                keep = np.flatnonzero(~outliers)
+                if outliers.any():
+                    logger.info("Dropping %d outlier rows of %d", outliers.sum(),
+                                len(block))
+                df = pd.DataFrame(block[keep], index=pd.Index(offset + keep),
+                                  columns=columns)
+                offset += len(block)
+                yield self.pipeline.run(df)
+        except Exception as e:
+            logger.error(f"Data processing failed: {e}")
+            raise DataProcessingError(f"Data processing failed: {e}")
+
+    def _stream_statistics(self, chunks, sketch_capacity):
+        """
+        Statistics pass of process_stream over the raw values.
+        Returns:
+            - The columns of the first chunk and the number of rows.
+            - RunningMoments of the values, as normalize_data sees them.
+            - A QuantileSketch per column of the forward and backward filled values, as
+              outlier_mask sees them.
+            - The first value of each column (NaN where there is none).
+        """
+        columns = None
+        rows = 0
+        for chunk in chunks():
+            df = self._to_frame(chunk)
+            if columns is None:
+                columns = df.columns
+                non_numeric = [name for name, dtype in df.dtypes.items()
+                               if not np.issubdtype(dtype, np.number)]
+                if non_numeric:
+                    raise DataProcessingError("Non-numeric columns cannot be "
+                                              f"streamed: {non_numeric}")
+                moments = RunningMoments(len(columns))
+                sketches = [QuantileSketch(sketch_capacity) for _ in columns]
+                carry = np.full(len(columns), np.nan)
+                first_valid = np.full(len(columns), np.nan)
+                leading = np.zeros(len(columns), dtype=np.int64)
+            block = df[columns].to_numpy(dtype=np.float64)
+            rows += len(block)
+            moments.update(block)
+            filled, carry = forward_fill(block, carry)
+            # Values still missing after the forward fill come before each column's
+            # first value
+            missing = np.isnan(filled).sum(axis=0)
+            found = np.isnan(first_valid) & (missing < len(filled))
+            first_valid[found] = filled[missing[found], np.flatnonzero(found)]
+            leading += missing
+            for position, sketch in enumerate(sketches):
+                sketch.update(filled[:, position])
+        if columns is None:
+            return pd.Index([]), 0, None, None, None
+
+        # The backward fill repeats each column's first value over the values before it
+        for position, sketch in enumerate(sketches):
+            if leading[position] and not np.isnan(first_valid[position]):
+                sketch.update(np.full(leading[position], first_valid[position]))
+        return columns, rows, moments, sketches, first_valid
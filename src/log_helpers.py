@@ -0,0 +1,89 @@
+# src/log_helpers.py
+
+import itertools
+import reprlib
+import threading
+
+_short_repr = reprlib.Repr()
+_short_repr.maxstring = 80
+_short_repr.maxother = 80
+
+
+class Lazy:
+    """
+    Log argument computed only when a record is actually emitted, e.g.
+    logger.debug("Columns: %s", Lazy(describe_columns, df)).
+    """
+    __slots__ = ('func', 'args')
+
+    def __init__(self, func, *args):
+        self.func = func
+        self.args = args
+
+    def __str__(self):
+        return str(self.func(*self.args))
+
+    __repr__ = __str__
+
+
+def describe(obj, items=5):
+    """
+    Returns:
+        - A one-line description of obj: shape, dtypes and null counts of DataFrames,
+          Series and arrays, length and first items of other collections, or a truncated
+          repr.
+    """
+    if hasattr(obj, 'dtypes') and hasattr(obj, 'columns'):
+        counts = obj.dtypes.astype(str).value_counts()
+        dtypes = ', '.join(f"{dtype}: {count}" for dtype, count in counts.items())
+        return (f"DataFrame(shape={obj.shape}, dtypes={{{dtypes}}}, "
+                f"nulls={int(obj.isnull().to_numpy().sum())})")
+    if hasattr(obj, 'dtype') and hasattr(obj, 'isnull'):
+        return (f"Series(name={obj.name!r}, length={len(obj)}, dtype={obj.dtype}, "
+                f"nulls={int(obj.isnull().sum())})")
+    if hasattr(obj, 'dtype') and hasattr(obj, 'shape'):
+        # NaN is the only value not equal to itself
+        nulls = f", nans={int((obj != obj).sum())}" if obj.dtype.kind in 'fc' else ''
+        return f"{type(obj).__name__}(shape={obj.shape}, dtype={obj.dtype}{nulls})"
+    if isinstance(obj, (list, tuple, set, frozenset, dict)):
+        head = ', '.join(_short_repr.repr(item)
+                         for item in itertools.islice(obj, items))
+        more = ', ...' if len(obj) > items else ''
+        return f"{type(obj).__name__}(len={len(obj)}, head=[{head}{more}])"
+    return _short_repr.repr(obj)
+
+
+def summarize(obj):
+    """
+    Returns:
+        - A log argument rendering as describe(obj), and only if the record is emitted.
+    """
+    return Lazy(describe, obj)
+
+
+class Sampler:
+    """
+    Thins out repetitive messages, e.g. one per row or column: lets the first `first`
+    through, then one in every `every`.
+    """
+
+    def __init__(self, first=10, every=100):
+        self.first = first
+        self.every = every
+        self._count = itertools.count()
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            seen = next(self._count)
+        if seen < self.first:
+            return True
+        return self.every > 0 and (seen - self.first) % self.every == self.every - 1
+
+    def select(self, items):
+        """
+        Yields the items whose message the sampler lets through.
+        """
+        for item in items:
+            if self.allow():
+                yield item
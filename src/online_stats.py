@@ -0,0 +1,151 @@
+# src/online_stats.py
+
+import numpy as np
+import warnings
+
+
+class RunningMoments:
+    """
+    Per-column count, mean and sum of squared deviations of a stream of 2-D chunks. Each
+    chunk's moments are computed vectorized and merged with Chan et al.'s parallel form
+    of Welford's update; NaNs are skipped.
+    Parameters:
+        - columns: Number of columns.
+    """
+
+    def __init__(self, columns):
+        self.count = np.zeros(columns)
+        self.mean = np.zeros(columns)
+        self.m2 = np.zeros(columns)
+
+    def update(self, block):
+        count = (~np.isnan(block)).sum(axis=0)
+        with warnings.catch_warnings():
+            # Columns without values in this chunk have no mean and contribute nothing
+            warnings.simplefilter('ignore', RuntimeWarning)
+            mean = np.nanmean(block, axis=0)
+        mean = np.where(count > 0, mean, 0.0)
+        m2 = np.nansum((block - mean) ** 2, axis=0)
+        self.merge(count, mean, m2)
+
+    def merge(self, count, mean, m2):
+        total = self.count + count
+        delta = mean - self.mean
+        with np.errstate(invalid='ignore', divide='ignore'):
+            share = np.where(total > 0, count / total, 0.0)
+        self.mean = self.mean + delta * share
+        self.m2 = self.m2 + m2 + delta ** 2 * self.count * share
+        self.count = total
+
+    def std(self, ddof=1):
+        """
+        Returns:
+            - Per-column standard deviations, NaN where there are no more than ddof
+              values (like pandas).
+        """
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(self.count > ddof, np.sqrt(self.m2 / (self.count - ddof)),
+                            np.nan)
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch of one column (a KLL-style hierarchy of compactors). Level
+    h keeps values of weight 2**h; a level outgrowing the capacity is sorted and every
+    other value moves up a level. Quantiles are exact while at most `capacity` values
+    were added, and otherwise within a rank error of about log2(n / capacity) / capacity
+    of the n values.
+    Parameters:
+        - capacity: Values each level keeps before compacting.
+    """
+
+    def __init__(self, capacity=4096):
+        self.capacity = capacity
+        self.levels = [np.empty(0)]
+        self.count = 0
+        # Alternates which half a compaction keeps, so rank errors cancel out rather
+        # than accumulate
+        self._offset = 0
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        self.count += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compact()
+
+    def merge(self, other):
+        for level, values in enumerate(other.levels):
+            if level == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[level] = np.concatenate([self.levels[level], values])
+        self.count += other.count
+        self._compact()
+
+    def _compact(self):
+        level = 0
+        while level < len(self.levels):
+            values = self.levels[level]
+            if len(values) > self.capacity:
+                values = np.sort(values)
+                # With an odd number of values, the smallest stays at this level
+                odd = len(values) % 2
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1],
+                                                         values[odd + self._offset::2]])
+                self.levels[level] = values[:odd]
+                self._offset ^= 1
+            level += 1
+
+    def _weighted(self, values):
+        weights = np.concatenate([np.full(len(level), 2.0 ** height)
+                                  for height, level in enumerate(self.levels)])
+        order = np.argsort(values, kind='stable')
+        return values[order], np.cumsum(weights[order])
+
+    @staticmethod
+    def _weighted_median(values, cumulative):
+        # Like np.median: the mean of the two middle values when the (weighted) count is
+        # even
+        if len(values) == 0:
+            return np.nan
+        total = cumulative[-1]
+        low = values[np.searchsorted(cumulative, np.floor((total - 1) / 2),
+                                     side='right')]
+        high = values[np.searchsorted(cumulative, np.ceil((total - 1) / 2),
+                                      side='right')]
+        return (low + high) / 2
+
+    def median(self):
+        return self._weighted_median(*self._weighted(np.concatenate(self.levels)))
+
+    def mad(self, center=None):
+        """
+        Returns:
+            - The median absolute deviation from center (default: the median).
+        """
+        if center is None:
+            center = self.median()
+        deviations = np.abs(np.concatenate(self.levels) - center)
+        return self._weighted_median(*self._weighted(deviations))
+
+
+def forward_fill(block, carry):
+    """
+    Replaces the NaNs of a 2-D chunk with the last earlier value of their column,
+    continuing the fill of the previous chunk.
+    Parameters:
+        - block: 2-D array, one column per array column.
+        - carry: Last value of each column in the previous chunks (NaN where there was
+          none).
+    Returns:
+        - The filled block, and the carry for the next chunk.
+    """
+    if len(block) == 0:
+        return block, carry
+    positions = np.where(np.isnan(block), -1, np.arange(len(block))[:, None])
+    np.maximum.accumulate(positions, axis=0, out=positions)
+    filled = np.take_along_axis(block, np.maximum(positions, 0), axis=0)
+    filled = np.where(positions >= 0, filled, carry)
+    return filled, filled[-1]
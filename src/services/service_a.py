@@ -1,14 +1,23 @@
+import numpy as np
 from src.exceptions import ServiceError
+from src.services.pipeline import ALL, Pipeline, Stage
 import logging
 
 logger = logging.getLogger(__name__)
 
-class ServiceA:
+class ServiceA(Stage):
+    reads = ALL
+    writes = ('enriched',)
+
+    def compute(self, columns):
+        # Row sums over every column like Series.sum: NaNs are skipped, bools count as 0
+        # and 1, and non-numeric data is an error
+        return {'enriched': np.nansum(columns.values(), axis=1)}
+
     def enrich_data(self, df):
         try:
             # Simulate data enrichment
-            df['enriched'] = df.apply(lambda x: x.sum(), axis=1)
-            return df
+            return Pipeline([self]).run(df)
         except Exception as e:
             logger.error(f"Data enrichment failed: {e}")
             raise ServiceError(f"Data enrichment failed: {e}")
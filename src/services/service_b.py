@@ -1,14 +1,20 @@
 from src.exceptions import ServiceError
+from src.services.pipeline import Pipeline, Stage
 import logging
 
 logger = logging.getLogger(__name__)
 
-class ServiceB:
+class ServiceB(Stage):
+    reads = ('enriched',)
+    writes = ('transformed',)
+
+    def compute(self, columns):
+        return {'transformed': columns['enriched'] * 2}
+
     def transform_data(self, df):
         try:
             # Simulate data transformation with unknown edge cases
-            df['transformed'] = df['enriched'] * 2
-            return df
-        except KeyError as e:
+            return Pipeline([self]).run(df)
+        except ServiceError as e:
             logger.error(f"Data transformation failed: {e}")
             raise ServiceError(f"Data transformation failed: {e}")
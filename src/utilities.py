@@ -2,66 +2,112 @@
 
 import pandas as pd
 import numpy as np
+import warnings
 from src.exceptions import UtilityError
+from src.log_helpers import Sampler, summarize
 import logging
 
 logger = logging.getLogger(__name__)
 
 def normalize_data(df: pd.DataFrame) -> pd.DataFrame:
     try:
-        logger.info(f"Starting normalization for dataframe:\n{df}")
+        logger.info("Starting normalization for %s", summarize(df))
         normalized_df = (df - df.mean()) / df.std()
-        logger.info(f"Normalization successful. Result:\n{normalized_df}")
+        logger.debug("Normalization successful. Result: %s", summarize(normalized_df))
         return normalized_df
     except Exception as e:
         logger.error(f"Data normalization failed: {e}")
         raise UtilityError(f"Data normalization failed: {e}")
 
-def detect_outliers(df: pd.DataFrame, threshold: float = 3.5) -> list:
+def outlier_mask(df: pd.DataFrame, threshold: float = 3.5, per_column: bool = False):
     """
-    Detects outliers in a DataFrame using the Modified Z-Score method.
+    Flags outliers using the Modified Z-Score method, for all numeric columns at once.
+    Medians and MADs come from one NumPy pass over the numeric columns as a 2-D array;
+    NaNs are ignored.
     Parameters:
         - df: pandas DataFrame
         - threshold: The Modified Z-Score threshold. Default is 3.5.
+        - per_column: Also return the mask of each numeric column. Default is False.
     Returns:
-        - List of indices where outliers are detected.
+        - Boolean array with one entry per row, True where any numeric column is an
+          outlier.
+        - If per_column is True, also a boolean DataFrame with the outliers of each
+          numeric column.
     """
     try:
         if not isinstance(df, pd.DataFrame):
-            logger.error(f"Input is not a DataFrame: {df}")
+            logger.error("Input is not a DataFrame: %s", summarize(df))
             raise UtilityError("Input must be a DataFrame")
 
-        logger.info(f"Starting outlier detection for dataframe:\n{df}")
-
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
-        if numeric_cols.empty:
+        numeric = df.select_dtypes(include=[np.number])
+        if numeric.shape[1] == 0:
             logger.warning("No numeric columns found in dataframe.")
-            return []
+            column_masks = np.zeros((0, len(df)), dtype=bool)
+        else:
+            # One row per column, so each median is taken over contiguous memory
+            columns = np.ascontiguousarray(numeric.to_numpy(dtype=np.float64).T)
+            # NaNs are rare here, and np.median is much faster than np.nanmedian on long
+            # columns
+            median_of = np.nanmedian if np.isnan(columns).any() else np.median
+            scratch = columns.copy()
+            with warnings.catch_warnings():
+                # All-NaN columns have no median and flag nothing
+                warnings.simplefilter('ignore', RuntimeWarning)
+                median = median_of(scratch, axis=1, overwrite_input=True)[:, None]
+                np.abs(np.subtract(columns, median, out=scratch), out=scratch)
+                mad = median_of(scratch, axis=1, overwrite_input=True)[:, None]
+            mad[mad == 0] = np.finfo(float).eps  # Prevent division by zero
+            # The MAD's median reordered the deviations, so they are recomputed in place
+            np.abs(np.subtract(columns, median, out=scratch), out=scratch)
+            # |0.6745 * (x - median) / mad| > threshold, compared without scaling every
+            # value
+            column_masks = scratch > (threshold / 0.6745) * mad
+            if logger.isEnabledFor(logging.DEBUG):
+                # The first columns of each call, then one in a hundred
+                column_sampler = Sampler(first=10, every=100)
+                for position in column_sampler.select(range(len(numeric.columns))):
+                    logger.debug("Column: %s, Median: %s, MAD: %s, outliers: %d",
+                                 numeric.columns[position],
+                                 median[position, 0], mad[position, 0],
+                                 column_masks[position].sum())
 
-        outlier_indices = []
-        for col in numeric_cols:
-            data = df[col]
-            median = data.median()
-            mad = np.median(np.abs(data - median))
-            if mad == 0:
-                mad = np.finfo(float).eps  # Prevent division by zero
-            modified_z_scores = 0.6745 * (data - median) / mad
-            logger.info(f"Column: {col}, Median: {median}, MAD: {mad}")
-            logger.info(f"Modified Z-Scores for column '{col}':\n{modified_z_scores}")
-            col_outliers = data[np.abs(modified_z_scores) > threshold].index.tolist()
-            logger.info(f"Outliers detected in column '{col}': {col_outliers}")
-            outlier_indices.extend(col_outliers)
+        mask = column_masks.any(axis=0)
+        if per_column:
+            return mask, pd.DataFrame(column_masks.T, index=df.index,
+                                      columns=numeric.columns)
+        return mask
+    except UtilityError:
+        raise
+    except Exception as e:
+        logger.error(f"Outlier detection failed: {e}")
+        raise UtilityError(f"Outlier detection failed: {e}")
+
+def detect_outliers(df: pd.DataFrame, threshold: float = 3.5) -> list:
+    """
+    Detects outliers in a DataFrame using the Modified Z-Score method.
+    Parameters:
+        - df: pandas DataFrame
+        - threshold: The Modified Z-Score threshold. Default is 3.5.
+    Returns:
+        - List of indices where outliers are detected.
+    """
+    try:
+        if not isinstance(df, pd.DataFrame):
+            logger.error("Input is not a DataFrame: %s", summarize(df))
+            raise UtilityError("Input must be a DataFrame")
 
-        unique_outliers = list(set(outlier_indices))
-        logger.info(f"Total unique outliers detected: {unique_outliers}")
-        return unique_outliers
+        logger.info("Starting outlier detection for %s", summarize(df))
+        outliers = df.index[outlier_mask(df, threshold)].unique().tolist()
+        logger.info("Total unique outliers detected: %d", len(outliers))
+        logger.debug("Outlier indices: %s", summarize(outliers))
+        return outliers
     except Exception as e:
         logger.error(f"Outlier detection failed: {e}")
         raise UtilityError(f"Outlier detection failed: {e}")
 
 def preprocess_input(input_data):
     try:
-        logger.info(f"Preprocessing input: {input_data}")
+        logger.info("Preprocessing input: %s", summarize(input_data))
         if isinstance(input_data, dict):
             processed_input = np.array(list(input_data.values()))
         elif isinstance(input_data, list):
@@ -70,7 +116,7 @@ def preprocess_input(input_data):
             processed_input = input_data
         else:
             raise ValueError("Unsupported input data type.")
-        logger.info(f"Preprocessed input result: {processed_input}")
+        logger.debug("Preprocessed input result: %s", summarize(processed_input))
         return processed_input
     except Exception as e:
         logger.error(f"Input preprocessing failed: {e}")
@@ -2,6 +2,7 @@
 
 import unittest
 from unittest.mock import patch, MagicMock
+import numpy as np
 import pandas as pd
 from src.data_processor import DataProcessor
 from src.data.data_source import DataSource
@@ -16,10 +17,9 @@ logger = logging.getLogger(__name__)
 class TestDataProcessor(unittest.TestCase):
 
     def test_process_success(self):
-        with patch('src.data_processor.ServiceB') as mock_service_b_class, \
-             patch('src.data_processor.ServiceA') as mock_service_a_class, \
+        with patch('src.data_processor.Pipeline') as mock_pipeline_class, \
              patch('src.data_processor.normalize_data') as mock_normalize_data, \
-             patch('src.data_processor.detect_outliers') as mock_detect_outliers, \
+             patch('src.data_processor.outlier_mask') as mock_outlier_mask, \
              patch('src.data_processor.DataSource') as mock_data_source_class:
 
             # Mock DataSource
@@ -30,23 +30,31 @@ class TestDataProcessor(unittest.TestCase):
             # Mock normalize_data
             mock_normalize_data.return_value = pd.DataFrame({'col1': [0.1, 0.2], 'col2': [0.3, 0.4]})
 
-            # Mock detect_outliers
-            mock_detect_outliers.return_value = []
+            # Mock outlier_mask
+            mock_outlier_mask.return_value = np.array([False, False])
 
-            # Mock ServiceA and ServiceB
-            mock_service_a = MagicMock()
-            mock_service_a.enrich_data.return_value = pd.DataFrame({'col1': [0.1, 0.2], 'col2': [0.3, 0.4], 'enriched': [0.4, 0.6]})
-            mock_service_a_class.return_value = mock_service_a
-
-            mock_service_b = MagicMock()
-            mock_service_b.transform_data.return_value = pd.DataFrame({'col1': [0.1, 0.2], 'col2': [0.3, 0.4], 'enriched': [0.4, 0.6], 'transformed': [0.8, 1.2]})
-            mock_service_b_class.return_value = mock_service_b
+            # Mock the fused ServiceA/ServiceB pipeline
+            mock_pipeline = MagicMock()
+            mock_pipeline.run.return_value = pd.DataFrame({'col1': [0.1, 0.2],
+                                                           'col2': [0.3, 0.4],
+                                                           'enriched': [0.4, 0.6],
+                                                           'transformed': [0.8, 1.2]})
+            mock_pipeline_class.return_value = mock_pipeline
 
             data_source = DataSource()
             processor = DataProcessor(data_source)
             result = processor.process()
             self.assertIn('transformed', result.columns)
 
+    def test_process_enriches_and_transforms(self):
+        data_source = MagicMock()
+        data_source.fetch_data.return_value = {'col1': [1.0, 2.0, 3.0],
+                                               'col2': [3.0, 2.0, 1.0]}
+        processor = DataProcessor(data_source)
+        result = processor.process()
+        np.testing.assert_allclose(result['enriched'], result['col1'] + result['col2'])
+        np.testing.assert_allclose(result['transformed'], result['enriched'] * 2)
+
     def test_process_failure(self):
         data_source = MagicMock()
         data_source.fetch_data.side_effect = Exception("Data fetch failed")
@@ -54,6 +62,14 @@ class TestDataProcessor(unittest.TestCase):
         with self.assertRaises(DataProcessingError):
             processor.process()
 
+    def test_process_drops_outlier_rows(self):
+        data_source = MagicMock()
+        data_source.fetch_data.return_value = {'col1': [1.0, 2.0, 3.0, 2.0, 100.0],
+                                               'col2': [4.0, 5.0, 6.0, 5.0, 4.0]}
+        processor = DataProcessor(data_source)
+        result = processor.process()
+        self.assertEqual(result.index.tolist(), [0, 1, 2, 3])
+
     def test_process_nan_dataframe(self):
         data_source = MagicMock()
         data_source.fetch_data.return_value = {'col1': [float('nan'), float('nan')]}
@@ -62,5 +78,52 @@ class TestDataProcessor(unittest.TestCase):
             processor.process()
 
 
+class TestProcessStream(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.df = pd.DataFrame({'col1': rng.normal(size=3000),
+                                'col2': rng.standard_t(3, size=3000) * 5 + 2})
+        self.df.loc[rng.choice(3000, 60, replace=False), 'col1'] = np.nan
+        self.df.loc[:4, 'col2'] = np.nan  # Leading NaNs are filled backwards
+        data_source = MagicMock()
+        data_source.fetch_data.return_value = self.df
+        self.processor = DataProcessor(data_source)
+
+    def chunks(self, size):
+        return lambda: (self.df.iloc[start:start + size]
+                        for start in range(0, len(self.df), size))
+
+    def test_matches_process_while_the_sketches_are_exact(self):
+        expected = self.processor.process()
+        result = pd.concat(list(self.processor.process_stream(self.chunks(256))))
+        self.assertLess(len(result), len(self.df))
+        pd.testing.assert_frame_equal(result, expected, check_index_type=False,
+                                      rtol=1e-9)
+
+    def test_matches_process_within_the_sketch_tolerance(self):
+        expected = self.processor.process()
+        result = pd.concat(list(self.processor.process_stream(self.chunks(500),
+                                                              sketch_capacity=256)))
+        # Only rows close to the threshold may differ
+        self.assertLess(len(expected.index.symmetric_difference(result.index)),
+                        0.01 * len(self.df))
+        common = expected.index.intersection(result.index)
+        np.testing.assert_allclose(result.loc[common], expected.loc[common], rtol=1e-9,
+                                   atol=1e-12)
+
+    def test_yields_one_chunk_at_a_time(self):
+        chunks = self.processor.process_stream(self.chunks(1000))
+        self.assertLess(next(chunks).index.max(), 1000)
+        self.assertGreaterEqual(next(chunks).index.min(), 1000)
+
+    def test_empty_and_nan_streams(self):
+        with self.assertRaises(DataProcessingError):
+            list(self.processor.process_stream(lambda: iter([])))
+        with self.assertRaises(DataProcessingError):
+            chunks = [{'col1': [np.nan, np.nan]}, {'col1': [np.nan]}]
+            list(self.processor.process_stream(lambda: iter(chunks)))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,61 @@
+# tests/test_log_helpers.py
+
+import logging
+import threading
+import unittest
+import numpy as np
+import pandas as pd
+from src.log_helpers import Lazy, Sampler, describe, summarize
+
+
+class TestLazyArguments(unittest.TestCase):
+
+    def test_not_computed_below_the_level(self):
+        calls = []
+        logger = logging.getLogger('lazy')
+        logger.setLevel(logging.INFO)
+        logger.debug("value: %s", Lazy(lambda: calls.append(1)))
+        self.assertEqual(calls, [])
+        with self.assertLogs(logger, logging.INFO) as logs:
+            logger.info("value: %s", Lazy(lambda value: value * 2, 21))
+        self.assertEqual(logs.records[0].getMessage(), "value: 42")
+
+    def test_describe_summarizes_large_objects(self):
+        df = pd.DataFrame({'a': [1.0, np.nan, 3.0], 'b': [1, 2, 3],
+                           'c': ['x', 'y', None]})
+        self.assertEqual(describe(df),
+                         "DataFrame(shape=(3, 3), dtypes={float64: 1, int64: 1, "
+                         "object: 1}, nulls=2)")
+        self.assertEqual(describe(df['a']),
+                         "Series(name='a', length=3, dtype=float64, nulls=1)")
+        self.assertEqual(describe(np.array([[1.0, np.nan]])),
+                         "ndarray(shape=(1, 2), dtype=float64, nans=1)")
+        self.assertEqual(describe(list(range(100))),
+                         "list(len=100, head=[0, 1, 2, 3, 4, ...])")
+        self.assertEqual(str(summarize({'a': 1})), "dict(len=1, head=['a'])")
+        self.assertLessEqual(len(describe('x' * 1000)), 80)
+
+
+class TestSampler(unittest.TestCase):
+
+    def test_first_then_every(self):
+        sampler = Sampler(first=2, every=3)
+        self.assertEqual(list(sampler.select(range(10))), [0, 1, 4, 7])
+
+    def test_thread_safe(self):
+        sampler = Sampler(first=5, every=0)
+        allowed = []
+
+        def worker():
+            allowed.extend(item for item in range(1000) if sampler.allow())
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(allowed), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+# tests/test_online_stats.py
+
+import unittest
+import numpy as np
+import pandas as pd
+from src.online_stats import QuantileSketch, RunningMoments, forward_fill
+
+
+class TestRunningMoments(unittest.TestCase):
+
+    def test_matches_pandas_over_chunks(self):
+        rng = np.random.default_rng(1)
+        data = rng.normal(1e6, 3.0, size=(1000, 3))
+        data[rng.random(data.shape) < 0.05] = np.nan
+        data[:, 2] = np.nan
+        data[500, 2] = 7.0  # One value: a mean but no standard deviation
+        moments = RunningMoments(3)
+        for start in range(0, 1000, 128):
+            moments.update(data[start:start + 128])
+        expected = pd.DataFrame(data)
+        np.testing.assert_allclose(moments.mean, expected.mean(), rtol=1e-12)
+        np.testing.assert_allclose(moments.std(), expected.std(), rtol=1e-9)
+        np.testing.assert_array_equal(moments.count, expected.count())
+
+
+class TestQuantileSketch(unittest.TestCase):
+
+    def test_exact_below_capacity(self):
+        values = np.random.default_rng(2).exponential(size=1001)
+        sketch = QuantileSketch(capacity=2048)
+        for part in np.array_split(values, 7):
+            sketch.update(part)
+        self.assertEqual(sketch.median(), np.median(values))
+        self.assertEqual(sketch.mad(), np.median(np.abs(values - np.median(values))))
+        sketch.update(np.array([np.nan]))
+        self.assertEqual(sketch.count, 1001)
+
+    def test_rank_error_above_capacity(self):
+        values = np.random.default_rng(3).normal(size=200000)
+        left, right = QuantileSketch(capacity=512), QuantileSketch(capacity=512)
+        for part in np.array_split(values, 20):
+            left.update(part)
+        right.update(values[:10])
+        left.merge(right)
+        values = np.concatenate([values, values[:10]])
+        rank = np.mean(values <= left.median())
+        self.assertAlmostEqual(rank, 0.5, delta=np.log2(len(values) / 512) / 512)
+        deviations = np.abs(values - left.median())
+        self.assertAlmostEqual(np.mean(deviations <= left.mad()), 0.5, delta=0.02)
+
+
+class TestForwardFill(unittest.TestCase):
+
+    def test_continues_across_chunks(self):
+        data = np.array([[np.nan, 1.0], [2.0, np.nan], [np.nan, np.nan], [np.nan, 4.0],
+                         [5.0, np.nan]])
+        carry = np.full(2, np.nan)
+        filled = []
+        for part in (data[:2], data[2:2], data[2:4], data[4:]):
+            part, carry = forward_fill(part, carry)
+            filled.append(part)
+        np.testing.assert_array_equal(np.vstack(filled),
+                                      pd.DataFrame(data).ffill().to_numpy())
+        np.testing.assert_array_equal(carry, [5.0, 4.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,7 @@
 import unittest
+import numpy as np
 import pandas as pd
+from src.services.pipeline import Pipeline, Stage
 from src.services.service_a import ServiceA
 from src.services.service_b import ServiceB
 from src.exceptions import ServiceError
@@ -13,6 +15,17 @@ class TestServiceA(unittest.TestCase):
         result = service_a.enrich_data(df)
         self.assertIn('enriched', result.columns)
 
+    def test_enrich_data_matches_row_sums(self):
+        df = pd.DataFrame({'A': [1.0, np.nan, 3.0], 'B': [3, 4, 5],
+                           'C': [True, False, True]})
+        result = ServiceA().enrich_data(df)
+        self.assertEqual(result['enriched'].tolist(), [5.0, 4.0, 9.0])
+
+    def test_enrich_data_non_numeric_column(self):
+        df = pd.DataFrame({'A': [1, 2], 'B': ['x', 'y']})
+        with self.assertRaises(ServiceError):
+            ServiceA().enrich_data(df)
+
     def test_enrich_data_failure(self):
         service_a = ServiceA()
         with self.assertRaises(ServiceError):
@@ -40,5 +53,25 @@ class TestServiceB(unittest.TestCase):
             service_b.transform_data(df)
 
 
+class TestPipeline(unittest.TestCase):
+
+    def test_fused_stages(self):
+        df = pd.DataFrame({'A': [1, 2], 'B': [3, 4]})
+        result = Pipeline([ServiceA(), ServiceB()]).run(df)
+        self.assertIs(result, df)
+        self.assertEqual(result['enriched'].tolist(), [4, 6])
+        self.assertEqual(result['transformed'].tolist(), [8, 12])
+
+    def test_missing_columns_fail_before_any_stage_runs(self):
+        df = pd.DataFrame({'A': [1, 2]})
+        with self.assertRaises(ServiceError):
+            Pipeline([ServiceB(), ServiceA()]).run(df)
+        self.assertEqual(list(df.columns), ['A'])
+
+    def test_stages_must_implement_compute(self):
+        with self.assertRaises(TypeError):
+            Stage()
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,7 +1,12 @@
 import unittest
 import pandas as pd
 import numpy as np
-from src.utilities import normalize_data, detect_outliers, preprocess_input
+from src.utilities import (
+    normalize_data,
+    detect_outliers,
+    outlier_mask,
+    preprocess_input,
+)
 from src.exceptions import UtilityError
 import logging
 
@@ -44,6 +49,38 @@ class TestUtilities(unittest.TestCase):
         with self.assertRaises(UtilityError):
             detect_outliers(None)
 
+    def test_outlier_mask_success(self):
+        df = pd.DataFrame({'A': [1, 2, 100], 'B': [4, 5, 6], 'C': ['x', 'y', 'z']})
+        mask, column_masks = outlier_mask(df, per_column=True)
+        self.assertEqual(mask.tolist(), [False, False, True])
+        self.assertEqual(list(column_masks.columns), ['A', 'B'])
+        self.assertEqual(column_masks['A'].tolist(), [False, False, True])
+        self.assertFalse(column_masks['B'].any())
+
+    def test_outlier_mask_ignores_nan(self):
+        df = pd.DataFrame({'A': [1.0, 2.0, np.nan, 100.0], 'B': [np.nan] * 4})
+        mask = outlier_mask(df)
+        self.assertEqual(mask.tolist(), [False, False, False, True])
+
+    def test_outlier_mask_no_numeric_columns(self):
+        df = pd.DataFrame({'A': ['x', 'y']})
+        self.assertEqual(outlier_mask(df).tolist(), [False, False])
+
+    def test_outlier_mask_column_logs_do_not_depend_on_earlier_calls(self):
+        df = pd.DataFrame(np.arange(60, dtype=float).reshape(5, 12))
+        messages = []
+        for _ in range(2):
+            with self.assertLogs('src.utilities', logging.DEBUG) as logs:
+                outlier_mask(df)
+            messages.append([message for message in logs.output
+                             if 'Column:' in message])
+        self.assertEqual(len(messages[0]), 10)
+        self.assertEqual(messages[0], messages[1])
+
+    def test_outlier_mask_failure(self):
+        with self.assertRaises(UtilityError):
+            outlier_mask([1, 2, 3])
+
     def test_preprocess_input_success_dict(self):
         input_data = {'a': 1, 'b': 2}
         result = preprocess_input(input_data)
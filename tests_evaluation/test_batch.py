@@ -0,0 +1,93 @@
+# tests_evaluation/test_batch.py
+
+import os
+import tempfile
+import unittest
+from utils.batch import compare_reports, prepare_workdir, suite_names
+
+
+def write(path, content=''):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(content)
+
+
+class TestSuiteNames(unittest.TestCase):
+
+    def test_names_are_unique(self):
+        self.assertEqual(suite_names(['suites/gpt', 'other/gpt/', 'suites/claude']),
+                         ['gpt', 'gpt-2', 'claude'])
+
+    def test_suffixed_names_do_not_collide(self):
+        names = suite_names(['a/x', 'b/x', 'x-2'])
+        self.assertEqual(len(set(names)), 3)
+
+
+class TestPrepareWorkdir(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.project = os.path.join(self.tmp_dir.name, 'project')
+        write(os.path.join(self.project, 'src', 'calc.py'),
+              'def add(a, b):\n    return a + b\n')
+        write(os.path.join(self.project, 'tests', 'test_original.py'))
+        write(os.path.join(self.project, 'config_evaluation.yml'), 'weights: {}\n')
+        write(os.path.join(self.project, '.coverage'), 'project coverage')
+        write(os.path.join(self.project, '.ufem-batch', 'stale', 'file'))
+        self.suite = os.path.join(self.tmp_dir.name, 'suite')
+        write(os.path.join(self.suite, 'test_calc.py'), 'def test_add():\n    pass\n')
+        self.workdir = os.path.join(self.project, '.ufem-batch', 'suite')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_suite_replaces_the_tests(self):
+        prepare_workdir(self.project, self.suite, self.workdir, exclude=['.ufem-batch'])
+        self.assertEqual(sorted(os.listdir(self.workdir)),
+                         ['config_evaluation.yml', 'src', 'tests'])
+        self.assertEqual(os.listdir(os.path.join(self.workdir, 'tests')),
+                         ['test_calc.py'])
+        self.assertTrue(os.path.exists(os.path.join(self.workdir, 'src', 'calc.py')))
+
+    def test_artifacts_survive_and_sources_are_refreshed(self):
+        prepare_workdir(self.project, self.suite, self.workdir, exclude=['.ufem-batch'])
+        write(os.path.join(self.workdir, '.coverage'), 'suite coverage')
+        write(os.path.join(self.project, 'src', 'calc.py'),
+              'def add(a, b):\n    return b + a\n')
+        os.remove(os.path.join(self.suite, 'test_calc.py'))
+        write(os.path.join(self.suite, 'test_other.py'))
+
+        prepare_workdir(self.project, self.suite, self.workdir, exclude=['.ufem-batch'])
+        with open(os.path.join(self.workdir, '.coverage')) as f:
+            self.assertEqual(f.read(), 'suite coverage')
+        with open(os.path.join(self.workdir, 'src', 'calc.py')) as f:
+            self.assertIn('return b + a', f.read())
+        self.assertEqual(os.listdir(os.path.join(self.workdir, 'tests')),
+                         ['test_other.py'])
+
+
+class TestCompareReports(unittest.TestCase):
+
+    def test_ranks_suites_and_keeps_failures(self):
+        suites = [
+            {'name': 'a', 'path': 'suites/a',
+             'report': {'UFEM Score': 60.0,
+                        'Component Scores': {'CCS': 90.0, 'TQS': 40.0}}},
+            {'name': 'b', 'path': 'suites/b',
+             'report': {'UFEM Score': 70.0,
+                        'Component Scores': {'CCS': 80.0, 'TQS': 70.0}}},
+            {'name': 'c', 'path': 'suites/c', 'report': None,
+             'error': 'Evaluation failed'},
+        ]
+        comparison = compare_reports(suites, ['CCS', 'TQS', 'DRS'])
+        self.assertEqual(comparison['Ranking'], ['b', 'a'])
+        self.assertEqual(comparison['Best per Component'],
+                         {'CCS': {'suite': 'a', 'score': 90.0},
+                          'TQS': {'suite': 'b', 'score': 70.0}})
+        self.assertEqual(comparison['Suites']['c'],
+                         {'path': 'suites/c', 'error': 'Evaluation failed'})
+        self.assertEqual(comparison['Suites']['a']['UFEM Score'], 60.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
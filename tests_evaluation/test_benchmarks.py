@@ -0,0 +1,60 @@
+# tests_evaluation/test_benchmarks.py
+
+import unittest
+from benchmarks.pipeline import find_regressions
+
+
+def timings(stages, size='100'):
+    return {'sizes': {size: {'stages': stages}}}
+
+
+class TestFindRegressions(unittest.TestCase):
+
+    def test_slowdown_just_below_threshold_passes(self):
+        regressions = find_regressions(timings({'lint': 12.4}), timings({'lint': 10.0}),
+                                       threshold=0.25, min_seconds=0.1)
+        self.assertEqual(regressions, [])
+
+    def test_slowdown_just_above_threshold_fails(self):
+        regressions = find_regressions(timings({'lint': 12.6}), timings({'lint': 10.0}),
+                                       threshold=0.25, min_seconds=0.1)
+        self.assertEqual(len(regressions), 1)
+        self.assertEqual(regressions[0]['size'], '100')
+        self.assertEqual(regressions[0]['stage'], 'lint')
+        self.assertEqual(regressions[0]['baseline'], 10.0)
+        self.assertEqual(regressions[0]['seconds'], 12.6)
+        self.assertAlmostEqual(regressions[0]['slowdown'], 0.26)
+
+    def test_slowdown_just_below_min_seconds_passes(self):
+        # 0.19s is 90% slower than the baseline, but the added 0.09s is within the
+        # timing noise
+        regressions = find_regressions(timings({'lint': 0.19}), timings({'lint': 0.1}),
+                                       threshold=0.25, min_seconds=0.1)
+        self.assertEqual(regressions, [])
+
+    def test_slowdown_just_above_min_seconds_fails(self):
+        regressions = find_regressions(timings({'lint': 0.21}), timings({'lint': 0.1}),
+                                       threshold=0.25, min_seconds=0.1)
+        self.assertEqual([regression['stage'] for regression in regressions], ['lint'])
+
+    def test_stage_missing_from_baseline_is_skipped(self):
+        regressions = find_regressions(timings({'lint': 5.0, 'coverage': 50.0}),
+                                       timings({'lint': 5.0}),
+                                       threshold=0.25, min_seconds=0.1)
+        self.assertEqual(regressions, [])
+
+    def test_size_missing_from_baseline_is_skipped(self):
+        regressions = find_regressions(timings({'lint': 50.0}, size='1000'),
+                                       timings({'lint': 5.0}),
+                                       threshold=0.25, min_seconds=0.1)
+        self.assertEqual(regressions, [])
+
+    def test_zero_baseline_has_no_relative_slowdown(self):
+        regressions = find_regressions(timings({'lint': 1.0}), timings({'lint': 0.0}),
+                                       threshold=0.25, min_seconds=0.1)
+        self.assertEqual(len(regressions), 1)
+        self.assertIsNone(regressions[0]['slowdown'])
+
+
+if __name__ == '__main__':
+    unittest.main()
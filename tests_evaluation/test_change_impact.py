@@ -0,0 +1,238 @@
+# tests_evaluation/test_change_impact.py
+
+import os
+import tempfile
+import unittest
+import git
+from coverage import CoverageData
+from utils.change_impact import (
+    carry_over_mutant_results,
+    changed_old_lines,
+    diff_against,
+    diff_contents,
+    find_impacted_tests,
+    map_line,
+    merge_coverage_data,
+    merge_test_reports,
+    parse_unified_diff,
+)
+from utils.mutation_engine import Mutant
+
+DIFF = """diff --git a/src/utilities.py b/src/utilities.py
+index 1111111..2222222 100644
+--- a/src/utilities.py
++++ b/src/utilities.py
+@@ -10 +10,2 @@ def normalize_data(df):
+-    return df
++    # normalized
++    return df.copy()
+@@ -20,0 +22,3 @@ def detect_outliers(df):
++--- not a header
++x = 1
++y = 2
+diff --git a/src/old.py b/src/old.py
+deleted file mode 100644
+--- a/src/old.py
++++ /dev/null
+@@ -1,2 +0,0 @@
+-def old():
+-    pass
+"""
+
+# Hunks of the src/utilities.py change above
+HUNKS = [(10, 1, 10, 2), (20, 0, 22, 3)]
+
+LINE_CONTEXTS = {
+    'src/utilities.py': {
+        1: [],
+        10: ['tests/test_utilities.py::test_normalize'],
+        21: ['tests/test_utilities.py::test_outliers',
+             'tests/test_model.py::test_predict'],
+        30: ['tests/test_validations.py::test_validate'],
+    },
+    'src/model.py': {5: ['tests/test_model.py::test_predict']},
+}
+
+
+class TestDiffs(unittest.TestCase):
+
+    def test_parse_unified_diff(self):
+        changes = parse_unified_diff(DIFF)
+        self.assertEqual(changes['src/utilities.py'],
+                         {'status': 'modified', 'hunks': HUNKS})
+        self.assertEqual(changes['src/old.py'],
+                         {'status': 'deleted', 'hunks': [(1, 2, 0, 0)]})
+
+    def test_line_mapping(self):
+        self.assertEqual(changed_old_lines(HUNKS), {10, 20, 21})
+        self.assertEqual(map_line(HUNKS, 5), 5)
+        self.assertIsNone(map_line(HUNKS, 10))
+        self.assertEqual(map_line(HUNKS, 15), 16)
+        self.assertEqual(map_line(HUNKS, 20), 21)
+        self.assertEqual(map_line(HUNKS, 21), 25)
+
+    def test_diff_against_git_ref(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            repo = git.Repo.init(tmp_dir)
+            os.makedirs(os.path.join(tmp_dir, 'src'))
+            with open(os.path.join(tmp_dir, 'src', 'module.py'), 'w') as f:
+                f.write("a = 1\nb = 2\nc = 3\n")
+            repo.index.add(['src/module.py'])
+            repo.index.commit('base', author=git.Actor('a', 'a@example.com'),
+                              committer=git.Actor('a', 'a@example.com'))
+            with open(os.path.join(tmp_dir, 'src', 'module.py'), 'w') as f:
+                f.write("a = 1\nb = 20\nc = 3\n")
+            with open(os.path.join(tmp_dir, 'src', 'new.py'), 'w') as f:
+                f.write("d = 4\n")
+
+            changes = diff_against('HEAD', ['src/'], project_dir=tmp_dir)
+
+        self.assertEqual(changes, {
+            os.path.join('src', 'module.py'): {'status': 'modified',
+                                               'hunks': [(2, 1, 2, 1)]},
+            os.path.join('src', 'new.py'): {'status': 'added', 'hunks': []},
+        })
+
+    def test_diff_contents_matches_git_hunks(self):
+        previous = {'src/module.py': "a = 1\nb = 2\nc = 3\nd = 4\n",
+                    'src/old.py': "x = 1\ny = 2\n"}
+        current = {'src/module.py': "a = 1\nb = 20\nc = 3\nd = 4\ne = 5\n",
+                   'src/new.py': "z = 1\n"}
+        self.assertEqual(diff_contents(previous, current), {
+            'src/module.py': {'status': 'modified',
+                              'hunks': [(2, 1, 2, 1), (4, 0, 5, 1)]},
+            'src/new.py': {'status': 'added', 'hunks': []},
+            'src/old.py': {'status': 'deleted', 'hunks': [(1, 2, 0, 0)]},
+        })
+
+
+class TestImpact(unittest.TestCase):
+
+    def test_changed_lines_select_covering_tests(self):
+        impact = find_impacted_tests(LINE_CONTEXTS,
+                                     {'src/utilities.py': {'status': 'modified',
+                                                           'hunks': HUNKS}})
+        self.assertFalse(impact['full'])
+        self.assertEqual(impact['tests'], ['tests/test_model.py::test_predict',
+                                           'tests/test_utilities.py::test_normalize',
+                                           'tests/test_utilities.py::test_outliers'])
+
+    def test_import_time_change_reruns_every_importer(self):
+        impact = find_impacted_tests(LINE_CONTEXTS,
+                                     {'src/utilities.py': {'status': 'modified',
+                                                           'hunks': [(1, 1, 1, 1)]}})
+        self.assertEqual(impact['tests'], ['tests/test_model.py::test_predict',
+                                           'tests/test_utilities.py::test_normalize',
+                                           'tests/test_utilities.py::test_outliers',
+                                           'tests/test_validations.py::test_validate'])
+        impact = find_impacted_tests({'src/m.py': {1: [],
+                                                   2: ['test_a', 'test_b', 'test_c']}},
+                                     {'src/m.py': {'status': 'modified',
+                                                   'hunks': [(1, 1, 1, 1)]}})
+        self.assertEqual(impact['tests'], ['test_a', 'test_b', 'test_c'])
+
+    def test_changed_test_modules_run_in_full(self):
+        impact = find_impacted_tests(LINE_CONTEXTS, {
+            'tests/test_model.py': {'status': 'modified', 'hunks': [(3, 1, 3, 1)]},
+            'tests/test_old.py': {'status': 'deleted', 'hunks': [(1, 3, 0, 0)]},
+        })
+        self.assertEqual(impact['tests'], [])
+        self.assertEqual(impact['test_files'], ['tests/test_model.py'])
+        self.assertEqual(impact['stale_test_files'],
+                         ['tests/test_model.py', 'tests/test_old.py'])
+
+    def test_shared_test_code_needs_full_evaluation(self):
+        impact = find_impacted_tests(LINE_CONTEXTS,
+                                     {'tests/conftest.py': {'status': 'modified',
+                                                            'hunks': []}})
+        self.assertTrue(impact['full'])
+
+
+class TestMerging(unittest.TestCase):
+
+    def test_merge_test_reports(self):
+        previous = {'created': 1, 'tests': [
+            {'nodeid': 'tests/test_a.py::test_one', 'outcome': 'passed'},
+            {'nodeid': 'tests/test_a.py::test_two', 'outcome': 'passed'},
+            {'nodeid': 'tests/test_b.py::test_three', 'outcome': 'failed'},
+        ]}
+        partial = {'tests': [
+            {'nodeid': 'tests/test_a.py::test_one', 'outcome': 'failed'},
+            {'nodeid': 'tests/test_b.py::test_four', 'outcome': 'passed'},
+        ]}
+        merged = merge_test_reports(previous, partial, ['tests/test_a.py::test_one'],
+                                    ['tests/test_b.py'])
+        self.assertEqual([test['nodeid'] for test in merged['tests']],
+                         ['tests/test_a.py::test_one', 'tests/test_a.py::test_two',
+                          'tests/test_b.py::test_four'])
+        self.assertEqual(merged['summary'],
+                         {'passed': 2, 'failed': 1, 'total': 3, 'collected': 3})
+        self.assertEqual(merged['created'], 1)
+
+    def test_merge_coverage_data(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            module = os.path.join(tmp_dir, 'src', 'module.py')
+            previous = CoverageData(basename=os.path.join(tmp_dir, '.coverage'))
+            previous.set_context('tests/test_a.py::test_kept|run')
+            previous.add_arcs({module: [(-1, 1), (1, 2), (2, 5), (5, -1)]})
+            previous.set_context('tests/test_a.py::test_dropped|run')
+            previous.add_arcs({module: [(-1, 1), (1, 3), (3, -1)]})
+            previous.write()
+            partial = CoverageData(basename=os.path.join(tmp_dir, '.coverage.impacted'))
+            partial.set_context('tests/test_a.py::test_dropped|run')
+            partial.add_arcs({module: [(-1, 1), (1, 4), (4, -1)]})
+            partial.write()
+
+            # Line 2 changed into two lines, so everything below it moved down by one
+            changes = {os.path.join('src', 'module.py'): {'status': 'modified',
+                                                          'hunks': [(2, 1, 2, 2)]}}
+            merge_coverage_data(previous.base_filename(), partial.base_filename(),
+                                previous.base_filename(), changes,
+                                ['tests/test_a.py::test_dropped'], [],
+                                project_dir=tmp_dir)
+
+            merged = CoverageData(basename=os.path.join(tmp_dir, '.coverage'))
+            merged.read()
+            contexts = merged.contexts_by_lineno(module)
+        self.assertEqual(sorted(contexts), [1, 4, 6])
+        self.assertEqual(contexts[4], ['tests/test_a.py::test_dropped|run'])
+        self.assertEqual(contexts[6], ['tests/test_a.py::test_kept|run'])
+
+    def test_carry_over_mutant_results(self):
+        previous_results = [
+            {'id': 'src/utilities.py:5:0', 'filename': 'src/utilities.py',
+             'line_number': 5, 'operator': 'number', 'status': 'killed',
+             'tests': ['tests/test_utilities.py::test_normalize']},
+            {'id': 'src/utilities.py:15:0', 'filename': 'src/utilities.py',
+             'line_number': 15, 'operator': 'operator', 'status': 'survived',
+             'tests': ['tests/test_model.py::test_predict']},
+            {'id': 'src/utilities.py:10:0', 'filename': 'src/utilities.py',
+             'line_number': 10, 'operator': 'operator', 'status': 'survived',
+             'tests': ['tests/test_utilities.py::test_normalize']},
+        ]
+        mutants = [
+            # line 5, unchanged and its test was not re-run
+            Mutant('src/utilities.py', 'x = 1', 0, 4),
+            # old line 15, moved down a line; its test was re-run
+            Mutant('src/utilities.py', 'y = 2', 0, 15),
+            # line 10 changed
+            Mutant('src/utilities.py', 'z = 3', 0, 9),
+        ]
+        line_contexts = {'src/utilities.py': {
+            5: ['tests/test_utilities.py::test_normalize'],
+            16: ['tests/test_model.py::test_predict'],
+        }}
+        rerun_tests = ['tests/test_model.py::test_predict']
+        changes = {'files': {'src/utilities.py': {'status': 'modified',
+                                                  'hunks': HUNKS}},
+                   'tests': rerun_tests, 'stale_test_files': []}
+
+        reused, pending = carry_over_mutant_results(previous_results, mutants,
+                                                    line_contexts, changes, rerun_tests)
+        self.assertEqual([result['id'] for result in reused], ['src/utilities.py:5:0'])
+        self.assertEqual([mutant.id for mutant in pending],
+                         ['src/utilities.py:16:0', 'src/utilities.py:10:0'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+# tests_evaluation/test_clone_detection.py
+
+import ast
+import os
+import tempfile
+import unittest
+from utils.clone_detection import (
+    collect_test_functions,
+    find_clone_clusters,
+    normalize_test_function,
+)
+
+TESTS = '''
+import unittest
+
+
+class TestModel(unittest.TestCase):
+
+    def test_predict(self):
+        """Predicts a value."""
+        model = Model("linear")
+        result = model.predict([1, 2, 3])
+        self.assertEqual(result, 6)
+
+    def test_predict_again(self):
+        estimator = Model("quadratic")
+        output = estimator.predict([4, 5, 6])
+        self.assertEqual(output, 15)
+
+    def test_predict_logged(self):
+        model = Model("linear")
+        result = model.predict([1, 2, 3])
+        self.assertEqual(result, 6)
+        self.assertTrue(model.logged)
+
+    def test_load_failure(self):
+        with self.assertRaises(ModelError):
+            load_model("missing.pkl", strict=True)
+
+
+def test_validate():
+    data = {"a": 1}
+    assert validate(data) is not None
+'''
+
+
+def parse_function(source):
+    return ast.parse(source).body[0]
+
+
+class TestCloneDetection(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        with open(os.path.join(self.tmp_dir.name, 'test_model.py'), 'w') as f:
+            f.write(TESTS)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_normalization_ignores_local_names_and_literal_values(self):
+        first = parse_function("def test_a(x):\n    y = Model(x, 1)\n    assert y.ok")
+        second = parse_function("def test_b(z):\n    w = Model(z, 2)\n    assert w.ok")
+        other_class = parse_function("def test_c(z):\n    w = Other(z, 2)\n"
+                                     "    assert w.ok")
+        self.assertEqual(normalize_test_function(first),
+                         normalize_test_function(second))
+        self.assertNotEqual(normalize_test_function(first),
+                            normalize_test_function(other_class))
+
+    def test_exact_and_near_clones_are_clustered(self):
+        functions = collect_test_functions(self.tmp_dir.name)
+        self.assertEqual(len(functions), 5)
+
+        exact = find_clone_clusters(functions, similarity_threshold=0.8)
+        prefix = os.path.join(self.tmp_dir.name, 'test_model.py')
+        self.assertEqual(exact, [{
+            'tests': [f'{prefix}::TestModel.test_predict',
+                      f'{prefix}::TestModel.test_predict_again'],
+            'exact': True,
+            'similarity': 1.0,
+        }])
+
+        near, = find_clone_clusters(functions, similarity_threshold=0.5)
+        self.assertEqual(len(near['tests']), 3)
+        self.assertFalse(near['exact'])
+        self.assertLess(near['similarity'], 1.0)
+
+    def test_distinct_tests_are_not_clustered(self):
+        functions = [(f'test_{index}',
+                      [f'token{index}-{position}' for position in range(30)])
+                     for index in range(200)]
+        self.assertEqual(find_clone_clusters(functions), [])
+
+    def test_small_tests_are_ignored(self):
+        functions = [('test_a', ['Assert', 'True']), ('test_b', ['Assert', 'True'])]
+        self.assertEqual(find_clone_clusters(functions, min_tokens=10), [])
+        self.assertEqual(len(find_clone_clusters(functions, min_tokens=1)), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
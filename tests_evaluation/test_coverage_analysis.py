@@ -0,0 +1,76 @@
+# tests_evaluation/test_coverage_analysis.py
+
+import importlib.util
+import os
+import tempfile
+import unittest
+import coverage
+from utils.coverage_analysis import load_line_index, save_line_index, summarize_coverage
+
+MODULE = '''
+def classify(value):
+    if value > 0:
+        return 'positive'
+    return 'non-positive'
+
+
+def unused():
+    return None
+'''
+
+
+class TestCoverageAnalysis(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.module_path = os.path.join(self.tmp_dir.name, 'sample.py')
+        with open(self.module_path, 'w') as f:
+            f.write(MODULE)
+        self.coverage_file = os.path.join(self.tmp_dir.name, '.coverage')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def measure(self):
+        cov = coverage.Coverage(data_file=self.coverage_file, branch=True,
+                                include=[self.module_path])
+        cov.start()
+        try:
+            spec = importlib.util.spec_from_file_location('sample', self.module_path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            module.classify(1)
+        finally:
+            cov.stop()
+        cov.save()
+
+    def test_summary_includes_branches_modules_and_functions(self):
+        self.measure()
+        summary = summarize_coverage(self.coverage_file)
+
+        self.assertTrue(summary['branch_coverage'])
+        # 4 of 6 statements and 1 of 2 branches
+        self.assertEqual(summary['totals'],
+                         {'percent_covered': 62.5, 'statements': 6,
+                          'covered_statements': 4,
+                          'branches': 2, 'covered_branches': 1})
+        module, = summary['modules'].values()
+        self.assertEqual(module['missing_lines'], [5, 9])
+        self.assertEqual(module['functions']['classify']['covered_branches'], 1)
+        self.assertEqual(module['functions']['unused']['percent_covered'], 0.0)
+
+    def test_line_index_round_trip(self):
+        line_contexts = {
+            'src/module.py': {3: [],
+                              4: ['tests/test_a.py::test_one',
+                                  'tests/test_b.py::test_two'],
+                              7: ['tests/test_b.py::test_two']},
+            'src/other.py': {1: ['tests/test_a.py::test_one']},
+        }
+        path = os.path.join(self.tmp_dir.name, 'line-index.json')
+        save_line_index(path, line_contexts)
+        self.assertEqual(load_line_index(path), line_contexts)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+# tests_evaluation/test_daemon.py
+
+import os
+import tempfile
+import time
+import unittest
+from utils.daemon import EvaluationDaemon, WarmTestRunner, read_contents, send_request
+
+PASSING_TEST = '''
+def test_passes():
+    assert 1 + 1 == 2
+'''
+
+
+class TestWarmTestRunner(unittest.TestCase):
+
+    def test_exit_codes_come_from_pytest(self):
+        runner = WarmTestRunner(preload=['pytest'])
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            test_file = os.path.join(tmp_dir, 'test_sample.py')
+            with open(test_file, 'w') as f:
+                f.write(PASSING_TEST)
+            self.assertEqual(runner(['-q', '-p', 'no:cacheprovider', test_file]), 0)
+            with open(test_file, 'w') as f:
+                f.write(PASSING_TEST.replace('== 2', '== 3'))
+            # The edited test module is imported anew by the next run
+            self.assertEqual(runner(['-q', '-p', 'no:cacheprovider', test_file]), 1)
+
+
+class TestEvaluationDaemon(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.src_dir = os.path.join(self.tmp_dir.name, 'src')
+        os.makedirs(self.src_dir)
+        self.module = os.path.join(self.src_dir, 'module.py')
+        with open(self.module, 'w') as f:
+            f.write("a = 1\nb = 2\n")
+        self.socket_path = os.path.join(self.tmp_dir.name, 'daemon.sock')
+        self.evaluations = []
+        self.failing = False
+        self.daemon = EvaluationDaemon(self.evaluate, [self.src_dir], self.socket_path,
+                                       poll_interval=0.05, debounce=0.05)
+
+    def tearDown(self):
+        self.daemon.stop()
+        self.tmp_dir.cleanup()
+
+    def evaluate(self, changes):
+        self.evaluations.append(changes)
+        return None if self.failing else {'evaluation': len(self.evaluations)}
+
+    def wait_for_evaluations(self, count, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while len(self.evaluations) < count and time.monotonic() < deadline:
+            time.sleep(0.02)
+        self.assertEqual(len(self.evaluations), count)
+
+    def test_read_contents_lists_python_files(self):
+        with open(os.path.join(self.src_dir, 'notes.txt'), 'w') as f:
+            f.write("ignored")
+        self.assertEqual(read_contents([self.src_dir]),
+                         {os.path.normpath(self.module): "a = 1\nb = 2\n"})
+
+    def test_file_changes_trigger_incremental_evaluation(self):
+        self.daemon.start()
+        self.assertEqual(self.evaluations, [None])
+
+        with open(self.module, 'w') as f:
+            f.write("a = 1\nb = 20\nc = 3\n")
+        self.wait_for_evaluations(2)
+        self.assertEqual(self.evaluations[1], {
+            os.path.normpath(self.module): {'status': 'modified',
+                                            'hunks': [(2, 1, 2, 2)]},
+        })
+
+    def test_failed_evaluation_keeps_its_changes_pending(self):
+        self.daemon.refresh()
+        with open(self.module, 'w') as f:
+            f.write("a = 1\nb = 20\n")
+        self.failing = True
+        self.assertEqual(self.daemon.refresh(), {'evaluation': 1})
+
+        with open(self.module, 'w') as f:
+            f.write("a = 10\nb = 20\n")
+        self.failing = False
+        self.assertEqual(self.daemon.refresh(), {'evaluation': 3})
+        # Evaluated against the last successfully evaluated contents, so the failed
+        # change is included
+        self.assertEqual(self.evaluations[2], {
+            os.path.normpath(self.module): {'status': 'modified',
+                                            'hunks': [(1, 2, 1, 2)]},
+        })
+        self.assertEqual(self.daemon.evaluations, 2)
+
+    def test_socket_commands(self):
+        self.daemon.start()
+        response = send_request(self.socket_path, 'report', timeout=5)
+        self.assertTrue(response['ok'])
+        self.assertEqual(response['report'], {'evaluation': 1})
+
+        # Nothing changed, so the previous report is returned without evaluating again
+        response = send_request(self.socket_path, 'evaluate', timeout=5)
+        self.assertEqual(response['report'], {'evaluation': 1})
+        status = send_request(self.socket_path, 'status', timeout=5)
+        self.assertEqual(status['evaluations'], 1)
+        self.assertFalse(send_request(self.socket_path, 'unknown', timeout=5)['ok'])
+
+        self.assertTrue(send_request(self.socket_path, 'shutdown', timeout=5)['ok'])
+        self.daemon.wait()
+
+    def test_stale_socket_file_is_replaced(self):
+        with open(self.socket_path, 'w') as f:
+            f.write("")
+        self.daemon.start()
+        self.assertTrue(send_request(self.socket_path, 'status', timeout=5)['ok'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+# tests_evaluation/test_embedding_index.py
+
+import functools
+import hashlib
+import json
+import os
+import re
+import tempfile
+import unittest
+import numpy as np
+from tests_evaluation.test_llm_utils import FakeChatClient
+from utils.embedding_index import EmbeddingIndex, extract_test_functions
+from utils.llm_utils import assess_requirements
+
+API_TESTS = '''
+import unittest
+
+
+class TestAPIClient(unittest.TestCase):
+
+    def test_get_resource_http_error(self):
+        client = APIClient()
+        with self.assertRaises(APIClientError):
+            client.get_resource("missing http status")
+'''
+
+UTILITY_TESTS = '''
+def test_normalize_dataframe():
+    normalize_data(dataframe)
+
+
+def helper():
+    pass
+
+
+def test_outliers_dataframe():
+    detect_outliers(dataframe)
+'''
+
+
+class FakeEmbedder:
+    """Deterministic bag-of-words embedding; counts how many texts it embeds."""
+
+    def __init__(self, dimensions=256):
+        self.dimensions = dimensions
+        self.embedded = 0
+
+    def __call__(self, texts):
+        self.embedded += len(texts)
+        vectors = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in re.findall(r'[a-z]+', text.lower()):
+                column = int(hashlib.md5(word.encode()).hexdigest(), 16)
+                vectors[row, column % self.dimensions] += 1
+        return vectors
+
+
+class TestEmbeddingIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.tests_dir = os.path.join(self.tmp_dir.name, 'tests')
+        os.makedirs(self.tests_dir)
+        self.write('test_api.py', API_TESTS)
+        self.write('test_utilities.py', UTILITY_TESTS)
+        self.index_path = os.path.join(self.tmp_dir.name, 'embeddings', 'test_index')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write(self, name, content):
+        with open(os.path.join(self.tests_dir, name), 'w') as f:
+            f.write(content)
+
+    def test_extract_test_functions(self):
+        path = os.path.join(self.tests_dir, 'test_utilities.py')
+        names = [name for name, _ in extract_test_functions(path)]
+        self.assertEqual(names, ['test_normalize_dataframe', 'test_outliers_dataframe'])
+        path = os.path.join(self.tests_dir, 'test_api.py')
+        (name, source), = extract_test_functions(path)
+        self.assertEqual(name, 'TestAPIClient.test_get_resource_http_error')
+        self.assertTrue(source.startswith('def test_get_resource_http_error(self):'))
+
+    def test_retrieve_ranks_relevant_functions_first(self):
+        index = EmbeddingIndex(self.index_path, FakeEmbedder())
+        index.refresh(self.tests_dir)
+        description = 'APIClient should handle unexpected HTTP status codes.'
+        snippet, = index.retrieve([description], top_k=1)[description]
+        self.assertIn('test_get_resource_http_error', snippet)
+
+    def test_refresh_only_embeds_changed_files(self):
+        embedder = FakeEmbedder()
+        index = EmbeddingIndex(self.index_path, embedder)
+        self.assertEqual(index.refresh(self.tests_dir), 3)
+        self.assertEqual(index.refresh(self.tests_dir), 0)
+
+        self.write('test_utilities.py',
+                   UTILITY_TESTS + '\n\ndef test_preprocess_input():\n    pass\n')
+        # The index is persisted, so a fresh instance picks up where the last one left
+        # off
+        reloaded = EmbeddingIndex(self.index_path, embedder)
+        self.assertEqual(reloaded.refresh(self.tests_dir), 3)
+        self.assertEqual(len(reloaded.chunks), 4)
+
+        os.remove(os.path.join(self.tests_dir, 'test_api.py'))
+        self.assertEqual(reloaded.refresh(self.tests_dir), 0)
+        self.assertEqual(len(reloaded.chunks), 3)
+        self.assertEqual(reloaded.vectors.shape[0], 3)
+        self.assertEqual(embedder.embedded, 6)
+
+    def test_index_of_another_model_or_dimension_is_rebuilt(self):
+        EmbeddingIndex(self.index_path, FakeEmbedder(),
+                       model='small').refresh(self.tests_dir)
+        with open(f"{self.index_path}.json") as f:
+            metadata = json.load(f)
+        self.assertEqual((metadata['model'], metadata['dimension']), ('small', 256))
+
+        # Same model and dimension: the persisted vectors are reused
+        embedder = FakeEmbedder()
+        self.assertEqual(EmbeddingIndex(self.index_path, embedder,
+                                        model='small').refresh(self.tests_dir), 0)
+        # Another model: every test function is embedded again
+        large = FakeEmbedder(dimensions=512)
+        index = EmbeddingIndex(self.index_path, large, model='large')
+        self.assertEqual(index.refresh(self.tests_dir), 3)
+        self.assertEqual(index.vectors.shape, (3, 512))
+
+        # The embedder's dimension changed under the same model name, noticed when a
+        # file changes
+        index = EmbeddingIndex(self.index_path, FakeEmbedder(dimensions=128),
+                               model='large')
+        self.write('test_utilities.py',
+                   UTILITY_TESTS + '\n\ndef test_preprocess_input():\n    pass\n')
+        index.refresh(self.tests_dir)
+        self.assertEqual(index.vectors.shape, (4, 128))
+        self.assertIn('test_get_resource_http_error',
+                      index.retrieve(['HTTP error'], top_k=1)['HTTP error'][0])
+
+    def test_prompts_only_carry_retrieved_functions(self):
+        index = EmbeddingIndex(self.index_path, FakeEmbedder())
+        index.refresh(self.tests_dir)
+        client = FakeChatClient()
+        assess_requirements(self.tests_dir, ['APIClient handles HTTP errors.'],
+                            client=client,
+                            retriever=functools.partial(index.retrieve, top_k=1))
+        prompt = client.requests[0]['messages'][-1]['content']
+        self.assertIn('test_get_resource_http_error', prompt)
+        self.assertNotIn('normalize_data', prompt)
+
+
+if __name__ == '__main__':
+    unittest.main()
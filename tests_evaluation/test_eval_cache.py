@@ -0,0 +1,69 @@
+# tests_evaluation/test_eval_cache.py
+
+import os
+import tempfile
+import unittest
+from utils.eval_cache import EvaluationCache
+
+
+class TestEvaluationCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.root = self.tmp_dir.name
+        for directory in ('src', 'tests'):
+            os.makedirs(os.path.join(self.root, directory))
+        self.write('src/module.py', 'x = 1\n')
+        self.write('tests/test_module.py', 'def test_x():\n    pass\n')
+        self.cache_path = os.path.join(self.root, '.ufem-cache.json')
+        self.config = {'tqs': {'max_allowable_issues': 100}, 'weights': {'CCS': 0.35}}
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def path(self, relative):
+        return os.path.join(self.root, relative)
+
+    def write(self, relative, content):
+        with open(self.path(relative), 'w') as f:
+            f.write(content)
+
+    def keys(self, config):
+        cache = EvaluationCache(self.cache_path, config)
+        return {
+            'CCS': cache.key([self.path('src'), self.path('tests')]),
+            'TQS': cache.key([self.path('tests')], ['tqs']),
+        }
+
+    def test_unchanged_inputs_give_same_key(self):
+        self.assertEqual(self.keys(self.config), self.keys(self.config))
+
+    def test_src_change_only_invalidates_dependent_components(self):
+        before = self.keys(self.config)
+        self.write('src/module.py', 'x = 2\n')
+        after = self.keys(self.config)
+        self.assertNotEqual(before['CCS'], after['CCS'])
+        self.assertEqual(before['TQS'], after['TQS'])
+
+    def test_config_section_change(self):
+        before = self.keys(self.config)
+        # Weights are not an input of any component
+        self.assertEqual(before, self.keys(dict(self.config, weights={'CCS': 0.5})))
+        after = self.keys(dict(self.config, tqs={'max_allowable_issues': 10}))
+        self.assertEqual(before['CCS'], after['CCS'])
+        self.assertNotEqual(before['TQS'], after['TQS'])
+
+    def test_entries_persist(self):
+        cache = EvaluationCache(self.cache_path, self.config)
+        key = cache.key([self.path('tests')])
+        cache.put('DRS', key, 95.0, {'clusters': []})
+        cache.save()
+
+        reloaded = EvaluationCache(self.cache_path, self.config)
+        self.assertEqual(reloaded.get('DRS', key)['score'], 95.0)
+        self.assertIsNone(reloaded.get('DRS', 'stale-key'))
+        self.assertIsNone(reloaded.get('TQS', key))
+
+
+if __name__ == '__main__':
+    unittest.main()
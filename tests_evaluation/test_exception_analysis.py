@@ -0,0 +1,100 @@
+# tests_evaluation/test_exception_analysis.py
+
+import os
+import tempfile
+import unittest
+from utils.exception_analysis import (
+    analyze_exception_tests,
+    discover_exception_classes,
+    find_tested_exceptions,
+)
+
+EXCEPTIONS_MODULE = '''
+class BaseProjectError(Exception):
+    pass
+
+class ValidationError(BaseProjectError):
+    pass
+
+class ModelError(Exception):
+    pass
+
+class APIClientError(Exception):
+    pass
+
+class Helper:
+    pass
+'''
+
+TESTS = '''
+import pytest
+from unittest.mock import patch
+from src import exceptions
+
+
+def test_validation():
+    with pytest.raises((ValidationError, TypeError)):
+        validate(None)
+
+
+def test_model():
+    with patch('src.model.load', side_effect=exceptions.ModelError("boom")):
+        with self.assertRaisesRegex(RuntimeError, "boom"):
+            predict()
+'''
+
+
+class TestExceptionAnalysis(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.module = os.path.join(self.tmp_dir.name, 'exceptions.py')
+        with open(self.module, 'w') as f:
+            f.write(EXCEPTIONS_MODULE)
+        self.tests_dir = os.path.join(self.tmp_dir.name, 'tests')
+        os.makedirs(self.tests_dir)
+        with open(os.path.join(self.tests_dir, 'test_sample.py'), 'w') as f:
+            f.write(TESTS)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_discover_exception_classes(self):
+        self.assertEqual(discover_exception_classes(self.module),
+                         ['BaseProjectError', 'ValidationError', 'ModelError',
+                          'APIClientError'])
+
+    def test_find_tested_exceptions(self):
+        tested = find_tested_exceptions(self.tests_dir)
+        path = os.path.join(self.tests_dir, 'test_sample.py')
+        self.assertEqual(tested['ValidationError'], [f'{path}:8'])
+        self.assertEqual(tested['ModelError'], [f'{path}:13'])
+        self.assertIn('RuntimeError', tested)
+
+    def test_only_unresolved_classes_are_left_for_the_llm(self):
+        analysis = analyze_exception_tests(self.module, self.tests_dir)
+        self.assertEqual(analysis['total_exceptions_in_code'], 4)
+        self.assertEqual(sorted(analysis['resolved']),
+                         ['ModelError', 'ValidationError'])
+        self.assertEqual(analysis['unresolved'], ['BaseProjectError', 'APIClientError'])
+
+        explicit = analyze_exception_tests(self.module, self.tests_dir,
+                                           exception_classes=['APIClientError'])
+        self.assertEqual(explicit['classes'], ['APIClientError'])
+        # Only the configured classes count towards EHS
+        self.assertEqual(explicit['total_exceptions_in_code'], 1)
+        listed = analyze_exception_tests('missing.py', self.tests_dir, ['ModelError'])
+        self.assertEqual(listed['resolved'],
+                         {'ModelError': analysis['resolved']['ModelError']})
+
+    def test_project_exceptions_are_all_resolved_statically(self):
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        exceptions_module = os.path.join(project_root, 'src', 'exceptions.py')
+        analysis = analyze_exception_tests(exceptions_module,
+                                           os.path.join(project_root, 'tests'))
+        self.assertEqual(analysis['total_exceptions_in_code'], 6)
+        self.assertEqual(analysis['unresolved'], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
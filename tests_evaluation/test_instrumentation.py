@@ -0,0 +1,86 @@
+# tests_evaluation/test_instrumentation.py
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from utils.instrumentation import (
+    critical_path,
+    measure,
+    run_command,
+    write_chrome_trace,
+)
+from utils.scheduler import MetricTask, run_tasks
+
+# Allocates about 50 MB and spins for a moment
+CHILD = "data = bytearray(50 * 1024 * 1024); sum(range(2000000))"
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def test_child_usage_is_added_to_the_stage(self):
+        measurements = {}
+        with measure('outer', measurements):
+            with measure('test_run', measurements):
+                returncode, usage = run_command([sys.executable, '-c', CHILD])
+            run_command([sys.executable, '-c', 'import sys; sys.exit(3)'])
+
+        self.assertEqual(returncode, 0)
+        self.assertGreater(usage['max_rss_kb'], 50 * 1024)
+        stage = measurements['test_run']
+        self.assertEqual(stage['children']['processes'], 1)
+        self.assertEqual(stage['children']['max_rss_kb'], usage['max_rss_kb'])
+        self.assertGreater(stage['wall_seconds'], 0)
+        # Nested stages roll up into the enclosing one
+        self.assertEqual(measurements['outer']['children']['processes'], 2)
+
+    def test_exit_codes_and_timeouts(self):
+        self.assertEqual(run_command([sys.executable, '-c',
+                                      'import sys; sys.exit(3)'])[0], 3)
+        started = time.perf_counter()
+        with self.assertRaises(subprocess.TimeoutExpired):
+            run_command([sys.executable, '-c', 'import time; time.sleep(30)'],
+                        timeout=0.5)
+        self.assertLess(time.perf_counter() - started, 10)
+
+    def test_scheduler_measurements_and_critical_path(self):
+        tasks = [
+            MetricTask('test_run', lambda: time.sleep(0.1)),
+            MetricTask('coverage_data', lambda test_run: time.sleep(0.05),
+                       needs=['test_run']),
+            MetricTask('CCS', lambda coverage_data: 90.0, needs=['coverage_data']),
+            MetricTask('ESR', lambda test_run: 100.0, needs=['test_run']),
+            MetricTask('DRS', lambda: 95.0),
+        ]
+        measurements = {}
+        results = run_tasks(tasks, max_workers=2, measurements=measurements)
+
+        self.assertEqual(results['CCS'], 90.0)
+        self.assertEqual(sorted(measurements),
+                         ['CCS', 'DRS', 'ESR', 'coverage_data', 'test_run'])
+        self.assertGreaterEqual(measurements['test_run']['wall_seconds'], 0.1)
+        self.assertEqual(critical_path(tasks, measurements),
+                         ['test_run', 'coverage_data', 'CCS'])
+
+    def test_chrome_trace(self):
+        measurements = {}
+        with measure('plan', measurements):
+            pass
+        with measure('report', measurements):
+            pass
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'trace.json')
+            write_chrome_trace(path, measurements)
+            with open(path) as f:
+                trace = json.load(f)
+        stages = [event for event in trace['traceEvents'] if event['ph'] == 'X']
+        self.assertEqual([event['name'] for event in stages], ['plan', 'report'])
+        self.assertEqual(stages[0]['ts'], 0.0)
+        self.assertIn('children_max_rss_kb', stages[0]['args'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+# tests_evaluation/test_lint.py
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from utils import lint
+from utils.lint import count_violations, lint_file, run_lint
+
+CLEAN = "def test_clean():\n    assert True\n"
+# F401 unused import, E302 expected two blank lines, E225 missing whitespace around
+# operator
+UNTIDY = "import os\ndef test_untidy():\n    x=1\n    assert x\n"
+
+
+class TestLint(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.tests_dir = os.path.join(self.tmp_dir.name, 'tests')
+        os.makedirs(self.tests_dir)
+        self.write('test_clean.py', CLEAN)
+        self.write('test_untidy.py', UNTIDY)
+        self.cache_path = os.path.join(self.tmp_dir.name, 'lint-cache.json')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write(self, name, content):
+        with open(os.path.join(self.tests_dir, name), 'w') as f:
+            f.write(content)
+
+    def path(self, name):
+        return os.path.normpath(os.path.join(self.tests_dir, name))
+
+    def test_lint_file_counts_violations_by_code(self):
+        self.assertEqual(lint_file(self.path('test_untidy.py')),
+                         {'E225': 1, 'E302': 1, 'F401': 1})
+        self.assertEqual(lint_file(self.path('test_untidy.py'),
+                                   ignore=['E225', 'E302']), {'F401': 1})
+        self.assertEqual(lint_file(self.path('test_clean.py')), {})
+
+    def test_style_guide_is_built_once_per_process(self):
+        with patch.dict(lint._style_guides, clear=True), \
+                patch.object(lint.flake8_legacy, 'get_style_guide',
+                             wraps=lint.flake8_legacy.get_style_guide) as built:
+            for _ in range(2):
+                self.assertEqual(lint_file(self.path('test_untidy.py')),
+                                 {'E225': 1, 'E302': 1, 'F401': 1})
+                self.assertEqual(lint_file(self.path('test_clean.py')), {})
+            self.assertEqual(built.call_count, 1)
+
+    def test_parallel_run_matches_serial_run(self):
+        serial = run_lint([self.tests_dir], workers=1)
+        parallel = run_lint([self.tests_dir], workers=2)
+        self.assertEqual(serial, parallel)
+        self.assertEqual(count_violations(serial), 3)
+        self.assertEqual(count_violations(serial, 'E'), 2)
+        self.assertEqual(count_violations(serial, 'R'), 0)
+
+    def test_unchanged_files_are_served_from_cache(self):
+        with patch.object(lint, 'lint_file', wraps=lint.lint_file) as linted:
+            first = run_lint([self.tests_dir], workers=1, cache_path=self.cache_path)
+            second = run_lint([self.tests_dir], workers=1, cache_path=self.cache_path)
+            self.assertEqual(first, second)
+            self.assertEqual(linted.call_count, 2)
+
+            self.write('test_clean.py', CLEAN + "\n\ny=2\n")
+            third = run_lint([self.tests_dir], workers=1, cache_path=self.cache_path)
+            self.assertEqual(linted.call_count, 3)
+            self.assertEqual(third[self.path('test_clean.py')], {'E225': 1})
+
+            # Different settings invalidate every cached file
+            run_lint([self.tests_dir], ignore=['E225'], workers=1,
+                     cache_path=self.cache_path)
+            self.assertEqual(linted.call_count, 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,190 @@
+# tests_evaluation/test_llm_async.py
+
+import asyncio
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from utils.llm_async import (
+    TokenBucket,
+    assess_requirements_async,
+    assess_requirements_concurrently,
+    create_async_client,
+)
+from utils.llm_cache import VerdictCache
+from utils.llm_utils import AssessmentError
+
+
+class StubChatHandler(BaseHTTPRequestHandler):
+    """
+    Minimal chat completions endpoint; requirements mentioning 'covered' are covered.
+    """
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        with server.lock:
+            server.requests += 1
+            server.in_flight += 1
+            server.peak_in_flight = max(server.peak_in_flight, server.in_flight)
+            throttle = server.throttle_remaining > 0
+            if throttle:
+                server.throttle_remaining -= 1
+        try:
+            time.sleep(0.05)
+            if throttle:
+                self._respond(429, {'error': {'message': 'Rate limit reached',
+                                              'type': 'rate_limit'}})
+                return
+            prompt = body['messages'][-1]['content']
+            requirements = re.findall(r'^\s*(\d+)\. (.*)$', prompt, re.MULTILINE)
+            verdicts = [
+                {'id': int(number),
+                 'covered': ('not covered' not in text.lower()
+                             and 'covered' in text.lower())}
+                for number, text in requirements
+            ][:server.max_verdicts]
+            self._respond(200, {
+                'id': 'chatcmpl-stub',
+                'object': 'chat.completion',
+                'created': 0,
+                'model': body['model'],
+                'choices': [{
+                    'index': 0,
+                    'finish_reason': 'stop',
+                    'message': {'role': 'assistant',
+                                'content': json.dumps({'verdicts': verdicts})}
+                }],
+                'usage': {'prompt_tokens': 10, 'completion_tokens': 5,
+                          'total_tokens': 15}
+            })
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def _respond(self, status, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestAsyncAssessment(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StubChatHandler)
+        self.server.lock = threading.Lock()
+        self.server.requests = 0
+        self.server.in_flight = 0
+        self.server.peak_in_flight = 0
+        self.server.throttle_remaining = 0
+        self.server.max_verdicts = None
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.base_url = f'http://127.0.0.1:{self.server.server_address[1]}/v1'
+
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        with open(os.path.join(self.tmp_dir.name, 'test_sample.py'), 'w') as f:
+            f.write("def test_sample():\n    assert True\n")
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.tmp_dir.cleanup()
+
+    def assess(self, descriptions, **kwargs):
+        max_concurrency = kwargs.setdefault('max_concurrency', 4)
+        kwargs.setdefault('retry_base_delay', 0.01)
+
+        async def run():
+            client = create_async_client(max_concurrency, api_key='test',
+                                         base_url=self.base_url)
+            try:
+                return await assess_requirements_async(self.tmp_dir.name, descriptions,
+                                                       client=client, **kwargs)
+            finally:
+                await client.close()
+
+        return asyncio.run(run())
+
+    def test_requirements_fan_out_with_bounded_concurrency(self):
+        descriptions = [f'Requirement {index} covered.' for index in range(8)]
+        descriptions.append('Requirement not covered.')
+        verdicts = self.assess(descriptions, max_concurrency=3,
+                               requests_per_second=1000)
+        self.assertEqual(self.server.requests, 9)
+        self.assertLessEqual(self.server.peak_in_flight, 3)
+        self.assertGreater(self.server.peak_in_flight, 1)
+        self.assertFalse(verdicts.pop('Requirement not covered.'))
+        self.assertTrue(all(verdicts.values()))
+
+    def test_rate_limited_requests_are_retried(self):
+        self.server.throttle_remaining = 2
+        verdicts = self.assess(['Requirement covered.'], requests_per_second=1000,
+                               max_retries=3)
+        self.assertEqual(verdicts, {'Requirement covered.': True})
+        self.assertEqual(self.server.requests, 3)
+
+    def test_exhausted_retries_leave_no_verdict(self):
+        self.server.throttle_remaining = 10
+        with self.assertRaises(AssessmentError):
+            self.assess(['Requirement covered.'], requests_per_second=1000,
+                        max_retries=1)
+        self.assertEqual(self.server.requests, 2)
+
+    def test_batches_share_requests(self):
+        descriptions = [f'Requirement {index} covered.' for index in range(6)]
+        verdicts = self.assess(descriptions, batch_size=4, requests_per_second=1000)
+        self.assertEqual(self.server.requests, 2)
+        self.assertTrue(all(verdicts.values()))
+
+    def test_omitted_requirements_are_not_cached(self):
+        cache = VerdictCache(os.path.join(self.tmp_dir.name, 'verdicts.sqlite'))
+        descriptions = ['First covered.', 'Second covered.']
+        self.server.max_verdicts = 1
+        verdicts = self.assess(descriptions, batch_size=2, requests_per_second=1000,
+                               cache=cache)
+        self.assertEqual(verdicts, {'First covered.': True})
+
+        self.server.max_verdicts = None
+        verdicts = self.assess(descriptions, batch_size=2, requests_per_second=1000,
+                               cache=cache)
+        self.assertEqual(verdicts, {'First covered.': True, 'Second covered.': True})
+        self.assertEqual((cache.hits, self.server.requests), (1, 2))
+
+    def test_sync_entry_point_without_api_key_raises(self):
+        previous = os.environ.pop('OPENAI_API_KEY', None)
+        try:
+            with self.assertRaises(ValueError):
+                assess_requirements_concurrently(self.tmp_dir.name,
+                                                 ['Requirement covered.'])
+        finally:
+            if previous is not None:
+                os.environ['OPENAI_API_KEY'] = previous
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_rate_limits_acquisitions(self):
+        async def acquire_all():
+            bucket = TokenBucket(rate=20, capacity=1)
+            start = time.monotonic()
+            for _ in range(5):
+                await bucket.acquire()
+            return time.monotonic() - start
+
+        # The first token is available immediately, the other four take 1/20 s each
+        self.assertGreaterEqual(asyncio.run(acquire_all()), 0.18)
+
+
+if __name__ == '__main__':
+    unittest.main()
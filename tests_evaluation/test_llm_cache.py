@@ -0,0 +1,106 @@
+# tests_evaluation/test_llm_cache.py
+
+import os
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from tests_evaluation.test_llm_utils import FakeChatClient
+from utils.llm_cache import VerdictCache
+from utils.llm_utils import assess_requirements
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def store_verdicts(path, worker):
+    cache = VerdictCache(path)
+    for index in range(20):
+        cache.put('gpt-4o', f'requirement {worker}-{index}', 'hash', index % 2 == 0)
+    return cache.get('gpt-4o', f'requirement {worker}-0', 'hash')
+
+
+class TestVerdictCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'verdicts.sqlite')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_key_includes_model_requirement_and_content(self):
+        cache = VerdictCache(self.path)
+        cache.put('gpt-4o', 'requirement', 'hash-a', True)
+        self.assertTrue(cache.get('gpt-4o', 'requirement', 'hash-a'))
+        self.assertIsNone(cache.get('gpt-4o-mini', 'requirement', 'hash-a'))
+        self.assertIsNone(cache.get('gpt-4o', 'requirement', 'hash-b'))
+        self.assertEqual(cache.stats(), {'hits': 1, 'misses': 2, 'evictions': 0})
+
+    def test_least_recently_used_entries_are_evicted(self):
+        clock = FakeClock()
+        cache = VerdictCache(self.path, max_entries=2, clock=clock)
+        cache.put('m', 'first', 'h', True)
+        clock.now += 1
+        cache.put('m', 'second', 'h', True)
+        clock.now += 1
+        cache.get('m', 'first', 'h')  # first is now more recent than second
+        clock.now += 1
+        cache.put('m', 'third', 'h', False)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get('m', 'second', 'h'))
+        self.assertTrue(cache.get('m', 'first', 'h'))
+        self.assertFalse(cache.get('m', 'third', 'h'))
+        self.assertEqual(cache.evictions, 1)
+
+    def test_entries_expire_after_ttl(self):
+        clock = FakeClock()
+        cache = VerdictCache(self.path, ttl_seconds=60, clock=clock)
+        cache.put('m', 'requirement', 'h', True)
+        clock.now += 30
+        self.assertTrue(cache.get('m', 'requirement', 'h'))
+        clock.now += 31
+        self.assertIsNone(cache.get('m', 'requirement', 'h'))
+
+    def test_concurrent_processes_share_cache(self):
+        VerdictCache(self.path)
+        with ProcessPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(store_verdicts, [self.path] * 4, range(4)))
+        self.assertEqual(results, [True] * 4)
+        self.assertEqual(len(VerdictCache(self.path)), 80)
+
+    def test_assess_requirements_only_sends_misses(self):
+        test_dir = os.path.join(self.tmp_dir.name, 'tests')
+        os.makedirs(test_dir)
+        with open(os.path.join(test_dir, 'test_sample.py'), 'w') as f:
+            f.write("def test_sample():\n    assert True\n")
+        cache = VerdictCache(self.path)
+
+        client = FakeChatClient()
+        first = assess_requirements(test_dir, ['A covered case.', 'Another case.'],
+                                    client=client, cache=cache)
+        second = assess_requirements(test_dir,
+                                     ['A covered case.', 'Another case.',
+                                      'New covered case.'],
+                                     client=client, cache=cache)
+
+        self.assertEqual(first, {'A covered case.': True, 'Another case.': False})
+        self.assertEqual(second['New covered case.'], True)
+        self.assertEqual(len(client.requests), 2)
+        self.assertNotIn('A covered case.',
+                         client.requests[1]['messages'][-1]['content'])
+        self.assertEqual(cache.hits, 2)
+
+        # Changing the tests invalidates the cached verdicts
+        with open(os.path.join(test_dir, 'test_sample.py'), 'a') as f:
+            f.write("\n\ndef test_more():\n    assert True\n")
+        assess_requirements(test_dir, ['A covered case.'], client=client, cache=cache)
+        self.assertEqual(len(client.requests), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+# tests_evaluation/test_llm_utils.py
+
+import json
+import os
+import re
+import tempfile
+import unittest
+from types import SimpleNamespace
+from utils.llm_cache import VerdictCache
+from utils.llm_utils import AssessmentError, LLMUsage, assess_requirements
+
+
+class FakeChatClient:
+    """
+    Answers every batch prompt locally; requirements mentioning 'covered' are covered.
+    """
+
+    def __init__(self, fail=False, omit=()):
+        self.requests = []
+        self.fail = fail
+        # Requirement numbers the answers leave out, like a truncated response
+        self.omit = omit
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, model, messages, **kwargs):
+        self.requests.append({'model': model, 'messages': messages, **kwargs})
+        if self.fail:
+            raise RuntimeError("rate limited")
+        prompt = messages[-1]['content']
+        verdicts = [
+            {'id': int(number),
+             'covered': 'covered' in text.lower() and 'not covered' not in text.lower()}
+            for number, text in re.findall(r'^\s*(\d+)\. (.*)$', prompt, re.MULTILINE)
+            if int(number) not in self.omit
+        ]
+        content = json.dumps({'verdicts': verdicts})
+        message = SimpleNamespace(content=content)
+        usage = SimpleNamespace(prompt_tokens=len(prompt.split()), completion_tokens=10)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=usage)
+
+
+class TestAssessRequirements(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        with open(os.path.join(self.tmp_dir.name, 'test_sample.py'), 'w') as f:
+            f.write("def test_sample():\n    assert True\n")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_single_request_for_all_requirements(self):
+        client = FakeChatClient()
+        descriptions = ['Edge case is covered.', 'Edge case is not covered.',
+                        'Another covered case.']
+        verdicts = assess_requirements(self.tmp_dir.name, descriptions, client=client)
+        self.assertEqual(verdicts, {
+            'Edge case is covered.': True,
+            'Edge case is not covered.': False,
+            'Another covered case.': True,
+        })
+        self.assertEqual(len(client.requests), 1)
+        self.assertIn('def test_sample()',
+                      client.requests[0]['messages'][-1]['content'])
+        self.assertEqual(client.requests[0]['response_format'], {'type': 'json_object'})
+
+    def test_requirements_are_chunked(self):
+        client = FakeChatClient()
+        descriptions = [f'Requirement {index} covered.' for index in range(5)]
+        verdicts = assess_requirements(self.tmp_dir.name, descriptions, client=client,
+                                       batch_size=2)
+        self.assertEqual(len(client.requests), 3)
+        self.assertTrue(all(verdicts.values()))
+
+    def test_duplicate_requirements_are_assessed_once(self):
+        client = FakeChatClient()
+        verdicts = assess_requirements(self.tmp_dir.name, ['Covered.', 'Covered.'],
+                                       client=client)
+        self.assertEqual(verdicts, {'Covered.': True})
+        prompt = client.requests[0]['messages'][-1]['content']
+        self.assertEqual(prompt.count('Covered.'), 1)
+
+    def test_failed_request_leaves_no_verdict(self):
+        with self.assertRaises(AssessmentError):
+            assess_requirements(self.tmp_dir.name, ['Covered.'],
+                                client=FakeChatClient(fail=True))
+
+    def test_failed_batch_is_left_out(self):
+        client = FakeChatClient()
+        answer = client.create
+
+        def fail_after_first_request(model, messages, **kwargs):
+            if client.requests:
+                raise RuntimeError("rate limited")
+            return answer(model, messages, **kwargs)
+
+        client.chat.completions.create = fail_after_first_request
+        descriptions = ['First covered.', 'Second covered.']
+        verdicts = assess_requirements(self.tmp_dir.name, descriptions, client=client,
+                                       batch_size=1)
+        self.assertEqual(verdicts, {'First covered.': True})
+
+    def test_omitted_requirements_are_not_cached(self):
+        cache = VerdictCache(os.path.join(self.tmp_dir.name, 'verdicts.sqlite'))
+        descriptions = ['First covered.', 'Second covered.']
+        verdicts = assess_requirements(self.tmp_dir.name, descriptions,
+                                       client=FakeChatClient(omit=(2,)), cache=cache)
+        self.assertEqual(verdicts, {'First covered.': True})
+
+        client = FakeChatClient()
+        verdicts = assess_requirements(self.tmp_dir.name, descriptions, client=client,
+                                       cache=cache)
+        self.assertEqual(verdicts, {'First covered.': True, 'Second covered.': True})
+        prompt = client.requests[0]['messages'][-1]['content']
+        self.assertNotIn('First covered.', prompt)
+        self.assertIn('Second covered.', prompt)
+
+    def test_usage_counts_requests_and_tokens(self):
+        usage = LLMUsage()
+        descriptions = [f'Requirement {index} covered.' for index in range(3)]
+        assess_requirements(self.tmp_dir.name, descriptions, client=FakeChatClient(),
+                            batch_size=2, usage=usage)
+        with self.assertRaises(AssessmentError):
+            assess_requirements(self.tmp_dir.name, ['Covered.'],
+                                client=FakeChatClient(fail=True), usage=usage)
+        stats = usage.stats()
+        self.assertEqual((stats['requests'], stats['failed_requests']), (3, 1))
+        self.assertEqual(stats['completion_tokens'], 20)
+        self.assertEqual(stats['total_tokens'], stats['prompt_tokens'] + 20)
+        self.assertGreater(stats['prompt_tokens'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+# tests_evaluation/test_logger.py
+
+import logging
+import os
+import tempfile
+import unittest
+from utils import logger as logger_module
+from utils.logger import setup_logger
+
+
+class TestSetupLogger(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.log_file = os.path.join(self.tmp_dir.name, 'app.log')
+
+    def tearDown(self):
+        logger_module.stop_listeners()
+        for name in ('queued', 'direct'):
+            logger = logging.getLogger(name)
+            for handler in list(logger.handlers):
+                logger.removeHandler(handler)
+                handler.close()
+        self.tmp_dir.cleanup()
+
+    def test_queued_records_are_written_by_a_listener(self):
+        logger = setup_logger('queued', self.log_file)
+        logger.propagate = False
+        self.assertEqual([type(handler).__name__ for handler in logger.handlers],
+                         ['QueueHandler'])
+        logger.info("processed %d rows", 3)
+        logger.debug("not emitted")
+        logger_module.stop_listeners()
+        with open(self.log_file) as f:
+            contents = f.read()
+        self.assertIn("INFO queued: processed 3 rows", contents)
+        self.assertNotIn("not emitted", contents)
+
+    def test_direct_handlers(self):
+        logger = setup_logger('direct', self.log_file, queued=False)
+        logger.propagate = False
+        self.assertEqual(sorted(type(handler).__name__ for handler in logger.handlers),
+                         ['FileHandler', 'StreamHandler'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,164 @@
+# tests_evaluation/test_mutation_engine.py
+
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import unittest
+from unittest.mock import patch
+from utils import mutation_engine
+from utils.mutation_engine import (
+    Mutant,
+    filter_covered_mutants,
+    list_mutants,
+    mutant_timeout,
+    read_line_contexts,
+    read_test_durations,
+    run_mutation_tests,
+    select_tests,
+)
+
+CALC_SOURCE = textwrap.dedent('''
+    def add(a, b):
+        return a + b
+
+
+    def is_positive(value):
+        return value > 0
+''')
+
+CALC_TESTS = textwrap.dedent('''
+    from src.calc import add, is_positive
+
+
+    def test_add():
+        assert add(2, 3) == 5
+
+
+    def test_is_positive_runs():
+        is_positive(1)
+''')
+
+
+class TestMutationEngine(unittest.TestCase):
+
+    def test_select_tests_uses_line_contexts(self):
+        line_contexts = {'src/calc.py': {3: ['tests/test_calc.py::test_add'], 1: []}}
+        self.assertEqual(select_tests(Mutant('src/calc.py', '    return a + b', 0, 2),
+                                      line_contexts),
+                         ['tests/test_calc.py::test_add'])
+        # Import-time lines have no test context, so the whole suite is selected
+        self.assertIsNone(select_tests(Mutant('src/calc.py', 'def add(a, b):', 0, 0),
+                                       line_contexts))
+
+    def test_filter_covered_mutants_matches_list_mutants(self):
+        with tempfile.TemporaryDirectory() as project_dir:
+            os.makedirs(os.path.join(project_dir, 'src'))
+            with open(os.path.join(project_dir, 'src', 'calc.py'), 'w') as f:
+                f.write(CALC_SOURCE)
+            cwd = os.getcwd()
+            os.chdir(project_dir)
+            try:
+                covered_lines = {os.path.normpath('src/calc.py'): {3}}
+                mutants = list_mutants('src/', 'tests/')
+                covered = list_mutants('src/', 'tests/', covered_lines=covered_lines)
+                self.assertEqual([mutant.id for mutant in filter_covered_mutants(
+                                     mutants, covered_lines)],
+                                 [mutant.id for mutant in covered])
+                self.assertEqual(filter_covered_mutants(mutants, {}), [])
+            finally:
+                os.chdir(cwd)
+
+    def test_mutant_timeout_uses_baseline_durations(self):
+        durations = {'a': 1.0, 'b': 3.0}
+        self.assertEqual(mutant_timeout(['a'], durations, 2.0, 5.0), 7.0)
+        self.assertEqual(mutant_timeout(None, durations, 2.0, 5.0), 13.0)
+
+    def test_only_failing_tests_kill_mutants(self):
+        with tempfile.TemporaryDirectory() as project_dir:
+            os.makedirs(os.path.join(project_dir, 'src'))
+            path = os.path.join(project_dir, 'src', 'calc.py')
+            with open(path, 'w') as f:
+                f.write(CALC_SOURCE)
+            cwd = os.getcwd()
+            os.chdir(project_dir)
+            try:
+                mutant = list_mutants('src/', 'tests/')[0]
+            finally:
+                os.chdir(cwd)
+
+            # pytest exit codes: 1 tests failed, 2 interrupted (e.g. collection errors),
+            # 5 nothing collected
+            expected = {0: 'survived', 1: 'killed', 2: 'error', 3: 'error',
+                        5: 'error', -11: 'error'}
+            with patch.dict(mutation_engine._worker_state, {'root': project_dir}):
+                for returncode, status in expected.items():
+                    with patch('utils.mutation_engine.run_command',
+                               return_value=(returncode, None)):
+                        run_status, _ = mutation_engine._run_mutant(
+                            mutant, None, 'tests/', 10.0)
+                        self.assertEqual(run_status, status)
+                with patch('utils.mutation_engine.run_command',
+                           side_effect=subprocess.TimeoutExpired('pytest', 10.0)):
+                    run_status, _ = mutation_engine._run_mutant(mutant, None, 'tests/',
+                                                                10.0)
+                    self.assertEqual(run_status, 'timeout')
+            with open(path) as f:
+                self.assertEqual(f.read(), CALC_SOURCE)
+
+    def test_sandboxes_leave_out_evaluator_state(self):
+        with tempfile.TemporaryDirectory() as project_dir, \
+                tempfile.TemporaryDirectory() as sandbox_root:
+            for path in ('src/calc.py', '.ufem-batch/full/src/calc.py',
+                         '.ufem-cache.json', '.ufem-mutants.json',
+                         'embeddings/test_index.npy', 'batch_report.json',
+                         '.report.json.shard-0'):
+                path = os.path.join(project_dir, path)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                open(path, 'w').close()
+            with patch.dict(mutation_engine._worker_state):
+                mutation_engine._init_worker(project_dir, sandbox_root)
+                sandbox = mutation_engine._worker_state['root']
+                self.assertEqual(sorted(os.listdir(sandbox)), ['src'])
+
+    def test_run_mutation_tests_end_to_end(self):
+        with tempfile.TemporaryDirectory() as project_dir:
+            for directory in ('src', 'tests'):
+                os.makedirs(os.path.join(project_dir, directory))
+                open(os.path.join(project_dir, directory, '__init__.py'), 'w').close()
+            with open(os.path.join(project_dir, 'src', 'calc.py'), 'w') as f:
+                f.write(CALC_SOURCE)
+            with open(os.path.join(project_dir, 'tests', 'test_calc.py'), 'w') as f:
+                f.write(CALC_TESTS)
+
+            subprocess.run(
+                [sys.executable, '-m', 'pytest', 'tests/', '-q',
+                 '-p', 'no:cacheprovider',
+                 '--cov=src', '--cov-context=test', '--cov-report=',
+                 '--json-report', '--json-report-file=.report.json'],
+                cwd=project_dir, check=True, stdout=subprocess.DEVNULL
+            )
+
+            cwd = os.getcwd()
+            os.chdir(project_dir)
+            try:
+                line_contexts = read_line_contexts('.coverage')
+                durations = read_test_durations('.report.json')
+                covered_lines = {filename: set(lines)
+                                 for filename, lines in line_contexts.items()}
+                mutants = list_mutants('src/', 'tests/', covered_lines=covered_lines)
+                results = run_mutation_tests(mutants, line_contexts, durations,
+                                             workers=2)
+            finally:
+                os.chdir(cwd)
+
+        statuses = {result['line_number']: result['status'] for result in results}
+        # `a + b` is asserted on; `value > 0` is executed but never checked
+        self.assertEqual(statuses[3], 'killed')
+        self.assertEqual(statuses[7], 'survived')
+        self.assertEqual(len(results), len(mutants))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+# tests_evaluation/test_mutation_sampling.py
+
+import unittest
+from collections import Counter
+from utils.mutation_engine import Mutant
+from utils.mutation_sampling import (
+    estimate_kill_rate,
+    required_sample_size,
+    stratified_sample,
+)
+
+
+def make_mutants():
+    mutants = []
+    for filename, operator, count in [('src/a.py', 'operator', 60),
+                                      ('src/a.py', 'string', 30),
+                                      ('src/b.py', 'number', 10)]:
+        mutants.extend(Mutant(filename, 'line', index, index, operator=operator)
+                       for index in range(count))
+    return mutants
+
+
+class TestMutationSampling(unittest.TestCase):
+
+    def test_required_sample_size(self):
+        # Classic worst-case sample size for +/-5% at 95% confidence is 385
+        self.assertEqual(required_sample_size(10 ** 9, 0.05, 0.95), 385)
+        # The finite population correction shrinks it for small populations
+        self.assertEqual(required_sample_size(100, 0.05, 0.95), 80)
+        self.assertEqual(required_sample_size(0, 0.05), 0)
+
+    def test_stratified_sample_is_proportional_and_reproducible(self):
+        mutants = make_mutants()
+        sample, populations = stratified_sample(mutants, 20, seed=1)
+        counts = Counter((mutant.filename, mutant.operator) for mutant in sample)
+        self.assertEqual(len(sample), 20)
+        self.assertEqual(counts[('src/a.py', 'operator')], 12)
+        self.assertEqual(counts[('src/b.py', 'number')], 2)
+        self.assertEqual(populations[('src/a.py', 'string')], 30)
+        again, _ = stratified_sample(mutants, 20, seed=1)
+        self.assertEqual([mutant.id for mutant in sample],
+                         [mutant.id for mutant in again])
+
+    def test_estimate_kill_rate(self):
+        populations = {('src/a.py', 'operator'): 10, ('src/b.py', 'number'): 10}
+        results = [{'filename': 'src/a.py', 'operator': 'operator',
+                    'status': 'killed'}] * 4
+        results += [{'filename': 'src/b.py', 'operator': 'number',
+                     'status': 'survived'}] * 2
+        results += [{'filename': 'src/b.py', 'operator': 'number',
+                     'status': 'killed'}] * 2
+        # Timeouts and errors are not rated
+        results += [{'filename': 'src/b.py', 'operator': 'number', 'status': 'timeout'}]
+        results += [{'filename': 'src/a.py', 'operator': 'operator', 'status': 'error'}]
+        estimate = estimate_kill_rate(results, populations)
+        self.assertAlmostEqual(estimate['estimate'], 75.0)
+        low, high = estimate['interval']
+        self.assertLess(low, 75.0)
+        self.assertGreater(high, 75.0)
+        self.assertEqual(estimate['sample_size'], 10)
+
+    def test_strata_without_rated_mutants_are_left_out(self):
+        populations = {('src/a.py', 'operator'): 10, ('src/b.py', 'number'): 10}
+        results = [{'filename': 'src/a.py', 'operator': 'operator',
+                    'status': 'killed'}] * 2
+        results += [{'filename': 'src/b.py', 'operator': 'number',
+                     'status': 'error'}] * 2
+        self.assertAlmostEqual(estimate_kill_rate(results, populations)['estimate'],
+                               100.0)
+
+    def test_single_mutant_strata_keep_uncertainty(self):
+        populations = {('src/a.py', str(index)): 4 for index in range(30)}
+        results = [{'filename': 'src/a.py', 'operator': str(index), 'status': 'killed'}
+                   for index in range(30)]
+        low, high = estimate_kill_rate(results, populations)['interval']
+        self.assertLess(low, 100.0)
+        self.assertEqual(high, 100.0)
+
+    def test_full_sample_has_no_uncertainty(self):
+        mutants = make_mutants()[:10]
+        sample, populations = stratified_sample(mutants, 10, seed=0)
+        results = [{'filename': m.filename, 'operator': m.operator, 'status': 'killed'}
+                   for m in sample]
+        estimate = estimate_kill_rate(results, populations)
+        self.assertEqual(estimate['interval'], [100.0, 100.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
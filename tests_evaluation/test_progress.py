@@ -0,0 +1,81 @@
+# tests_evaluation/test_progress.py
+
+import json
+import os
+import tempfile
+import unittest
+from utils.progress import (
+    PROGRESS,
+    RESULT,
+    RUN_END,
+    RUN_START,
+    START,
+    ProgressStream,
+    assemble_report,
+    completed_stages,
+    read_events,
+)
+
+COMPONENTS = ['CCS', 'TQS']
+
+
+class TestProgressStream(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'progress.ndjson')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_events_are_written_as_they_happen(self):
+        stream = ProgressStream(self.path)
+        stream.emit(RUN_START, inputs={'key': 'abc'})
+        stream.emit(START, stage='TQS')
+        # Readable before the stream is closed
+        with open(self.path) as f:
+            self.assertEqual([json.loads(line)['event'] for line in f],
+                             [RUN_START, START])
+        stream.emit(RESULT, stage='TQS', value=90.0, details={'files': {'a', 'b'}})
+        stream.close()
+
+        events = read_events(self.path)
+        self.assertEqual(events, stream.events)
+        self.assertEqual(events[-1]['details'], {'files': ['a', 'b']})
+
+    def test_only_the_last_run_is_read_and_torn_lines_are_skipped(self):
+        with open(self.path, 'w') as f:
+            f.write(json.dumps({'event': RUN_START, 'time': 1}) + '\n')
+            f.write(json.dumps({'event': RESULT, 'time': 2, 'stage': 'CCS',
+                                'value': 50.0}) + '\n')
+            f.write(json.dumps({'event': RUN_START, 'time': 3}) + '\n')
+            f.write(json.dumps({'event': RESULT, 'time': 4, 'stage': 'TQS',
+                                'value': 80.0}) + '\n')
+            f.write('{"event": "progress", "sta')
+        events = read_events(self.path)
+        self.assertEqual(list(completed_stages(events)), ['TQS'])
+
+    def test_report_is_assembled_from_results(self):
+        stream = ProgressStream(None)
+        stream.emit(RUN_START)
+        stream.emit(RESULT, stage='test_run', value={'succeeded': True})
+        stream.emit(RESULT, stage='TQS', value=80.0, details=None)
+        stream.emit(PROGRESS, stage='CCS', done=1, total=2)
+        stream.emit(RESULT, stage='CCS', value=90.0, details={'branch_coverage': True})
+
+        partial = assemble_report(stream.events, COMPONENTS)
+        self.assertEqual(partial,
+                         {'Status': 'incomplete',
+                          'Component Scores': {'CCS': 90.0, 'TQS': 80.0},
+                          'Component Details': {'CCS': {'branch_coverage': True}}})
+
+        stream.emit(RUN_END, ufem=0.87, statistics={'stages': {}})
+        report = assemble_report(stream.events, COMPONENTS)
+        self.assertEqual(list(report),
+                         ['UFEM Score', 'Component Scores', 'Component Details',
+                          'Run Statistics'])
+        self.assertEqual(report['UFEM Score'], 0.87)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+# tests_evaluation/test_scheduler.py
+
+import os
+import threading
+import time
+import unittest
+from utils.scheduler import MetricTask, SchedulerError, run_tasks, select_tasks
+
+
+class TestScheduler(unittest.TestCase):
+
+    def test_dependencies_are_passed_as_keyword_arguments(self):
+        tasks = [
+            MetricTask('test_run', lambda: {'succeeded': True}),
+            MetricTask('CCS', lambda test_run: 90.0 if test_run['succeeded'] else 0.0,
+                       needs=['test_run']),
+        ]
+        results = run_tasks(tasks)
+        self.assertEqual(results['CCS'], 90.0)
+        self.assertEqual(results['test_run'], {'succeeded': True})
+
+    def test_independent_tasks_run_concurrently(self):
+        barrier = threading.Barrier(2, timeout=5)
+        tasks = [
+            MetricTask('ECHS', lambda: barrier.wait() is not None),
+            MetricTask('EHS', lambda: barrier.wait() is not None),
+        ]
+        results = run_tasks(tasks, max_workers=2)
+        self.assertEqual(results, {'ECHS': True, 'EHS': True})
+
+    def test_concurrency_cap(self):
+        lock = threading.Lock()
+        state = {'running': 0, 'peak': 0}
+
+        def work():
+            with lock:
+                state['running'] += 1
+                state['peak'] = max(state['peak'], state['running'])
+            time.sleep(0.05)
+            with lock:
+                state['running'] -= 1
+
+        run_tasks([MetricTask(f'task_{i}', work) for i in range(6)], max_workers=2)
+        self.assertEqual(state['peak'], 2)
+
+    def test_process_executor(self):
+        results = run_tasks([MetricTask('pid', os.getpid, executor='process')])
+        self.assertNotEqual(results['pid'], os.getpid())
+
+    def test_select_tasks_includes_dependencies(self):
+        tasks = [
+            MetricTask('test_run', dict),
+            MetricTask('CCS', lambda test_run: 0.0, needs=['test_run']),
+            MetricTask('TQS', lambda: 0.0),
+        ]
+        self.assertEqual([task.name for task in select_tasks(tasks, ['CCS'])],
+                         ['test_run', 'CCS'])
+        self.assertEqual([task.name for task in select_tasks(tasks, ['TQS'])], ['TQS'])
+
+    def test_missing_dependency(self):
+        with self.assertRaises(SchedulerError):
+            run_tasks([MetricTask('CCS', lambda test_run: 0.0, needs=['test_run'])])
+
+    def test_dependency_cycle(self):
+        tasks = [
+            MetricTask('a', lambda b: b, needs=['b']),
+            MetricTask('b', lambda a: a, needs=['a']),
+        ]
+        with self.assertRaises(SchedulerError):
+            run_tasks(tasks)
+
+    def test_task_failure(self):
+        def fail():
+            raise RuntimeError("boom")
+
+        with self.assertRaises(SchedulerError):
+            run_tasks([MetricTask('TQS', fail)])
+
+    def test_available_resources_are_not_produced_again(self):
+        def run_suite():
+            raise AssertionError("test_run was already available")
+
+        started, finished = [], []
+
+        def on_finish(task, result):
+            finished.append((task.name, result))
+
+        tasks = [
+            MetricTask('test_run', run_suite),
+            MetricTask('ESR', lambda test_run: test_run['passed'] * 100.0,
+                       needs=['test_run']),
+        ]
+        results = run_tasks(tasks, resources={'test_run': {'passed': 1}},
+                            on_start=lambda task: started.append(task.name),
+                            on_finish=on_finish)
+        self.assertEqual(results['ESR'], 100.0)
+        self.assertEqual(started, ['ESR'])
+        self.assertEqual(finished, [('ESR', 100.0)])
+
+
+if __name__ == '__main__':
+    unittest.main()
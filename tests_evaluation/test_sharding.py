@@ -0,0 +1,123 @@
+# tests_evaluation/test_sharding.py
+
+import os
+import tempfile
+import unittest
+from coverage import CoverageData
+from utils.sharding import (
+    combine_coverage,
+    combine_exit_codes,
+    list_test_files,
+    merge_shard_reports,
+    plan_shards,
+)
+
+
+class TestPlanShards(unittest.TestCase):
+
+    def test_balances_by_duration(self):
+        durations = {
+            'tests/test_slow.py::test_a': 6.0,
+            'tests/test_slow.py::test_b': 4.0,
+            'tests/test_medium.py::test_a': 5.0,
+            'tests/test_fast.py::test_a': 3.0,
+            'tests/test_tiny.py::test_a': 2.0,
+        }
+        targets = ['tests/test_fast.py', 'tests/test_medium.py', 'tests/test_slow.py',
+                   'tests/test_tiny.py']
+        shards = plan_shards(targets, durations, 2)
+        self.assertEqual(shards, [['tests/test_slow.py'],
+                                  ['tests/test_fast.py', 'tests/test_medium.py',
+                                   'tests/test_tiny.py']])
+
+    def test_node_ids_and_unknown_targets(self):
+        durations = {'tests/test_a.py::TestA::test_one': 8.0,
+                     'tests/test_a.py::TestA::test_two': 1.0,
+                     'tests/test_b.py::test_one': 1.0}
+        # test_new.py has no history, so it is expected to take the median
+        shards = plan_shards(['tests/test_a.py::TestA::test_one',
+                              'tests/test_a.py::TestA::test_two',
+                              'tests/test_b.py', 'tests/test_new.py'], durations, 2)
+        self.assertEqual(shards, [['tests/test_a.py::TestA::test_one'],
+                                  ['tests/test_a.py::TestA::test_two',
+                                   'tests/test_b.py', 'tests/test_new.py']])
+
+    def test_never_more_shards_than_targets(self):
+        self.assertEqual(plan_shards(['tests/test_a.py'], {}, 8), [['tests/test_a.py']])
+        self.assertEqual(plan_shards([], {}, 8), [])
+
+
+class TestMergeShardResults(unittest.TestCase):
+
+    def test_exit_codes(self):
+        self.assertEqual(combine_exit_codes([0, 0]), 0)
+        self.assertEqual(combine_exit_codes([0, 1, 5]), 1)
+        self.assertEqual(combine_exit_codes([5, 5]), 5)
+        self.assertEqual(combine_exit_codes([0, 5]), 0)
+        self.assertEqual(combine_exit_codes([1, 2]), 2)
+
+    def test_reports_are_combined(self):
+        reports = [
+            {'created': 20.0, 'duration': 3.0, 'root': '/project',
+             'summary': {'passed': 2, 'total': 2, 'collected': 2},
+             'tests': [{'nodeid': 'tests/test_b.py::test_one', 'outcome': 'passed'},
+                       {'nodeid': 'tests/test_b.py::test_two', 'outcome': 'passed'}],
+             'collectors': []},
+            {'created': 10.0, 'duration': 5.0, 'root': '/project',
+             'summary': {'passed': 1, 'failed': 1, 'total': 2, 'collected': 2},
+             'tests': [{'nodeid': 'tests/test_a.py::test_one', 'outcome': 'passed'},
+                       {'nodeid': 'tests/test_a.py::test_two', 'outcome': 'failed'}],
+             'collectors': []},
+        ]
+        merged = merge_shard_reports(reports, 1)
+        self.assertEqual(merged['summary'],
+                         {'passed': 3, 'failed': 1, 'total': 4, 'collected': 4})
+        self.assertEqual(len(merged['tests']), 4)
+        self.assertEqual((merged['created'], merged['duration'], merged['exitcode']),
+                         (10.0, 5.0, 1))
+        self.assertEqual(merged['root'], '/project')
+
+    def test_coverage_keeps_lines_and_contexts(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            source = os.path.join(tmp_dir, 'module.py')
+            shard_files = []
+            shards = [('test_a', [1, 2]), ('test_b', [2, 3])]
+            for index, (context, lines) in enumerate(shards):
+                basename = os.path.join(tmp_dir, f'.coverage.shard-{index}')
+                data = CoverageData(basename=basename)
+                data.set_context(context)
+                data.add_lines({source: lines})
+                data.write()
+                shard_files.append(data.data_filename())
+
+            combined_file = os.path.join(tmp_dir, '.coverage')
+            combine_coverage(combined_file, shard_files)
+            combined = CoverageData(basename=combined_file)
+            combined.read()
+            self.assertEqual(sorted(combined.lines(source)), [1, 2, 3])
+            contexts_by_lineno = combined.contexts_by_lineno(source)
+            self.assertEqual({line: sorted(contexts)
+                              for line, contexts in contexts_by_lineno.items()},
+                             {1: ['test_a'], 2: ['test_a', 'test_b'], 3: ['test_b']})
+            self.assertFalse(any(os.path.exists(path) for path in shard_files))
+
+
+class TestListTestFiles(unittest.TestCase):
+
+    def test_lists_pytest_modules(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for name in ('test_a.py', 'b_test.py', 'helpers.py', 'conftest.py',
+                         os.path.join('sub', 'test_c.py')):
+                path = os.path.join(tmp_dir, name)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                open(path, 'w').close()
+            self.assertEqual([os.path.relpath(path, tmp_dir)
+                              for path in list_test_files(tmp_dir)],
+                             ['b_test.py', 'test_a.py',
+                              os.path.join('sub', 'test_c.py')])
+        self.assertEqual(list_test_files('tests/test_a.py::test_one'),
+                         ['tests/test_a.py::test_one'])
+
+
+if __name__ == '__main__':
+    unittest.main()
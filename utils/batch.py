@@ -0,0 +1,106 @@
+# utils/batch.py
+import logging
+import os
+import shutil
+
+logger = logging.getLogger(__name__)
+
+# Project files not copied into a suite's working directory: the test suite is replaced,
+# and each working directory keeps its own evaluation artifacts between batch runs
+WORKDIR_IGNORE = shutil.ignore_patterns(
+    '.git', '__pycache__', '*.pyc', '.pytest_cache', '.mutmut-cache', 'venv', '.venv',
+    '.coverage', '.coverage.*', '.report.json', '.report.json.*', '.ufem-*',
+    'evaluation_report.json',
+    'evaluation_trace.json', 'batch_report.json'
+)
+
+
+def suite_names(suite_dirs):
+    """
+    Returns:
+        - A unique, filesystem-safe name for each test suite directory, in order: its
+          basename, suffixed with a counter when several suites share one.
+    """
+    names = []
+    seen = {}
+    for suite_dir in suite_dirs:
+        base = os.path.basename(os.path.normpath(suite_dir)) or 'suite'
+        seen[base] = seen.get(base, 0) + 1
+        names.append(base if seen[base] == 1 else f"{base}-{seen[base]}")
+    # A later basename can collide with an earlier suffixed one
+    if len(set(names)) != len(names):
+        names = [f"{index}-{name}" for index, name in enumerate(names, 1)]
+    return names
+
+
+def prepare_workdir(project_dir, suite_dir, workdir, tests_dir='tests', exclude=()):
+    """
+    Makes workdir a copy of the project with suite_dir as its test suite. Evaluation
+    artifacts already in workdir (caches, coverage data, reports) are kept, so
+    re-evaluating an unchanged suite can reuse them.
+    Parameters:
+        - project_dir: Project to copy; its own test directory is not copied.
+        - suite_dir: Test suite to evaluate, copied to tests_dir.
+        - workdir: Working directory of the suite, created if missing.
+        - exclude: Further top-level entries of project_dir not to copy, e.g. the batch
+          root.
+    """
+    os.makedirs(workdir, exist_ok=True)
+    skipped = {os.path.normpath(entry) for entry in (tests_dir, *exclude)}
+    ignored = WORKDIR_IGNORE(project_dir, os.listdir(project_dir))
+    for entry in sorted(os.listdir(project_dir)):
+        if entry in skipped or entry in ignored:
+            continue
+        _replace(os.path.join(project_dir, entry), os.path.join(workdir, entry))
+    _replace(suite_dir, os.path.join(workdir, tests_dir))
+
+
+def _replace(source, destination):
+    if os.path.isdir(destination) and not os.path.islink(destination):
+        shutil.rmtree(destination)
+    elif os.path.lexists(destination):
+        os.remove(destination)
+    if os.path.isdir(source):
+        shutil.copytree(source, destination, ignore=WORKDIR_IGNORE)
+    else:
+        shutil.copy2(source, destination)
+
+
+def compare_reports(suites, components):
+    """
+    Builds the comparative report of a batch evaluation.
+    Parameters:
+        - suites: List of {'name', 'path', 'report'} or {'name', 'path', 'error'}
+          dictionaries.
+        - components: Component names, in report order.
+    Returns:
+        - Dictionary with each suite's UFEM and component scores, the suites ranked by
+          UFEM score and, per component, the best-scoring suite.
+    """
+    evaluated = [suite for suite in suites if suite.get('report') is not None]
+    comparison = {
+        'Suites': {},
+        'Ranking': [suite['name'] for suite in sorted(
+            evaluated, key=lambda suite: -suite['report']['UFEM Score'])],
+        'Best per Component': {},
+    }
+    for suite in suites:
+        if suite.get('report') is None:
+            comparison['Suites'][suite['name']] = {'path': suite['path'],
+                                                   'error': suite.get('error')}
+            continue
+        comparison['Suites'][suite['name']] = {
+            'path': suite['path'],
+            'UFEM Score': suite['report']['UFEM Score'],
+            'Component Scores': suite['report']['Component Scores'],
+        }
+    for component in components:
+        scored = [suite for suite in evaluated
+                  if component in suite['report']['Component Scores']]
+        if scored:
+            best = max(scored,
+                       key=lambda suite: suite['report']['Component Scores'][component])
+            comparison['Best per Component'][component] = {
+                'suite': best['name'],
+                'score': best['report']['Component Scores'][component]}
+    return comparison
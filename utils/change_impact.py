@@ -0,0 +1,380 @@
+# utils/change_impact.py
+import difflib
+import logging
+import os
+import re
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+HUNK_HEADER = re.compile(r'^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@')
+
+
+def _strip_prefix(path):
+    if path == '/dev/null':
+        return None
+    return path[2:] if path[:2] in ('a/', 'b/') else path
+
+
+def parse_unified_diff(diff_text):
+    """
+    Parses `git diff --unified=0` output.
+    Returns:
+        - Dictionary mapping each changed path to
+          {'status': 'added'|'deleted'|'modified',
+           'hunks': [(old_start, old_count, new_start, new_count), ...]}.
+    """
+    changes = {}
+    current = None
+    in_header = False
+    old_path = None
+    for line in diff_text.splitlines():
+        if line.startswith('diff --git '):
+            current, in_header, old_path = None, True, None
+        elif in_header and line.startswith('--- '):
+            old_path = _strip_prefix(line[4:])
+        elif in_header and line.startswith('+++ '):
+            new_path = _strip_prefix(line[4:])
+            status = 'modified'
+            if old_path is None:
+                status = 'added'
+            elif new_path is None:
+                status = 'deleted'
+            current = {'status': status, 'hunks': []}
+            changes[new_path or old_path] = current
+            in_header = False
+        elif current is not None and line.startswith('@@'):
+            match = HUNK_HEADER.match(line)
+            if match:
+                old_start, old_count, new_start, new_count = match.groups()
+                old_count = 1 if old_count is None else int(old_count)
+                new_count = 1 if new_count is None else int(new_count)
+                current['hunks'].append((int(old_start), old_count,
+                                         int(new_start), new_count))
+    return changes
+
+
+def diff_against(ref, paths, project_dir='.'):
+    """
+    Lists the changes to the given paths between a git ref and the working tree,
+    untracked files included.
+    Returns:
+        - The parse_unified_diff mapping, with paths relative to project_dir.
+    """
+    import git
+
+    repo = git.Repo(project_dir, search_parent_directories=True)
+    root = repo.working_tree_dir
+    project_dir = os.path.abspath(project_dir)
+    pathspecs = [os.path.relpath(os.path.join(project_dir, path), root)
+                 for path in paths]
+    diff_text = repo.git.diff(ref, '--unified=0', '--no-color', '--no-ext-diff',
+                              '--no-renames', '--', *pathspecs)
+
+    changes = {}
+    for path, change in parse_unified_diff(diff_text).items():
+        changes[os.path.relpath(os.path.join(root, path), project_dir)] = change
+    for path in repo.untracked_files:
+        if any(path == pathspec or path.startswith(pathspec.rstrip('/') + '/')
+               for pathspec in pathspecs):
+            path = os.path.relpath(os.path.join(root, path), project_dir)
+            changes[path] = {'status': 'added', 'hunks': []}
+    return changes
+
+
+def diff_contents(previous, current):
+    """
+    Compares two snapshots of file contents ({path: text}) without git.
+    Returns:
+        - The same mapping as diff_against, with hunks numbered like
+          `git diff --unified=0`.
+    """
+    changes = {}
+    for path in sorted(set(previous) | set(current)):
+        if path not in current:
+            changes[path] = {'status': 'deleted',
+                             'hunks': [(1, len(previous[path].splitlines()), 0, 0)]}
+        elif path not in previous:
+            changes[path] = {'status': 'added', 'hunks': []}
+        elif previous[path] != current[path]:
+            matcher = difflib.SequenceMatcher(None, previous[path].splitlines(),
+                                              current[path].splitlines(),
+                                              autojunk=False)
+            hunks = []
+            for tag, old_first, old_end, new_first, new_end in matcher.get_opcodes():
+                if tag == 'equal':
+                    continue
+                old_count, new_count = old_end - old_first, new_end - new_first
+                # An empty side is numbered by the line before it, as in unified diffs
+                hunks.append((old_first + 1 if old_count else old_first, old_count,
+                              new_first + 1 if new_count else new_first, new_count))
+            changes[path] = {'status': 'modified', 'hunks': hunks}
+    return changes
+
+
+def changed_old_lines(hunks):
+    """
+    Returns:
+        - Line numbers in the old version of a file that a change touches; a pure
+          insertion touches the lines on either side of it.
+    """
+    lines = set()
+    for old_start, old_count, _, _ in hunks:
+        if old_count:
+            lines.update(range(old_start, old_start + old_count))
+        else:
+            lines.update((old_start, old_start + 1))
+    return lines
+
+
+def map_line(hunks, line):
+    """
+    Returns:
+        - Where an old line number moved to in the new version of the file, or None if
+          the line changed.
+    """
+    offset = 0
+    for old_start, old_count, new_start, new_count in hunks:
+        if old_count and old_start <= line < old_start + old_count:
+            return None
+        last_old_line = old_start + old_count - 1 if old_count else old_start
+        if line > last_old_line:
+            offset += new_count - old_count
+    return line + offset
+
+
+def is_test_module(path):
+    filename = os.path.basename(path)
+    return filename.endswith('.py') and (filename.startswith('test_')
+                                         or filename.endswith('_test.py'))
+
+
+def _in_directory(path, directory):
+    directory = os.path.normpath(directory)
+    return os.path.normpath(path).startswith(directory + os.sep)
+
+
+def find_impacted_tests(line_contexts, changes, tests_dir='tests/'):
+    """
+    Uses a line-to-tests index (see coverage_analysis.load_line_index) to find the tests
+    a change can affect.
+    Returns:
+        - Dictionary with the impacted test node ids ('tests'), the changed test modules
+          to re-run in full ('test_files'), the changed or deleted test modules whose
+          previous results are void ('stale_test_files') and whether the change needs a
+          full evaluation ('full') with its 'reason'.
+    """
+    impact = {'tests': set(), 'test_files': [], 'stale_test_files': [], 'full': False,
+              'reason': None}
+
+    def full(reason):
+        impact.update(full=True, reason=reason)
+        return impact
+
+    for path, change in sorted(changes.items()):
+        if _in_directory(path, tests_dir):
+            if path.endswith('.py') and not is_test_module(path):
+                # conftest.py and helpers can affect every test
+                return full(f"{path} is shared by the test suite")
+            if is_test_module(path):
+                impact['stale_test_files'].append(path)
+                if change['status'] != 'deleted':
+                    impact['test_files'].append(path)
+            continue
+        if not path.endswith('.py'):
+            return full(f"{path} is not a Python module")
+
+        lines = line_contexts.get(path)
+        if lines is None:
+            # Never executed before, so no previous test result depends on it
+            continue
+        if change['status'] == 'deleted':
+            impact['tests'].update(test for tests in lines.values() for test in tests)
+            continue
+        file_tests = set()
+        import_time_change = False
+        for line in changed_old_lines(change['hunks']):
+            tests = lines.get(line)
+            if tests is not None:
+                file_tests.update(tests)
+                import_time_change = import_time_change or not tests
+        if import_time_change:
+            # Module-level code runs on import and can affect every test that imports
+            # the module
+            file_tests.update(test for tests in lines.values() for test in tests)
+        impact['tests'].update(file_tests)
+
+    impact['tests'] = sorted(impact['tests'])
+    return impact
+
+
+def _test_of(context):
+    # Coverage contexts of pytest-cov look like 'tests/test_x.py::TestX::test_y|run'
+    return context.split('|')[0]
+
+
+def _is_stale(test, dropped_tests, stale_test_files):
+    return test in dropped_tests or test.split('::')[0] in stale_test_files
+
+
+def merge_coverage_data(previous_file, partial_file, output_file, changes,
+                        dropped_tests, stale_test_files,
+                        project_dir='.'):
+    """
+    Combines the coverage data of a previous full run with a run of only the impacted
+    tests. Data recorded by dropped tests or stale test modules is discarded, and the
+    remaining data for changed source files is moved to the new line numbers; data for
+    changed lines is discarded. The result keeps per-test contexts, so it can serve as
+    the baseline of the next incremental run.
+    """
+    from coverage import CoverageData
+
+    previous = CoverageData(basename=previous_file)
+    previous.read()
+    partial = CoverageData(basename=partial_file)
+    partial.read()
+    if partial.measured_files() and previous.has_arcs() != partial.has_arcs():
+        raise ValueError("Previous and new coverage data were measured with different "
+                         "branch settings")
+
+    dropped_tests = set(dropped_tests)
+    stale_test_files = set(stale_test_files)
+    retained = {}
+    for measured_file in previous.measured_files():
+        change = changes.get(os.path.relpath(measured_file, project_dir))
+        if change is not None and change['status'] == 'deleted':
+            continue
+        contexts_by_lineno = previous.contexts_by_lineno(measured_file)
+        for context in {context
+                        for contexts in contexts_by_lineno.values()
+                        for context in contexts}:
+            if not _is_stale(_test_of(context), dropped_tests, stale_test_files):
+                retained.setdefault(context, []).append((measured_file, change))
+
+    directory = os.path.dirname(os.path.abspath(output_file))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.coverage-merge-')
+    os.close(fd)
+    try:
+        merged = CoverageData(basename=tmp_path)
+        merged.update(partial)
+        for context, files in sorted(retained.items()):
+            previous.set_query_contexts([f"^{re.escape(context)}$"])
+            merged.set_context(context)
+            if previous.has_arcs():
+                merged.add_arcs({
+                    measured_file: _remap_arcs(previous.arcs(measured_file) or [],
+                                               change)
+                    for measured_file, change in files
+                })
+            else:
+                merged.add_lines({
+                    measured_file: _remap_lines(previous.lines(measured_file) or [],
+                                                change)
+                    for measured_file, change in files
+                })
+        merged.write()
+        os.replace(tmp_path, output_file)
+    except Exception:
+        os.remove(tmp_path)
+        raise
+
+
+def _remap_lines(lines, change):
+    if change is None:
+        return lines
+    mapped = (map_line(change['hunks'], line) for line in lines)
+    return [line for line in mapped if line is not None]
+
+
+def _remap_arcs(arcs, change):
+    if change is None:
+        return arcs
+    remapped = []
+    for start, end in arcs:
+        # Negative line numbers mark entry into and exit from the code object starting
+        # at that line
+        new_start = map_line(change['hunks'], abs(start))
+        new_end = map_line(change['hunks'], abs(end))
+        if new_start is not None and new_end is not None:
+            remapped.append((new_start if start > 0 else -new_start,
+                             new_end if end > 0 else -new_end))
+    return remapped
+
+
+def merge_test_reports(previous_report, partial_report, dropped_tests,
+                       stale_test_files):
+    """
+    Combines the pytest JSON report of a previous full run with a run of only the
+    impacted tests.
+    Returns:
+        - Report with the merged 'tests' and a recomputed 'summary'.
+    """
+    dropped_tests = set(dropped_tests)
+    stale_test_files = set(stale_test_files)
+    rerun = {test['nodeid'] for test in partial_report.get('tests', [])}
+    tests = [test for test in previous_report.get('tests', [])
+             if test['nodeid'] not in rerun
+             and not _is_stale(test['nodeid'], dropped_tests, stale_test_files)]
+    tests += partial_report.get('tests', [])
+    tests.sort(key=lambda test: test['nodeid'])
+
+    summary = {}
+    for test in tests:
+        summary[test['outcome']] = summary.get(test['outcome'], 0) + 1
+    summary['total'] = summary['collected'] = len(tests)
+    merged = dict(previous_report)
+    merged.update(tests=tests, summary=summary)
+    return merged
+
+
+def carry_over_mutant_results(previous_results, mutants, line_contexts, changes,
+                              rerun_tests):
+    """
+    Reuses previous mutation results for mutants whose line is unchanged and none of
+    whose covering tests, before or after the change, was re-run or dropped.
+    Parameters:
+        - previous_results: Result dictionaries of the previous mutation run, each with
+          the 'tests' covering the mutant (None for the whole suite).
+        - line_contexts: Current line-to-tests index.
+        - changes: Incremental evaluation plan with the changed 'files', the impacted
+          'tests' and the 'stale_test_files' (see find_impacted_tests).
+        - rerun_tests: Node ids of the tests the incremental run executed again.
+    Returns:
+        - Tuple of (reused results, mutants that still have to run).
+    """
+    previous = {}
+    for result in previous_results:
+        filename, line, index = result['id'].rsplit(':', 2)
+        change = changes['files'].get(filename)
+        if change is not None:
+            if change['status'] == 'deleted':
+                continue
+            line = map_line(change['hunks'], int(line))
+            if line is None:
+                continue
+        previous[(filename, int(line), int(index))] = result
+
+    rerun_tests = set(rerun_tests)
+    dropped_tests = set(changes['tests'])
+    stale_test_files = set(changes['stale_test_files'])
+    any_test_changed = bool(rerun_tests or dropped_tests or stale_test_files)
+
+    def affected(tests):
+        if tests is None:
+            # Import-time lines are exercised by every test
+            return any_test_changed
+        return any(test in rerun_tests
+                   or _is_stale(test, dropped_tests, stale_test_files)
+                   for test in tests)
+
+    reused, pending = [], []
+    for mutant in mutants:
+        result = previous.get((mutant.filename, mutant.line_number + 1, mutant.index))
+        file_contexts = line_contexts.get(mutant.filename, {})
+        tests = file_contexts.get(mutant.line_number + 1) or None
+        if result is None or affected(result.get('tests')) or affected(tests):
+            pending.append(mutant)
+        else:
+            reused.append({**result, 'id': mutant.id,
+                           'line_number': mutant.line_number + 1, 'tests': tests})
+    return reused, pending
@@ -0,0 +1,238 @@
+# utils/clone_detection.py
+import ast
+import hashlib
+import logging
+import os
+import zlib
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Universal hashing h(x) = (a * x + b) mod p over 32-bit shingle hashes; p is the
+# smallest prime above 2**32, so a * x + b stays below 2**64 and the arithmetic never
+# overflows uint64
+MERSENNE_PRIME = np.uint64(4294967311)
+MAX_HASH = np.uint64(2 ** 32 - 1)
+
+
+class _TestNormalizer(ast.NodeVisitor):
+    """
+    Flattens a test function into a token sequence that ignores its name, docstring and
+    the names of its local variables and parameters, and the values (but not the types)
+    of its literals. Names that are not bound locally, such as the class under test, and
+    attribute names are kept.
+    """
+
+    def __init__(self, function):
+        self.tokens = []
+        self.placeholders = {}
+        arguments = function.args
+        positional = arguments.posonlyargs + arguments.args
+        self.local_names = {arg.arg for arg in positional + arguments.kwonlyargs}
+        self.local_names |= {arg.arg for arg in (arguments.vararg, arguments.kwarg)
+                             if arg is not None}
+        self.local_names |= {node.id for node in ast.walk(function)
+                             if isinstance(node, ast.Name)
+                             and isinstance(node.ctx, (ast.Store, ast.Del))}
+
+    def _local(self, name):
+        return self.placeholders.setdefault(name, f"v{len(self.placeholders)}")
+
+    def normalize(self, function):
+        body = function.body
+        if body and isinstance(body[0], ast.Expr) \
+                and isinstance(body[0].value, ast.Constant) \
+                and isinstance(body[0].value.value, str):
+            body = body[1:]
+        for decorator in function.decorator_list:
+            self.visit(decorator)
+        self.visit(function.args)
+        for statement in body:
+            self.visit(statement)
+        return self.tokens
+
+    def generic_visit(self, node):
+        self.tokens.append(type(node).__name__)
+        super().generic_visit(node)
+
+    def visit_Name(self, node):
+        self.tokens.append(self._local(node.id) if node.id in self.local_names
+                           else node.id)
+
+    def visit_arg(self, node):
+        self.tokens.append(self._local(node.arg))
+
+    def visit_Attribute(self, node):
+        self.tokens.append('Attribute')
+        self.visit(node.value)
+        self.tokens.append(node.attr)
+
+    def visit_Constant(self, node):
+        self.tokens.append(f"<{type(node.value).__name__}>")
+
+
+def normalize_test_function(function):
+    return _TestNormalizer(function).normalize(function)
+
+
+def _is_test_function(node):
+    return (isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+            and node.name.startswith('test'))
+
+
+def _iter_test_functions(tree):
+    for node in tree.body:
+        if _is_test_function(node):
+            yield node.name, node
+        elif isinstance(node, ast.ClassDef):
+            for item in node.body:
+                if _is_test_function(item):
+                    yield f"{node.name}.{item.name}", item
+
+
+def collect_test_functions(test_directory):
+    """
+    Returns:
+        - List of (test id, normalized token list) tuples, with test ids like
+          'tests/test_model.py::TestModel.test_predict'.
+    """
+    functions = []
+    for root, dirs, files in os.walk(test_directory):
+        dirs[:] = sorted(d for d in dirs if d != '__pycache__')
+        for file in sorted(files):
+            if not file.endswith('.py'):
+                continue
+            path = os.path.normpath(os.path.join(root, file))
+            with open(path, 'r') as f:
+                source = f.read()
+            try:
+                tree = ast.parse(source, filename=path)
+            except SyntaxError as e:
+                logger.warning(f"Skipping unparsable test file {path}: {e}")
+                continue
+            for name, function in _iter_test_functions(tree):
+                functions.append((f"{path}::{name}", normalize_test_function(function)))
+    return functions
+
+
+def shingle_hashes(tokens, shingle_size):
+    if len(tokens) <= shingle_size:
+        shingles = [tokens]
+    else:
+        shingles = [tokens[start:start + shingle_size]
+                    for start in range(len(tokens) - shingle_size + 1)]
+    return np.unique(np.array([zlib.crc32("\x1f".join(shingle).encode())
+                               for shingle in shingles],
+                              dtype=np.uint64))
+
+
+class MinHasher:
+    """
+    MinHash signatures over 32-bit shingle hashes.
+    Parameters:
+        - num_permutations: Signature length; the estimation error of the Jaccard
+          similarity shrinks with 1/sqrt of it.
+    """
+
+    def __init__(self, num_permutations=128, seed=1):
+        rng = np.random.RandomState(seed)
+        size = num_permutations
+        self.a = rng.randint(1, 2 ** 32, size=size, dtype=np.uint64)[:, None]
+        self.b = rng.randint(0, 2 ** 32, size=size, dtype=np.uint64)[:, None]
+
+    def signature(self, hashes):
+        permuted = (self.a * hashes[None, :] + self.b) % MERSENNE_PRIME
+        return (permuted & MAX_HASH).min(axis=1)
+
+
+class _DisjointSet:
+    def __init__(self, size):
+        self.parent = list(range(size))
+
+    def find(self, item):
+        while self.parent[item] != item:
+            self.parent[item] = self.parent[self.parent[item]]
+            item = self.parent[item]
+        return item
+
+    def union(self, first, second):
+        first, second = self.find(first), self.find(second)
+        if first != second:
+            self.parent[max(first, second)] = min(first, second)
+
+
+def find_clone_clusters(functions, similarity_threshold=0.8, shingle_size=5,
+                        num_permutations=128, bands=16, min_tokens=10):
+    """
+    Groups near-duplicate test functions. Exact clones (identical normalized token
+    sequences) are grouped by hash; near-duplicates are found with MinHash signatures
+    and locality-sensitive hashing, so the work grows roughly linearly with the number
+    of tests instead of comparing every pair.
+    Parameters:
+        - functions: List of (test id, normalized token list) tuples.
+        - similarity_threshold: Minimum estimated Jaccard similarity of two tests'
+          shingle sets to count as clones.
+        - bands: LSH bands; num_permutations must be a multiple of it.
+        - min_tokens: Tests with fewer normalized tokens are too small to judge and are
+          ignored.
+    Returns:
+        - List of clusters, largest first, each a dict with the clone 'tests', whether
+          they are 'exact' clones and the lowest estimated 'similarity' of a member to
+          the first test.
+    """
+    if num_permutations % bands:
+        raise ValueError("num_permutations must be a multiple of bands")
+    candidates = [(test_id, tokens) for test_id, tokens in functions
+                  if len(tokens) >= min_tokens]
+
+    # Exact clones collapse into one representative before any MinHash work
+    exact_groups = {}
+    for test_id, tokens in candidates:
+        digest = hashlib.sha1("\x1f".join(tokens).encode()).hexdigest()
+        group = exact_groups.setdefault(digest, {'tokens': tokens, 'tests': []})
+        group['tests'].append(test_id)
+    groups = list(exact_groups.values())
+
+    hasher = MinHasher(num_permutations)
+    group_hashes = [shingle_hashes(group['tokens'], shingle_size) for group in groups]
+    signatures = np.array([hasher.signature(hashes) for hashes in group_hashes],
+                          dtype=np.uint64).reshape(len(groups), num_permutations)
+    rows = num_permutations // bands
+
+    clusters = _DisjointSet(len(groups))
+    similarities = {}
+    for band in range(bands):
+        buckets = {}
+        band_signatures = signatures[:, band * rows:(band + 1) * rows]
+        for index, band_signature in enumerate(band_signatures):
+            buckets.setdefault(band_signature.tobytes(), []).append(index)
+        for members in buckets.values():
+            # Comparing each member with the bucket's first keeps large buckets linear;
+            # clustering is transitive
+            first = members[0]
+            for other in members[1:]:
+                if clusters.find(first) == clusters.find(other):
+                    continue
+                similarity = float(np.mean(signatures[first] == signatures[other]))
+                if similarity >= similarity_threshold:
+                    clusters.union(first, other)
+                    similarities[other] = min(similarities.get(other, 1.0), similarity)
+
+    members_by_root = {}
+    for index in range(len(groups)):
+        members_by_root.setdefault(clusters.find(index), []).append(index)
+
+    results = []
+    for members in members_by_root.values():
+        tests = [test_id for index in members for test_id in groups[index]['tests']]
+        if len(tests) < 2:
+            continue
+        results.append({
+            'tests': tests,
+            'exact': len(members) == 1,
+            'similarity': round(min([1.0] + [similarities.get(index, 1.0)
+                                             for index in members]), 3),
+        })
+    results.sort(key=lambda cluster: (-len(cluster['tests']), cluster['tests'][0]))
+    return results
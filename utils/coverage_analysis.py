@@ -0,0 +1,125 @@
+# utils/coverage_analysis.py
+import json
+import logging
+import os
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+LINE_INDEX_VERSION = 1
+
+
+def _summarize(summary):
+    return {
+        'percent_covered': round(summary['percent_covered'], 2),
+        'statements': summary['num_statements'],
+        'covered_statements': summary['covered_lines'],
+        'branches': summary.get('num_branches', 0),
+        'covered_branches': summary.get('covered_branches', 0),
+    }
+
+
+def read_line_contexts(coverage_file, project_dir='.'):
+    """
+    Reads the dynamic contexts recorded by `pytest --cov-context=test`.
+    Returns:
+        - Dictionary mapping relative source paths to {line number: [test node ids]}.
+          Lines only executed at import time map to an empty list.
+    """
+    from coverage import CoverageData
+
+    data = CoverageData(basename=coverage_file)
+    data.read()
+    line_contexts = {}
+    for measured_file in data.measured_files():
+        filename = os.path.relpath(measured_file, project_dir)
+        contexts_by_line = data.contexts_by_lineno(measured_file)
+        line_contexts[filename] = {
+            line: sorted({context.split('|')[0] for context in contexts if context})
+            for line, contexts in contexts_by_line.items()
+        }
+    return line_contexts
+
+
+def summarize_coverage(coverage_file):
+    """
+    Reads a coverage data file through coverage's Python API.
+    Returns:
+        - Dictionary with the overall 'percent_covered' (statements and branches
+          combined when branch coverage was measured), whether 'branch_coverage' was
+          measured, the 'totals' and per-module results including per-function results
+          and missing lines.
+    """
+    import coverage
+
+    cov = coverage.Coverage(data_file=coverage_file)
+    cov.load()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        report_path = os.path.join(tmp_dir, 'coverage.json')
+        cov.json_report(outfile=report_path)
+        with open(report_path, 'r') as f:
+            report = json.load(f)
+
+    modules = {}
+    for filename, results in sorted(report['files'].items()):
+        module = _summarize(results['summary'])
+        module['missing_lines'] = results['missing_lines']
+        # The '' entry holds the module-level code outside any function
+        module['functions'] = {
+            name: _summarize(function['summary'])
+            for name, function in results.get('functions', {}).items() if name
+        }
+        modules[filename] = module
+    return {
+        'percent_covered': report['totals']['percent_covered'],
+        'branch_coverage': report['meta'].get('branch_coverage', False),
+        'totals': _summarize(report['totals']),
+        'modules': modules,
+    }
+
+
+def save_line_index(path, line_contexts):
+    """
+    Persists a {file: {line: [test node ids]}} mapping compactly: each test id is stored
+    once and lines refer to tests by their position in that list.
+    """
+    tests = sorted({test for lines in line_contexts.values()
+                    for line_tests in lines.values() for test in line_tests})
+    positions = {test: position for position, test in enumerate(tests)}
+    index = {
+        'version': LINE_INDEX_VERSION,
+        'tests': tests,
+        'files': {
+            filename: {str(line): [positions[test] for test in line_tests]
+                       for line, line_tests in sorted(lines.items())}
+            for filename, lines in sorted(line_contexts.items())
+        },
+    }
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.ufem-line-index-')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(index, f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+    except Exception:
+        os.remove(tmp_path)
+        raise
+
+
+def load_line_index(path):
+    """
+    Returns:
+        - The {file: {line: [test node ids]}} mapping saved by save_line_index, in the
+          same shape as read_line_contexts returns.
+    """
+    with open(path, 'r') as f:
+        index = json.load(f)
+    if index.get('version') != LINE_INDEX_VERSION:
+        raise ValueError(f"Unsupported line index version in {path}: "
+                         f"{index.get('version')}")
+    tests = index['tests']
+    return {
+        filename: {int(line): [tests[position] for position in positions]
+                   for line, positions in lines.items()}
+        for filename, lines in index['files'].items()
+    }
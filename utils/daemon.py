@@ -0,0 +1,272 @@
+# utils/daemon.py
+import json
+import logging
+import multiprocessing
+import os
+import socket
+import socketserver
+import sys
+import threading
+import time
+
+from utils.change_impact import diff_contents
+
+logger = logging.getLogger(__name__)
+
+# Imported once by the fork server, so test runs forked from it start with them loaded
+DEFAULT_PRELOAD = ['numpy', 'pandas', 'requests', 'pytest', 'coverage', 'pytest_cov',
+                   'pytest_jsonreport']
+
+
+def _run_pytest(arguments, cwd, env):
+    os.chdir(cwd)
+    os.environ.clear()
+    os.environ.update(env)
+    sys.path.insert(0, cwd)
+    import pytest
+
+    # The exit code of the process carries pytest's exit code back to the caller
+    sys.exit(int(pytest.main(arguments)))
+
+
+class WarmTestRunner:
+    """
+    Runs pytest in fresh processes forked from a fork server that has the project's
+    dependencies imported. Every run gets its own process, so edited project modules are
+    always imported anew.
+    Parameters:
+        - preload: Modules the fork server imports up front.
+    """
+
+    def __init__(self, preload=DEFAULT_PRELOAD):
+        self.context = multiprocessing.get_context('forkserver')
+        self.context.set_forkserver_preload(list(preload))
+
+    def warm_up(self):
+        # Starting any process boots the fork server and its preloads
+        process = self.context.Process(target=time.sleep, args=(0,))
+        process.start()
+        process.join()
+
+    def __call__(self, arguments, env=None):
+        process = self.context.Process(target=_run_pytest,
+                                       args=(list(arguments), os.getcwd(),
+                                             dict(os.environ if env is None else env)))
+        process.start()
+        process.join()
+        return process.exitcode
+
+
+def read_contents(paths):
+    """
+    Returns:
+        - Dictionary mapping every watched file to its text: the given files, and the
+          Python files under the given directories.
+    """
+    contents = {}
+    for path in paths:
+        if os.path.isfile(path):
+            filenames = [os.path.normpath(path)]
+        else:
+            filenames = []
+            for root, dirs, files in os.walk(path):
+                dirs[:] = sorted(d for d in dirs if d != '__pycache__')
+                filenames += [os.path.normpath(os.path.join(root, file))
+                              for file in sorted(files) if file.endswith('.py')]
+        for filename in filenames:
+            try:
+                with open(filename, 'r') as f:
+                    contents[filename] = f.read()
+            except OSError:
+                # Deleted between listing and reading
+                continue
+    return contents
+
+
+def snapshot(paths):
+    # Cheap change detection: modification times and sizes only
+    stats = {}
+    for path in paths:
+        if os.path.isfile(path):
+            filenames = [path]
+        else:
+            filenames = [os.path.join(root, file) for root, dirs, files in os.walk(path)
+                         for file in files if file.endswith('.py')]
+        for filename in filenames:
+            try:
+                stat = os.stat(filename)
+            except OSError:
+                continue
+            stats[os.path.normpath(filename)] = (stat.st_mtime_ns, stat.st_size)
+    return stats
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline()
+        started = time.perf_counter()
+        try:
+            request = json.loads(line)
+            response = self.server.daemon.handle_request(request)
+            response['ok'] = True
+        except Exception as e:
+            logger.error(f"Daemon request failed: {e}")
+            response = {'ok': False, 'error': str(e)}
+        response['elapsed'] = time.perf_counter() - started
+        self.wfile.write(json.dumps(response).encode() + b'\n')
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class EvaluationDaemon:
+    """
+    Long-lived evaluator: watches files, re-evaluates when they change and answers
+    requests on a Unix socket. Requests and responses are single JSON lines. Commands:
+        - 'report': the latest report, without re-evaluating.
+        - 'evaluate': re-evaluate if anything changed since the last evaluation, then
+          the latest report.
+        - 'status': evaluation count and timing.
+        - 'shutdown': stop the daemon.
+    Parameters:
+        - evaluate: Callable taking the changes since the previous evaluation (None for
+          the first one, see change_impact.diff_contents) and returning the evaluation
+          report, or None if it failed.
+        - watch_paths: Files and directories to watch.
+        - socket_path: Path of the Unix socket to listen on.
+        - poll_interval: Seconds between checks for changed files.
+        - debounce: Seconds files must be unchanged before an evaluation starts, so a
+          burst of saves triggers one evaluation.
+    """
+
+    def __init__(self, evaluate, watch_paths, socket_path, poll_interval=0.5,
+                 debounce=0.2):
+        self.evaluate = evaluate
+        self.watch_paths = watch_paths
+        self.socket_path = socket_path
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self.report = None
+        self.evaluations = 0
+        self.last_duration = None
+        self._contents = None
+        self._stats = None
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._server = None
+        self._threads = []
+
+    def refresh(self):
+        with self._lock:
+            # Taken before reading, so an edit made while reading is picked up by the
+            # next poll
+            stats = snapshot(self.watch_paths)
+            current = read_contents(self.watch_paths)
+            if self._contents is not None:
+                changes = diff_contents(self._contents, current)
+                if not changes:
+                    self._stats = stats
+                    return self.report
+                logger.info("Re-evaluating after changes to "
+                            f"{', '.join(sorted(changes))}")
+            else:
+                changes = None
+            started = time.perf_counter()
+            report = self.evaluate(changes)
+            self.last_duration = time.perf_counter() - started
+            # Retry on the next change rather than on every poll
+            self._stats = stats
+            if report is None:
+                # The changes stay unevaluated, so the next evaluation covers them too
+                logger.error("Evaluation failed; keeping the previous report")
+                return self.report
+            self.report = report
+            self._contents = current
+            self.evaluations += 1
+            return self.report
+
+    def handle_request(self, request):
+        command = request.get('command')
+        if command == 'report':
+            return {'report': self.report}
+        if command == 'evaluate':
+            return {'report': self.refresh()}
+        if command == 'status':
+            return {'evaluations': self.evaluations,
+                    'last_duration': self.last_duration,
+                    'busy': self._lock.locked()}
+        if command == 'shutdown':
+            self._stopped.set()
+            return {}
+        raise ValueError(f"Unknown command: {command}")
+
+    def _watch(self):
+        while not self._stopped.wait(self.poll_interval):
+            current = snapshot(self.watch_paths)
+            if current == self._stats:
+                continue
+            # Wait for the files to settle before evaluating
+            while not self._stopped.wait(self.debounce):
+                settled = snapshot(self.watch_paths)
+                if settled == current:
+                    break
+                current = settled
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Re-evaluation failed: {e}")
+                # Retry on the next change rather than on every poll
+                self._stats = current
+
+    def _remove_stale_socket(self):
+        if not os.path.exists(self.socket_path):
+            return
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(self.socket_path)
+            except OSError:
+                os.remove(self.socket_path)
+                return
+        raise RuntimeError("Another evaluator daemon is listening on "
+                           f"{self.socket_path}")
+
+    def start(self):
+        self.refresh()
+        self._remove_stale_socket()
+        self._server = _UnixServer(self.socket_path, _RequestHandler)
+        self._server.daemon = self
+        self._threads = [threading.Thread(target=self._server.serve_forever,
+                                          daemon=True),
+                         threading.Thread(target=self._watch, daemon=True)]
+        for thread in self._threads:
+            thread.start()
+        logger.info(f"Evaluator daemon listening on {self.socket_path}")
+
+    def wait(self):
+        self._stopped.wait()
+
+    def stop(self):
+        self._stopped.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        for thread in self._threads:
+            thread.join()
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+
+def send_request(socket_path, command, timeout=None):
+    """
+    Sends one command to a running EvaluationDaemon.
+    Returns:
+        - The decoded response.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.settimeout(timeout)
+        connection.connect(socket_path)
+        connection.sendall(json.dumps({'command': command}).encode() + b'\n')
+        with connection.makefile('rb') as response:
+            return json.loads(response.readline())
@@ -0,0 +1,206 @@
+# utils/embedding_index.py
+import ast
+import json
+import logging
+import os
+import textwrap
+
+import numpy as np
+from utils.eval_cache import hash_file
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EMBEDDING_MODEL = "text-embedding-3-small"
+
+
+def extract_test_functions(path):
+    """
+    Splits a test file into one chunk per test function (module level or inside a test
+    class).
+    Returns:
+        - List of (name, source) tuples, e.g.
+          ('TestModel.test_predict_success', 'def test_predict_success...').
+    """
+    with open(path, 'r') as f:
+        source = f.read()
+    try:
+        tree = ast.parse(source)
+    except SyntaxError as e:
+        logger.warning(f"Skipping unparsable test file {path}: {e}")
+        return []
+
+    functions = (ast.FunctionDef, ast.AsyncFunctionDef)
+    chunks = []
+    for node in tree.body:
+        if isinstance(node, functions) and node.name.startswith('test'):
+            segment = ast.get_source_segment(source, node, padded=True)
+            chunks.append((node.name, textwrap.dedent(segment)))
+        elif isinstance(node, ast.ClassDef):
+            for item in node.body:
+                if isinstance(item, functions) and item.name.startswith('test'):
+                    segment = ast.get_source_segment(source, item, padded=True)
+                    name = f"{node.name}.{item.name}"
+                    chunks.append((name, textwrap.dedent(segment)))
+    return chunks
+
+
+def openai_embedder(model=DEFAULT_EMBEDDING_MODEL, client=None, batch_size=256):
+    def embed(texts):
+        from utils.llm_utils import get_openai_client
+
+        embedding_client = client or get_openai_client()
+        vectors = []
+        for start in range(0, len(texts), batch_size):
+            batch = texts[start:start + batch_size]
+            response = embedding_client.embeddings.create(model=model, input=batch)
+            vectors.extend(item.embedding for item in response.data)
+        return np.array(vectors, dtype=np.float32)
+
+    return embed
+
+
+def _dimension(vectors):
+    return int(vectors.shape[1]) if vectors.ndim == 2 and len(vectors) else None
+
+
+def _normalize(vectors):
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class EmbeddingIndex:
+    """
+    Vector index of test-function chunks, persisted as <index_path>.json (embedding
+    model, vector dimension and chunk metadata) and <index_path>.npy (unit-normalized
+    embeddings, one row per chunk). An index built with another model or dimension is
+    rebuilt rather than mixed with new vectors.
+    Parameters:
+        - index_path: Path prefix of the persisted index.
+        - embed: Callable mapping a list of texts to a 2-D array of embeddings.
+        - model: Name of the embedding model embed uses.
+    """
+
+    def __init__(self, index_path, embed, model=DEFAULT_EMBEDDING_MODEL):
+        self.index_path = index_path
+        self.embed = embed
+        self.model = model
+        self.chunks = []
+        self.vectors = np.zeros((0, 0), dtype=np.float32)
+        self._load()
+
+    @property
+    def metadata_path(self):
+        return f"{self.index_path}.json"
+
+    @property
+    def vectors_path(self):
+        return f"{self.index_path}.npy"
+
+    def _load(self):
+        if not (os.path.exists(self.metadata_path)
+                and os.path.exists(self.vectors_path)):
+            return
+        try:
+            with open(self.metadata_path, 'r') as f:
+                metadata = json.load(f)
+            chunks = metadata['chunks']
+            vectors = np.load(self.vectors_path)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("Rebuilding unreadable embedding index "
+                           f"{self.index_path}: {e}")
+            return
+        if metadata.get('model') != self.model \
+                or metadata.get('dimension') != _dimension(vectors):
+            logger.info(f"Rebuilding embedding index {self.index_path}: built with "
+                        f"model {metadata.get('model')} ({metadata.get('dimension')} "
+                        f"dimensions), now using {self.model}")
+            return
+        if len(chunks) == len(vectors):
+            self.chunks, self.vectors = chunks, vectors
+
+    def _save(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.index_path)), exist_ok=True)
+        with open(self.metadata_path, 'w') as f:
+            json.dump({'model': self.model, 'dimension': _dimension(self.vectors),
+                       'chunks': self.chunks}, f, indent=4)
+        np.save(self.vectors_path, self.vectors)
+
+    def _embed_chunks(self, chunks):
+        return _normalize(np.asarray(
+            self.embed([f"{chunk['file']}::{chunk['name']}\n{chunk['source']}"
+                        for chunk in chunks]),
+            dtype=np.float32
+        ))
+
+    def refresh(self, test_directory):
+        """
+        Re-embeds only the test files whose content changed since the index was built.
+        Returns:
+            - Number of chunks that were (re-)embedded.
+        """
+        current = {}
+        for root, dirs, files in os.walk(test_directory):
+            dirs.sort()
+            for file in sorted(files):
+                if file.endswith('.py'):
+                    path = os.path.normpath(os.path.join(root, file))
+                    current[path] = hash_file(path)
+
+        kept_rows = [row for row, chunk in enumerate(self.chunks)
+                     if current.get(chunk['file']) == chunk['file_hash']]
+        indexed_files = {self.chunks[row]['file'] for row in kept_rows}
+        new_chunks = []
+        for path, file_hash in current.items():
+            if path in indexed_files:
+                continue
+            for name, source in extract_test_functions(path):
+                new_chunks.append({'file': path, 'file_hash': file_hash, 'name': name,
+                                   'source': source})
+
+        if not new_chunks and len(kept_rows) == len(self.chunks):
+            return 0
+
+        chunks = [self.chunks[row] for row in kept_rows]
+        vectors = self.vectors[kept_rows] if kept_rows else None
+        if new_chunks:
+            logger.info(f"Embedding {len(new_chunks)} test functions from changed "
+                        "files...")
+            embedded = self._embed_chunks(new_chunks)
+            if vectors is not None and embedded.shape[1] != vectors.shape[1]:
+                # The embedder changed without the model name: the kept vectors are not
+                # comparable any more
+                logger.warning(f"Embedding dimension changed from {vectors.shape[1]} "
+                               f"to {embedded.shape[1]}, "
+                               f"re-embedding all {len(chunks)} indexed test functions")
+                vectors = self._embed_chunks(chunks)
+            vectors = embedded if vectors is None else np.vstack([vectors, embedded])
+            chunks += new_chunks
+        self.chunks = chunks
+        if vectors is None:
+            vectors = np.zeros((0, 0), dtype=np.float32)
+        self.vectors = vectors
+        self._save()
+        return len(new_chunks)
+
+    def retrieve(self, descriptions, top_k=5):
+        """
+        Returns:
+            - Dictionary mapping each description to the source of its top_k most
+              similar test functions, most similar first.
+        """
+        if not descriptions or not self.chunks:
+            return {description: [] for description in descriptions}
+        queries = _normalize(np.asarray(self.embed(list(descriptions)),
+                                        dtype=np.float32))
+        similarities = queries @ self.vectors.T
+        k = min(top_k, len(self.chunks))
+        top = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+        results = {}
+        for row, description in enumerate(descriptions):
+            ranked = top[row][np.argsort(-similarities[row, top[row]])]
+            results[description] = [
+                f"# {chunk['file']}::{chunk['name']}\n{chunk['source']}"
+                for chunk in (self.chunks[index] for index in ranked)
+            ]
+        return results
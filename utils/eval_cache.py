@@ -0,0 +1,98 @@
+# utils/eval_cache.py
+import hashlib
+import json
+import logging
+import os
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+# Bump when a change to the evaluator makes previously cached scores invalid
+CACHE_VERSION = 2
+
+SKIPPED_DIRECTORIES = {'__pycache__', '.pytest_cache'}
+
+
+def hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(65536), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _iter_files(path):
+    if os.path.isfile(path):
+        yield path
+        return
+    for root, dirs, files in os.walk(path):
+        dirs[:] = sorted(d for d in dirs if d not in SKIPPED_DIRECTORIES)
+        for filename in sorted(files):
+            if not filename.endswith(('.pyc', '.pyo')):
+                yield os.path.join(root, filename)
+
+
+class EvaluationCache:
+    """
+    Persistent cache of component scores keyed by content hashes of their inputs.
+    Parameters:
+        - path: JSON file the cache is stored in.
+        - config: Loaded evaluation configuration; components depend on named sections
+          of it.
+    """
+
+    def __init__(self, path, config):
+        self.path = path
+        self.config = config
+        self._file_hashes = {}
+        self.entries = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable evaluation cache {path}: {e}")
+
+    def _hash_path(self, path):
+        digest = hashlib.sha256()
+        for filename in _iter_files(path):
+            if filename not in self._file_hashes:
+                self._file_hashes[filename] = hash_file(filename)
+            digest.update(os.path.normpath(filename).encode())
+            digest.update(self._file_hashes[filename].encode())
+        return digest.hexdigest()
+
+    def key(self, paths, config_sections=()):
+        digest = hashlib.sha256(f"ufem-cache-v{CACHE_VERSION}".encode())
+        for path in sorted(paths):
+            digest.update(path.encode())
+            if os.path.exists(path):
+                digest.update(self._hash_path(path).encode())
+            else:
+                digest.update(b'missing')
+        for section in sorted(config_sections):
+            digest.update(section.encode())
+            digest.update(json.dumps(self.config.get(section), sort_keys=True).encode())
+        return digest.hexdigest()
+
+    def get(self, component, key):
+        entry = self.entries.get(component)
+        if entry is not None and entry.get('key') == key:
+            return entry
+        return None
+
+    def put(self, component, key, score, details=None):
+        self.entries[component] = {'key': key, 'score': score, 'details': details}
+
+    def save(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        # Write to a temporary file first so a concurrent reader never sees a partial
+        # cache
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.ufem-cache-')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(self.entries, f, indent=4)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            os.remove(tmp_path)
+            raise
@@ -0,0 +1,126 @@
+# utils/exception_analysis.py
+import ast
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+BASE_EXCEPTIONS = {'Exception', 'BaseException'}
+RAISES_ASSERTIONS = {'raises', 'assertRaises', 'assertRaisesRegex',
+                     'assertRaisesRegexp'}
+
+
+def _name_of(node):
+    # ValidationError, exceptions.ValidationError and ValidationError("message") all
+    # name ValidationError
+    if isinstance(node, ast.Call):
+        node = node.func
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return None
+
+
+def _names_in(node):
+    if isinstance(node, (ast.Tuple, ast.List, ast.Set)):
+        return [name for element in node.elts for name in _names_in(element)]
+    name = _name_of(node)
+    return [name] if name else []
+
+
+def discover_exception_classes(module_path):
+    """
+    Lists the exception classes defined in a module, including subclasses of other
+    classes defined there.
+    Returns:
+        - List of class names in definition order.
+    """
+    with open(module_path, 'r') as f:
+        tree = ast.parse(f.read(), filename=module_path)
+
+    exception_names = set(BASE_EXCEPTIONS)
+    classes = []
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef):
+            base_names = {_name_of(base) for base in node.bases}
+            if base_names & exception_names \
+                    or node.name.endswith(('Error', 'Exception')):
+                exception_names.add(node.name)
+                classes.append(node.name)
+    return classes
+
+
+def _raised_in_file(path):
+    with open(path, 'r') as f:
+        source = f.read()
+    try:
+        tree = ast.parse(source, filename=path)
+    except SyntaxError as e:
+        logger.warning(f"Skipping unparsable test file {path}: {e}")
+        return []
+
+    found = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call):
+            # pytest.raises(X), self.assertRaises((X, Y)), mock.patch(...,
+            # side_effect=X)
+            if _name_of(node.func) in RAISES_ASSERTIONS and node.args:
+                found.extend((name, node.lineno) for name in _names_in(node.args[0]))
+            for keyword in node.keywords:
+                if keyword.arg == 'side_effect':
+                    found.extend((name, node.lineno)
+                                 for name in _names_in(keyword.value))
+        elif isinstance(node, ast.Assign):
+            # mock_get.side_effect = X("message")
+            if any(isinstance(target, ast.Attribute) and target.attr == 'side_effect'
+                   for target in node.targets):
+                found.extend((name, node.lineno) for name in _names_in(node.value))
+    return found
+
+
+def find_tested_exceptions(test_directory):
+    """
+    Statically finds the exceptions the tests expect to be raised (pytest.raises,
+    assertRaises) or make mocks raise (side_effect).
+    Returns:
+        - Dictionary mapping each exception class name to the 'file:line' locations it
+          appears at.
+    """
+    tested = {}
+    for root, dirs, files in os.walk(test_directory):
+        dirs[:] = sorted(d for d in dirs if d != '__pycache__')
+        for file in sorted(files):
+            if file.endswith('.py'):
+                path = os.path.join(root, file)
+                for name, line in _raised_in_file(path):
+                    location = f"{os.path.normpath(path)}:{line}"
+                    tested.setdefault(name, []).append(location)
+    return tested
+
+
+def analyze_exception_tests(exceptions_module, test_directory, exception_classes=None):
+    """
+    Resolves which exception classes the tests demonstrably exercise without asking the
+    LLM.
+    Parameters:
+        - exceptions_module: Module defining the project's exception classes.
+        - exception_classes: Optional explicit list of classes to assess; defaults to
+          those in exceptions_module.
+    Returns:
+        - Dictionary with the assessed 'classes', the 'total_exceptions_in_code' (the
+          number of assessed classes), the statically 'resolved' classes with their
+          evidence and the 'unresolved' classes left for the LLM.
+    """
+    if exception_classes:
+        classes = list(exception_classes)
+    else:
+        classes = discover_exception_classes(exceptions_module)
+    tested = find_tested_exceptions(test_directory)
+    resolved = {name: tested[name] for name in classes if name in tested}
+    return {
+        'classes': classes,
+        'total_exceptions_in_code': len(classes),
+        'resolved': resolved,
+        'unresolved': [name for name in classes if name not in resolved],
+    }
@@ -0,0 +1,233 @@
+# utils/instrumentation.py
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+# Stage whose measurement child processes started on this thread are added to
+_local = threading.local()
+# Several threads may add children to one stage
+_children_lock = threading.Lock()
+
+
+def _max_rss_kb(ru_maxrss):
+    # Linux reports kilobytes, macOS bytes
+    return ru_maxrss // 1024 if sys.platform == 'darwin' else ru_maxrss
+
+
+def _usage(rusage):
+    return {'cpu_seconds': rusage.ru_utime + rusage.ru_stime,
+            'max_rss_kb': _max_rss_kb(rusage.ru_maxrss)}
+
+
+def _exit_code(status):
+    # Same convention as subprocess: negative signal number for killed processes
+    if os.WIFSIGNALED(status):
+        return -os.WTERMSIG(status)
+    return os.WEXITSTATUS(status)
+
+
+def record_child_usage(usage):
+    """
+    Adds a finished child process's resource usage to the stage measured on the current
+    thread, if any.
+    """
+    measurement = getattr(_local, 'measurement', None)
+    if measurement is None or usage is None:
+        return
+    children = measurement['children']
+    with _children_lock:
+        children['processes'] += 1
+        children['cpu_seconds'] += usage['cpu_seconds']
+        children['max_rss_kb'] = max(children['max_rss_kb'], usage['max_rss_kb'])
+
+
+def bind_measurement(func):
+    """
+    Returns:
+        - func wrapped to run in the stage measured on the calling thread, so the child
+          processes it runs on other threads are added to that stage too.
+    """
+    measurement = getattr(_local, 'measurement', None)
+
+    def bound(*args, **kwargs):
+        outer = getattr(_local, 'measurement', None)
+        _local.measurement = measurement
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _local.measurement = outer
+    return bound
+
+
+def run_command(command, timeout=None, **popen_kwargs):
+    """
+    Runs a command like subprocess.run and reaps it with os.wait4 to get its resource
+    usage. The usage is also added to the stage measured on the current thread.
+    Returns:
+        - (returncode, usage), where usage has the child's 'cpu_seconds' and
+          'max_rss_kb', or is None where os.wait4 is unavailable.
+    Raises:
+        - subprocess.TimeoutExpired if the command was killed after timeout seconds.
+    """
+    process = subprocess.Popen(command, **popen_kwargs)
+    if not hasattr(os, 'wait4'):
+        return process.wait(timeout=timeout), None
+
+    # os.wait4 has no timeout, so a timer kills the process instead
+    timed_out = threading.Event()
+
+    def kill():
+        timed_out.set()
+        process.kill()
+
+    timer = threading.Timer(timeout, kill) if timeout is not None else None
+    if timer is not None:
+        timer.start()
+    try:
+        _, status, rusage = os.wait4(process.pid, 0)
+    finally:
+        if timer is not None:
+            timer.cancel()
+    # Tell the Popen object the process is already reaped
+    process.returncode = _exit_code(status)
+    usage = _usage(rusage)
+    record_child_usage(usage)
+    if timed_out.is_set():
+        raise subprocess.TimeoutExpired(command, timeout)
+    return process.returncode, usage
+
+
+@contextmanager
+def measure(name, measurements=None):
+    """
+    Measures the wall time and the CPU time of the current thread spent in the block,
+    and the resource usage of the child processes run_command reaps meanwhile.
+    Parameters:
+        - name: Stage name.
+        - measurements: Optional dictionary the measurement is stored in under name.
+    Yields:
+        - The measurement, filled in when the block exits.
+    """
+    measurement = {
+        'start': time.time(),
+        'wall_seconds': 0.0,
+        'cpu_seconds': 0.0,
+        'pid': os.getpid(),
+        'thread': threading.current_thread().name,
+        'children': {'processes': 0, 'cpu_seconds': 0.0, 'max_rss_kb': 0},
+    }
+    outer = getattr(_local, 'measurement', None)
+    _local.measurement = measurement
+    started, cpu_started = time.perf_counter(), time.thread_time()
+    try:
+        yield measurement
+    finally:
+        measurement['wall_seconds'] = time.perf_counter() - started
+        measurement['cpu_seconds'] = time.thread_time() - cpu_started
+        _local.measurement = outer
+        if outer is not None:
+            # Children of a nested stage also count for the enclosing one
+            outer['children']['processes'] += measurement['children']['processes']
+            outer['children']['cpu_seconds'] += measurement['children']['cpu_seconds']
+            outer['children']['max_rss_kb'] = max(outer['children']['max_rss_kb'],
+                                                  measurement['children']['max_rss_kb'])
+        if measurements is not None:
+            measurements[name] = measurement
+
+
+def measure_call(name, func, **kwargs):
+    """
+    Calls func under measure; module-level so it can run on process executors too.
+    Returns:
+        - (func's return value, measurement)
+    """
+    with measure(name) as measurement:
+        result = func(**kwargs)
+    return result, measurement
+
+
+def process_usage():
+    """
+    Returns:
+        - CPU seconds and max RSS of this process and, separately, of all its reaped
+          descendants, or None where the resource module is unavailable.
+    """
+    if resource is None:
+        return None
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return {
+        'cpu_seconds': own.ru_utime + own.ru_stime,
+        'max_rss_kb': _max_rss_kb(own.ru_maxrss),
+        'children_cpu_seconds': children.ru_utime + children.ru_stime,
+        'children_max_rss_kb': _max_rss_kb(children.ru_maxrss),
+    }
+
+
+def critical_path(tasks, measurements):
+    """
+    Follows, from the stage that finished last, the need that finished last at each
+    step.
+    Parameters:
+        - tasks: The scheduler MetricTasks that ran.
+        - measurements: Their measurements, keyed by task name.
+    Returns:
+        - Names of the stages on the critical path, in execution order.
+    """
+    def end(task):
+        measurement = measurements[task.name]
+        return measurement['start'] + measurement['wall_seconds']
+
+    producers = {task.produces: task for task in tasks if task.name in measurements}
+    if not producers:
+        return []
+    path = []
+    task = max(producers.values(), key=end)
+    while task is not None:
+        path.append(task.name)
+        needs = [producers[need] for need in task.needs if need in producers]
+        task = max(needs, key=end) if needs else None
+    return path[::-1]
+
+
+def write_chrome_trace(path, measurements):
+    """
+    Writes stage measurements in the Chrome trace event format, viewable in Perfetto or
+    chrome://tracing.
+    """
+    if not measurements:
+        return
+    origin = min(measurement['start'] for measurement in measurements.values())
+    threads = {}
+    events = []
+    for name, measurement in sorted(measurements.items(),
+                                    key=lambda item: item[1]['start']):
+        key = (measurement['pid'], measurement['thread'])
+        if key not in threads:
+            threads[key] = len(threads) + 1
+            events.append({'name': 'thread_name', 'ph': 'M', 'pid': measurement['pid'],
+                           'tid': threads[key],
+                           'args': {'name': measurement['thread']}})
+        events.append({
+            'name': name,
+            'cat': 'stage',
+            'ph': 'X',
+            'ts': (measurement['start'] - origin) * 1e6,
+            'dur': measurement['wall_seconds'] * 1e6,
+            'pid': measurement['pid'],
+            'tid': threads[key],
+            'args': {'cpu_seconds': measurement['cpu_seconds'], **{
+                f'children_{field}': value
+                for field, value in measurement['children'].items()}},
+        })
+    with open(path, 'w') as f:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
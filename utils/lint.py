@@ -0,0 +1,175 @@
+# utils/lint.py
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import flake8
+from flake8.api import legacy as flake8_legacy
+from flake8.formatting.base import BaseFormatter
+from utils.eval_cache import hash_file
+
+logger = logging.getLogger(__name__)
+
+# Bump when a change to the lint stage makes previously cached results invalid
+LINT_CACHE_VERSION = 1
+
+# flake8 reads its settings from these files, so they are part of the cache key
+FLAKE8_CONFIG_FILES = ('setup.cfg', 'tox.ini', '.flake8')
+
+
+# Style guides of this process by ignore list; loading flake8's plugins and options
+# costs far more than checking a file, so each worker builds its style guide once
+_style_guides = {}
+_style_guides_lock = threading.Lock()
+
+
+class ViolationCounter(BaseFormatter):
+    """flake8 formatter counting the reported violations by code instead of printing."""
+
+    def after_init(self):
+        self.counts = {}
+
+    def handle(self, error):
+        self.counts[error.code] = self.counts.get(error.code, 0) + 1
+
+    def format(self, error):
+        return None
+
+
+def _style_guide(ignore):
+    if ignore not in _style_guides:
+        style_guide = flake8_legacy.get_style_guide(ignore=list(ignore), quiet=2)
+        counters = []
+
+        class Counter(ViolationCounter):
+            def after_init(self):
+                super().after_init()
+                counters.append(self)
+
+        style_guide.init_report(Counter)
+        _style_guides[ignore] = (style_guide, counters[-1])
+    return _style_guides[ignore]
+
+
+def lint_file(path, ignore=()):
+    """
+    Runs every enabled flake8 check over one file. flake8 tokenizes and parses the file
+    once and hands the same tokens and AST to all of its plugins (pycodestyle, pyflakes,
+    mccabe, radon, ...).
+    Returns:
+        - Dictionary mapping each violation code to its number of occurrences.
+    """
+    # A style guide checks one file at a time, also when lint runs in the evaluator's
+    # threads
+    with _style_guides_lock:
+        style_guide, counter = _style_guide(tuple(ignore))
+        counter.counts = {}
+        style_guide.check_files([path])
+        return counter.counts
+
+
+def _lint_file_task(args):
+    return lint_file(*args)
+
+
+def iter_python_files(paths):
+    for path in paths:
+        if os.path.isfile(path):
+            yield os.path.normpath(path)
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs[:] = sorted(d for d in dirs if d != '__pycache__')
+            for filename in sorted(files):
+                if filename.endswith('.py'):
+                    yield os.path.normpath(os.path.join(root, filename))
+
+
+def settings_key(ignore=()):
+    version = f"lint-v{LINT_CACHE_VERSION}:flake8-{flake8.__version__}"
+    digest = hashlib.sha256(version.encode())
+    digest.update(json.dumps(sorted(ignore)).encode())
+    for config_file in FLAKE8_CONFIG_FILES:
+        if os.path.exists(config_file):
+            digest.update(config_file.encode())
+            digest.update(hash_file(config_file).encode())
+    return digest.hexdigest()
+
+
+def _load_cache(cache_path, key):
+    if not cache_path or not os.path.exists(cache_path):
+        return {}
+    try:
+        with open(cache_path, 'r') as f:
+            cached = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable lint cache {cache_path}: {e}")
+        return {}
+    return cached.get('files', {}) if cached.get('settings') == key else {}
+
+
+def _save_cache(cache_path, key, files):
+    directory = os.path.dirname(os.path.abspath(cache_path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.ufem-lint-cache-')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump({'settings': key, 'files': files}, f, indent=4)
+        os.replace(tmp_path, cache_path)
+    except Exception:
+        os.remove(tmp_path)
+        raise
+
+
+def run_lint(paths, ignore=(), workers=None, cache_path=None):
+    """
+    Lints every Python file under the given paths once, in parallel across files,
+    reusing cached results for files whose content is unchanged.
+    Parameters:
+        - ignore: flake8 codes to ignore.
+        - workers: Number of worker processes. Defaults to the number of CPUs.
+        - cache_path: Optional JSON file caching results per file content hash.
+    Returns:
+        - Dictionary mapping each file to its violation counts by code.
+    """
+    key = settings_key(ignore)
+    cached = _load_cache(cache_path, key)
+    hashes = {path: hash_file(path) for path in iter_python_files(paths)}
+
+    results = {}
+    pending = []
+    for path, file_hash in hashes.items():
+        entry = cached.get(path)
+        if entry is not None and entry.get('hash') == file_hash:
+            results[path] = entry['violations']
+        else:
+            pending.append(path)
+
+    if pending:
+        workers = min(workers or os.cpu_count() or 1, len(pending))
+        logger.info(f"Linting {len(pending)} files on {workers} workers "
+                    f"({len(results)} cached)...")
+        tasks = [(path, tuple(ignore)) for path in pending]
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                linted = list(pool.map(_lint_file_task, tasks))
+        else:
+            linted = [_lint_file_task(task) for task in tasks]
+        results.update(zip(pending, linted))
+
+    if cache_path:
+        _save_cache(cache_path, key,
+                    {path: {'hash': hashes[path], 'violations': results[path]}
+                     for path in hashes})
+    return {path: results[path] for path in hashes}
+
+
+def count_violations(results, prefix=''):
+    """
+    Returns:
+        - Total number of violations whose code starts with prefix, over all files.
+    """
+    return sum(count for violations in results.values()
+               for code, count in violations.items() if code.startswith(prefix))
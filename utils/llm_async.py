@@ -0,0 +1,194 @@
+# utils/llm_async.py
+import asyncio
+import logging
+import os
+import random
+import time
+
+import httpx
+import openai
+from utils.llm_cache import content_hash
+from utils.llm_utils import (
+    DEFAULT_MODEL,
+    batch_test_content,
+    build_batch_prompt,
+    check_assessed,
+    collect_test_context,
+    lookup_cached_verdicts,
+    parse_batch_verdicts,
+)
+
+logger = logging.getLogger(__name__)
+
+# Errors worth retrying: throttling, timeouts, dropped connections and server-side
+# failures
+RETRYABLE_ERRORS = (openai.RateLimitError, openai.APIConnectionError,
+                    openai.InternalServerError)
+
+
+class TokenBucket:
+    """
+    Async token-bucket rate limiter.
+    Parameters:
+        - rate: Tokens added per second.
+        - capacity: Maximum burst size.
+    """
+
+    def __init__(self, rate, capacity=1, clock=time.monotonic):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.tokens = capacity
+        self.updated_at = clock()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity,
+                          self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self, tokens=1):
+        async with self._lock:
+            self._refill()
+            while self.tokens < tokens:
+                await asyncio.sleep((tokens - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= tokens
+
+
+def backoff_delay(attempt, base_delay, max_delay):
+    # Exponential backoff with full jitter
+    return random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+
+
+async def call_with_retries(call, max_retries=3, base_delay=0.5, max_delay=20.0,
+                            usage=None):
+    for attempt in range(max_retries + 1):
+        try:
+            return await call()
+        except RETRYABLE_ERRORS as e:
+            if attempt == max_retries:
+                raise
+            if usage is not None:
+                usage.record_retry()
+            delay = backoff_delay(attempt, base_delay, max_delay)
+            logger.warning(f"LLM request failed ({e.__class__.__name__}), retrying in "
+                           f"{delay:.2f}s")
+            await asyncio.sleep(delay)
+
+
+def create_async_client(max_concurrency, api_key=None, base_url=None):
+    api_key = api_key or os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise ValueError("OpenAI API key not found. Please set the OPENAI_API_KEY "
+                         "environment variable.")
+    # One HTTP connection pool sized to the concurrency limit; retries are handled by
+    # call_with_retries
+    limits = httpx.Limits(max_connections=max_concurrency,
+                          max_keepalive_connections=max_concurrency)
+    http_client = httpx.AsyncClient(limits=limits)
+    return openai.AsyncOpenAI(api_key=api_key, base_url=base_url, max_retries=0,
+                              http_client=http_client)
+
+
+async def assess_requirements_async(test_directory, descriptions, client=None,
+                                    model=DEFAULT_MODEL, batch_size=1,
+                                    max_concurrency=8, requests_per_second=5.0,
+                                    max_retries=3, retry_base_delay=0.5,
+                                    cache=None, retriever=None, usage=None):
+    """
+    Asyncio version of llm_utils.assess_requirements that fans batches out concurrently.
+    Parameters:
+        - client: openai.AsyncOpenAI client. Defaults to one created (and closed) for
+          this call.
+        - batch_size: Requirements per request; 1 assesses every requirement in its own
+          request.
+        - max_concurrency: Maximum number of requests in flight.
+        - requests_per_second: Token-bucket rate limit on request starts.
+        - max_retries: Retries per request on throttling and transient errors.
+        - retry_base_delay: Backoff before the first retry, doubling (with jitter) on
+          each further retry.
+        - cache: Optional VerdictCache.
+        - retriever: Optional callable mapping descriptions to their relevant test
+          snippets.
+        - usage: Optional llm_utils.LLMUsage recording the requests made and their token
+          counts.
+    Returns:
+        - Dictionary mapping each assessed description to True if the tests cover it;
+          like llm_utils.assess_requirements, it leaves out the requirements that could
+          not be assessed and raises AssessmentError if none could.
+    """
+    descriptions = list(dict.fromkeys(descriptions))
+    verdicts = {}
+    if not descriptions:
+        return verdicts
+
+    owns_client = client is None
+    test_context = collect_test_context(test_directory, descriptions, retriever)
+    content_hashes = {description: content_hash("\n".join(test_context[description]))
+                      for description in descriptions}
+    pending = lookup_cached_verdicts(cache, model, descriptions, content_hashes,
+                                     verdicts)
+    if not pending:
+        return verdicts
+    if owns_client:
+        client = create_async_client(max_concurrency)
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+    bucket = TokenBucket(requests_per_second, capacity=max(1, int(requests_per_second)))
+
+    async def assess_batch(batch):
+        prompt = build_batch_prompt(batch_test_content(test_context, batch), batch)
+
+        async def request():
+            await bucket.acquire()
+            return await client.chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": "You are a software testing expert."},
+                    {"role": "user", "content": prompt}
+                ],
+                response_format={"type": "json_object"}
+            )
+
+        async with semaphore:
+            try:
+                try:
+                    response = await call_with_retries(request, max_retries=max_retries,
+                                                       base_delay=retry_base_delay,
+                                                       usage=usage)
+                except Exception:
+                    if usage is not None:
+                        usage.record_failure()
+                    raise
+                if usage is not None:
+                    usage.record_response(response)
+                content = response.choices[0].message.content
+                batch_verdicts = parse_batch_verdicts(content, batch)
+            except Exception as e:
+                logger.error(f"LLM assessment failed for {len(batch)} requirements: "
+                             f"{e}")
+                return
+        verdicts.update(batch_verdicts)
+        if cache is not None:
+            for description, verdict in batch_verdicts.items():
+                cache.put(model, description, content_hashes[description], verdict)
+
+    try:
+        batches = [pending[start:start + batch_size]
+                   for start in range(0, len(pending), batch_size)]
+        await asyncio.gather(*(assess_batch(batch) for batch in batches))
+    finally:
+        if owns_client:
+            await client.close()
+    return check_assessed(descriptions, verdicts)
+
+
+def assess_requirements_concurrently(test_directory, descriptions, **kwargs):
+    # Synchronous entry point for callers without an event loop, such as the evaluator's
+    # worker threads
+    return asyncio.run(assess_requirements_async(test_directory, descriptions,
+                                                 **kwargs))
@@ -0,0 +1,103 @@
+# utils/llm_cache.py
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class VerdictCache:
+    """
+    On-disk cache of LLM verdicts keyed by model, requirement and a hash of the test
+    content. SQLite handles locking, so several evaluator processes can share one cache
+    file.
+    Parameters:
+        - path: SQLite database file.
+        - max_entries: Least recently used verdicts beyond this many are evicted.
+        - ttl_seconds: Verdicts older than this are ignored. None keeps them forever.
+        - clock: Time source, replaceable in tests.
+    """
+
+    def __init__(self, path, max_entries=10000, ttl_seconds=None, clock=time.time):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        with self._connect() as connection:
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS verdicts ('
+                'key TEXT PRIMARY KEY, verdict INTEGER NOT NULL, '
+                'created_at REAL NOT NULL, last_access REAL NOT NULL)'
+            )
+            connection.execute('CREATE INDEX IF NOT EXISTS verdicts_last_access ON '
+                               'verdicts (last_access)')
+
+    @contextmanager
+    def _connect(self):
+        connection = sqlite3.connect(self.path, timeout=30)
+        try:
+            # Commits on success, rolls back on error
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    @staticmethod
+    def key(model, requirement, test_content_hash):
+        return content_hash('\0'.join([model, requirement, test_content_hash]))
+
+    def get(self, model, requirement, test_content_hash):
+        key = self.key(model, requirement, test_content_hash)
+        now = self.clock()
+        with self._lock, self._connect() as connection:
+            row = connection.execute('SELECT verdict, created_at FROM verdicts '
+                                     'WHERE key = ?', (key,)).fetchone()
+            if row is not None and self.ttl_seconds is not None \
+                    and now - row[1] > self.ttl_seconds:
+                connection.execute('DELETE FROM verdicts WHERE key = ?', (key,))
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            connection.execute('UPDATE verdicts SET last_access = ? WHERE key = ?',
+                               (now, key))
+            self.hits += 1
+            return bool(row[0])
+
+    def put(self, model, requirement, test_content_hash, verdict):
+        key = self.key(model, requirement, test_content_hash)
+        now = self.clock()
+        with self._lock, self._connect() as connection:
+            connection.execute(
+                'INSERT OR REPLACE INTO verdicts '
+                '(key, verdict, created_at, last_access) VALUES (?, ?, ?, ?)',
+                (key, int(bool(verdict)), now, now)
+            )
+            count = connection.execute('SELECT COUNT(*) FROM verdicts').fetchone()[0]
+            excess = count - self.max_entries
+            if excess > 0:
+                connection.execute(
+                    'DELETE FROM verdicts WHERE key IN '
+                    '(SELECT key FROM verdicts ORDER BY last_access ASC LIMIT ?)',
+                    (excess,)
+                )
+                self.evictions += excess
+
+    def __len__(self):
+        with self._connect() as connection:
+            return connection.execute('SELECT COUNT(*) FROM verdicts').fetchone()[0]
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
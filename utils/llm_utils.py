@@ -1,11 +1,66 @@
 import os
+import json
 import openai
 import logging
+import threading
 from openai import OpenAI
+from utils.llm_cache import content_hash
 
 # Setup logging
 logger = logging.getLogger(__name__)
 
+DEFAULT_MODEL = "gpt-4o"
+
+# Shared client, created on first use
+_client = None
+
+
+class AssessmentError(Exception):
+    """Raised when none of the requirements could be assessed."""
+
+
+class LLMUsage:
+    """
+    Counts the LLM requests of an evaluation and the tokens they used, as reported by
+    the API.
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.failed_requests = 0
+        self.retries = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self._lock = threading.Lock()
+
+    def record_response(self, response):
+        usage = getattr(response, 'usage', None)
+        with self._lock:
+            self.requests += 1
+            if usage is not None:
+                self.prompt_tokens += usage.prompt_tokens or 0
+                self.completion_tokens += usage.completion_tokens or 0
+
+    def record_failure(self):
+        with self._lock:
+            self.requests += 1
+            self.failed_requests += 1
+
+    def record_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def stats(self):
+        return {
+            'requests': self.requests,
+            'failed_requests': self.failed_requests,
+            'retries': self.retries,
+            'prompt_tokens': self.prompt_tokens,
+            'completion_tokens': self.completion_tokens,
+            'total_tokens': self.prompt_tokens + self.completion_tokens,
+        }
+
+
 def initialize_openai_client():
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
@@ -14,35 +69,176 @@ def initialize_openai_client():
     return client
 
 
-def assess_semantic_correctness(test_directory, description):
-    try:
-        client = initialize_openai_client()
-        # Collect all test files
-        test_files_content = ""
-        for root, dirs, files in os.walk(test_directory):
-            for file in files:
-                if file.endswith('.py'):
-                    with open(os.path.join(root, file), 'r') as f:
-                        test_files_content += f.read() + "\n"
-        
-        # Construct prompt for OpenAI
-        prompt = f"""
+def get_openai_client():
+    global _client
+    if _client is None:
+        _client = initialize_openai_client()
+    return _client
+
+
+def read_test_corpus(test_directory):
+    # Collect all test files
+    test_files_content = ""
+    for root, dirs, files in os.walk(test_directory):
+        dirs.sort()
+        for file in sorted(files):
+            if file.endswith('.py'):
+                with open(os.path.join(root, file), 'r') as f:
+                    test_files_content += f.read() + "\n"
+    return test_files_content
+
+
+def collect_test_context(test_directory, descriptions, retriever=None):
+    """
+    Returns:
+        - Dictionary mapping each description to the test code snippets relevant to it:
+          the whole corpus, or only the functions the retriever selects for it.
+    """
+    if retriever is None:
+        test_files_content = read_test_corpus(test_directory)
+        return {description: [test_files_content] for description in descriptions}
+    return retriever(descriptions)
+
+
+def batch_test_content(test_context, batch):
+    # Union of the snippets relevant to any requirement in the batch, each included once
+    snippets = []
+    for description in batch:
+        for snippet in test_context[description]:
+            if snippet not in snippets:
+                snippets.append(snippet)
+    return "\n".join(snippets)
+
+
+def build_batch_prompt(test_files_content, descriptions):
+    requirements = "\n".join(f"{number}. {description}"
+                             for number, description in enumerate(descriptions, 1))
+    return f"""
         You are an expert software engineer.
         Given the following tests:\n{test_files_content}\n
-        Assess whether the tests cover the requirement: "{description}".
-        Respond with "Yes" if the tests cover it, or "No" otherwise.
+        Assess, for each numbered requirement below, whether the tests cover it.
+        Requirements:\n{requirements}\n
+        Respond with a JSON object of the form
+        {{"verdicts": [{{"id": <requirement number>, "covered": true or false}}]}}
+        containing one entry per requirement.
         """
-        
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": "You are a software testing expert."},
-                {"role": "user", "content": prompt}
-            ]
-        )
-        
-        answer = response.choices[0].message.content.strip().lower()
-        return "yes" in answer
+
+
+def parse_batch_verdicts(answer, descriptions):
+    # Only the requirements the answer gives a verdict for; omitted ones stay unassessed
+    # and uncached
+    verdicts = {}
+    for verdict in json.loads(answer).get('verdicts', []):
+        number = verdict.get('id')
+        if isinstance(number, int) and 1 <= number <= len(descriptions) \
+                and isinstance(verdict.get('covered'), bool):
+            verdicts[descriptions[number - 1]] = verdict['covered']
+    if len(verdicts) < len(descriptions):
+        logger.warning("LLM answer has no verdict for "
+                       f"{len(descriptions) - len(verdicts)} of "
+                       f"{len(descriptions)} requirements; they are retried on the "
+                       "next run")
+    return verdicts
+
+
+def lookup_cached_verdicts(cache, model, descriptions, content_hashes, verdicts):
+    # Fills verdicts from the cache and returns the descriptions still needing an LLM
+    # verdict
+    if cache is None:
+        return list(descriptions)
+    pending = []
+    for description in descriptions:
+        cached = cache.get(model, description, content_hashes[description])
+        if cached is None:
+            pending.append(description)
+        else:
+            verdicts[description] = cached
+    return pending
+
+
+def assess_requirements(test_directory, descriptions, client=None, model=DEFAULT_MODEL,
+                        batch_size=25, cache=None, retriever=None, usage=None):
+    """
+    Assesses whether the tests cover each requirement, batching requirements into few
+    requests.
+    Parameters:
+        - test_directory: Directory containing the test files (read at most once).
+        - descriptions: Requirement descriptions to assess.
+        - client: OpenAI client. Defaults to the shared client.
+        - model: Chat model name.
+        - batch_size: Maximum number of requirements per request.
+        - cache: Optional VerdictCache; only requirements missing from it are sent to
+          the LLM.
+        - retriever: Optional callable mapping descriptions to their relevant test
+          snippets (e.g. EmbeddingIndex.retrieve); without it every prompt carries the
+          whole corpus.
+        - usage: Optional LLMUsage recording the requests made and their token counts.
+    Returns:
+        - Dictionary mapping each assessed description to True if the tests cover it.
+          Requirements whose request fails, or that the answer leaves out, are missing
+          from it and not cached.
+    Raises:
+        - AssessmentError if no requirement could be assessed; errors reading the tests
+          or creating the client are raised as they are.
+    """
+    descriptions = list(dict.fromkeys(descriptions))
+    verdicts = {}
+    if not descriptions:
+        return verdicts
+
+    test_context = collect_test_context(test_directory, descriptions, retriever)
+    content_hashes = {description: content_hash("\n".join(test_context[description]))
+                      for description in descriptions}
+    pending = lookup_cached_verdicts(cache, model, descriptions, content_hashes,
+                                     verdicts)
+    if not pending:
+        return verdicts
+    client = client or get_openai_client()
+
+    for start in range(0, len(pending), batch_size):
+        batch = pending[start:start + batch_size]
+        prompt = build_batch_prompt(batch_test_content(test_context, batch), batch)
+        try:
+            try:
+                response = client.chat.completions.create(
+                    model=model,
+                    messages=[
+                        {"role": "system",
+                         "content": "You are a software testing expert."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    response_format={"type": "json_object"}
+                )
+            except Exception:
+                if usage is not None:
+                    usage.record_failure()
+                raise
+            if usage is not None:
+                usage.record_response(response)
+            answer = response.choices[0].message.content
+            batch_verdicts = parse_batch_verdicts(answer, batch)
+            verdicts.update(batch_verdicts)
+            if cache is not None:
+                for description, verdict in batch_verdicts.items():
+                    cache.put(model, description, content_hashes[description], verdict)
+        except Exception as e:
+            logger.error(f"LLM assessment failed for {len(batch)} requirements: {e}")
+    return check_assessed(descriptions, verdicts)
+
+
+def check_assessed(descriptions, verdicts):
+    if not verdicts:
+        raise AssessmentError(f"None of the {len(descriptions)} requirements could be "
+                              "assessed")
+    if len(verdicts) < len(descriptions):
+        logger.warning(f"{len(descriptions) - len(verdicts)} of {len(descriptions)} "
+                       "requirements were not assessed")
+    return verdicts
+
+
+def assess_semantic_correctness(test_directory, description):
+    try:
+        return assess_requirements(test_directory, [description])[description]
     except Exception as e:
         logger.error(f"LLM assessment failed: {e}")
         return False
@@ -1,7 +1,26 @@
 # utils/logger.py
+import atexit
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 
-def setup_logger(name, log_file, level=logging.INFO):
+# Listeners writing the records of queued loggers, stopped (and so flushed) at exit
+_listeners = []
+
+
+def setup_logger(name, log_file, level=logging.INFO, queued=True):
+    """
+    Logs to log_file and the console.
+    Parameters:
+        - name: Logger name; loggers below it (e.g. 'src' for 'src.utilities') use the
+          same handlers.
+        - log_file: File the records are appended to.
+        - level: Minimum level of the records.
+        - queued: Hand records to a background thread that writes them, so logging calls
+          never wait for file or console I/O.
+    Returns:
+        - The configured logger.
+    """
     formatter = logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s')
 
     handler = logging.FileHandler(log_file)
@@ -12,7 +31,22 @@ def setup_logger(name, log_file, level=logging.INFO):
 
     logger = logging.getLogger(name)
     logger.setLevel(level)
-    logger.addHandler(handler)
-    logger.addHandler(stream_handler)
+    if queued:
+        records = queue.SimpleQueue()
+        listener = QueueListener(records, handler, stream_handler,
+                                 respect_handler_level=True)
+        listener.start()
+        _listeners.append(listener)
+        logger.addHandler(QueueHandler(records))
+    else:
+        logger.addHandler(handler)
+        logger.addHandler(stream_handler)
 
     return logger
+
+
+@atexit.register
+def stop_listeners():
+    # Writes out the records still queued
+    while _listeners:
+        _listeners.pop().stop()
@@ -0,0 +1,217 @@
+# utils/mutation_engine.py
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from mutmut import (
+    Context,
+    RelativeMutationID,
+    list_mutations,
+    mutate,
+    python_source_files,
+)
+from utils.coverage_analysis import read_line_contexts  # noqa: F401 (re-exported)
+from utils.instrumentation import record_child_usage, run_command
+from utils.sharding import read_test_durations  # noqa: F401 (re-exported)
+
+logger = logging.getLogger(__name__)
+
+# Files and directories not copied into the per-worker sandboxes: VCS data,
+# environments, and the evaluator's outputs and state (caches, batch workdirs, the
+# embedding index), which grow from run to run
+SANDBOX_IGNORE = shutil.ignore_patterns(
+    '.git', '__pycache__', '*.pyc', '.pytest_cache', '.mutmut-cache', 'venv', '.venv',
+    '.coverage', '.coverage.*', '.report.json', '.report.json.*', '.ufem-*',
+    'embeddings',
+    'evaluation_report.json', 'evaluation_trace.json', 'batch_report.json'
+)
+
+# pytest's exit code when the tests ran and some failed. Other non-zero codes
+# (interrupted, internal or usage error, nothing collected, a crash) mean the run itself
+# went wrong, which says nothing about the mutant.
+PYTEST_TESTS_FAILED = 1
+
+# Per-process state of a mutation worker, set up by _init_worker
+_worker_state = {}
+
+
+class Mutant:
+    def __init__(self, filename, line, index, line_number, operator=None):
+        self.filename = filename
+        self.line = line
+        self.index = index
+        self.line_number = line_number  # 0-based, as in mutmut
+        # parso node type mutmut mutated, e.g. 'operator' or 'number'
+        self.operator = operator
+
+    @property
+    def id(self):
+        return f"{self.filename}:{self.line_number + 1}:{self.index}"
+
+    def mutation_id(self):
+        return RelativeMutationID(line=self.line, index=self.index,
+                                  line_number=self.line_number,
+                                  filename=self.filename)
+
+    def __repr__(self):
+        return f"Mutant({self.id})"
+
+
+class _OperatorTrackingContext(Context):
+    # mutmut calls should_mutate with the node right before recording each mutation
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.operators = []
+
+    def should_mutate(self, node):
+        should_mutate = super().should_mutate(node)
+        if should_mutate:
+            self.operators.append(node.type)
+        return should_mutate
+
+
+def list_mutants(paths_to_mutate, tests_dir, covered_lines=None):
+    """
+    Enumerates the same mutants `mutmut run` would generate.
+    If covered_lines is given, mutants on lines no test executes are skipped (like
+    `--use-coverage`).
+    """
+    mutants = []
+    for path in paths_to_mutate.split(','):
+        for filename in python_source_files(path.strip(),
+                                            [os.path.normpath(tests_dir)]):
+            filename = os.path.normpath(filename)
+            if covered_lines is not None and filename not in covered_lines:
+                continue
+            with open(filename) as f:
+                context = _OperatorTrackingContext(source=f.read(), filename=filename)
+            mutation_ids = list_mutations(context)
+            for mutation_id, operator in zip(mutation_ids, context.operators):
+                if covered_lines is not None \
+                        and mutation_id.line_number + 1 not in covered_lines[filename]:
+                    continue
+                mutants.append(Mutant(filename, mutation_id.line, mutation_id.index,
+                                      mutation_id.line_number, operator=operator))
+    return mutants
+
+
+def filter_covered_mutants(mutants, covered_lines):
+    # Same selection as list_mutants(covered_lines=...), for mutants listed once and
+    # shared by several test suites
+    return [mutant for mutant in mutants
+            if mutant.line_number + 1 in covered_lines.get(mutant.filename, ())]
+
+
+def select_tests(mutant, line_contexts):
+    # None means the line only runs at import time, so every test may be affected
+    tests = line_contexts.get(mutant.filename, {}).get(mutant.line_number + 1)
+    return tests or None
+
+
+def mutant_timeout(tests, durations, timeout_factor, timeout_constant):
+    if tests is None:
+        baseline = sum(durations.values())
+    else:
+        baseline = sum(durations.get(test, 0.0) for test in tests)
+    return baseline * timeout_factor + timeout_constant
+
+
+def _init_worker(project_dir, sandbox_root):
+    # Each worker mutates its own copy of the project so mutants never see each other
+    sandbox = tempfile.mkdtemp(dir=sandbox_root)
+    root = os.path.join(sandbox, 'project')
+    shutil.copytree(project_dir, root, ignore=SANDBOX_IGNORE)
+    _worker_state['root'] = root
+
+
+def _run_mutant(mutant, tests, tests_dir, timeout):
+    root = _worker_state['root']
+    path = os.path.join(root, mutant.filename)
+    with open(path) as f:
+        original = f.read()
+    mutated, _ = mutate(Context(source=original, mutation_id=mutant.mutation_id(),
+                                filename=mutant.filename))
+
+    command = [sys.executable, '-m', 'pytest', '-x', '-q', '-p', 'no:cacheprovider',
+               '--disable-warnings']
+    command += tests if tests is not None else [tests_dir]
+    # Mutants often keep the file size, so stale bytecode could mask them
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE='1')
+    usage = None
+    try:
+        with open(path, 'w') as f:
+            f.write(mutated)
+        returncode, usage = run_command(command, cwd=root, env=env,
+                                        stdout=subprocess.DEVNULL,
+                                        stderr=subprocess.DEVNULL, timeout=timeout)
+        if returncode == 0:
+            status = 'survived'
+        elif returncode == PYTEST_TESTS_FAILED:
+            status = 'killed'
+        else:
+            status = 'error'
+    except subprocess.TimeoutExpired:
+        status = 'timeout'
+    finally:
+        with open(path, 'w') as f:
+            f.write(original)
+    # The pytest run's resource usage goes back to the parent, which attributes it to
+    # its stage
+    return status, usage
+
+
+def run_mutation_tests(mutants, line_contexts, durations, tests_dir='tests/',
+                       project_dir='.', workers=None, timeout_factor=2.0,
+                       timeout_constant=10.0, on_result=None):
+    """
+    Runs each mutant against the tests covering its line, spread across a worker-process
+    pool.
+    Parameters:
+        - on_result: Optional callable receiving each result dictionary as soon as its
+          mutant finishes.
+    Returns:
+        - List of result dictionaries with the mutant id, file, line and status:
+          'killed' (a test failed), 'survived', 'timeout' or 'error' (the test run
+          itself failed, e.g. on a collection error).
+    """
+    results = []
+    if not mutants:
+        return results
+
+    workers = workers or os.cpu_count() or 1
+    logger.info(f"Running {len(mutants)} mutants on {workers} workers...")
+    with tempfile.TemporaryDirectory(prefix='ufem-mutants-') as sandbox_root:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(os.path.abspath(project_dir),
+                                           sandbox_root)) as pool:
+            futures = {}
+            for mutant in mutants:
+                tests = select_tests(mutant, line_contexts)
+                timeout = mutant_timeout(tests, durations, timeout_factor,
+                                         timeout_constant)
+                future = pool.submit(_run_mutant, mutant, tests, tests_dir, timeout)
+                futures[future] = mutant
+
+            for future in as_completed(futures):
+                mutant = futures[future]
+                status, usage = future.result()
+                record_child_usage(usage)
+                logger.debug(f"Mutant {mutant.id}: {status}")
+                result = {
+                    'id': mutant.id,
+                    'filename': mutant.filename,
+                    'line_number': mutant.line_number + 1,
+                    'operator': mutant.operator,
+                    'status': status
+                }
+                results.append(result)
+                if on_result is not None:
+                    on_result(result)
+
+    results.sort(key=lambda result: (result['filename'], result['line_number'],
+                                     result['id']))
+    return results
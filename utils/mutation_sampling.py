@@ -0,0 +1,130 @@
+# utils/mutation_sampling.py
+import math
+import random
+from statistics import NormalDist
+
+
+def _z_score(confidence):
+    return NormalDist().inv_cdf(0.5 + confidence / 2.0)
+
+
+def stratum_of(mutant):
+    return (mutant.filename, mutant.operator)
+
+
+def required_sample_size(population, margin_of_error, confidence=0.95):
+    """
+    Number of mutants needed to estimate the kill rate within margin_of_error (0-1).
+    Uses the worst-case proportion p = 0.5 with a finite population correction.
+    """
+    if population == 0:
+        return 0
+    if not 0 < margin_of_error < 1:
+        raise ValueError("margin_of_error must be between 0 and 1")
+    n0 = (_z_score(confidence) ** 2) * 0.25 / (margin_of_error ** 2)
+    return min(population, math.ceil(n0 / (1 + (n0 - 1) / population)))
+
+
+def _allocate(populations, sample_size):
+    # Proportional allocation rounded by largest remainder, with at least one mutant per
+    # stratum
+    total = sum(populations.values())
+    keys = sorted(populations)
+    if sample_size >= total:
+        return dict(populations)
+    if sample_size <= len(keys):
+        return {key: 1 for key in keys}
+
+    quotas = {key: sample_size * populations[key] / total for key in keys}
+    allocation = {key: int(quotas[key]) for key in keys}
+    leftover = sample_size - sum(allocation.values())
+    by_remainder = sorted(keys, key=lambda k: quotas[k] - int(quotas[k]), reverse=True)
+    for key in by_remainder[:leftover]:
+        allocation[key] += 1
+    for key in keys:
+        if allocation[key] == 0:
+            largest = max(keys, key=lambda k: allocation[k])
+            allocation[largest] -= 1
+            allocation[key] = 1
+    return allocation
+
+
+def stratified_sample(mutants, sample_size, seed=None):
+    """
+    Draws a random sample of mutants stratified by module and mutation operator.
+    Returns:
+        - The sampled mutants.
+        - Dictionary mapping each stratum to the number of mutants in the full
+          population.
+    """
+    strata = {}
+    for mutant in mutants:
+        strata.setdefault(stratum_of(mutant), []).append(mutant)
+    populations = {key: len(members) for key, members in strata.items()}
+    allocation = _allocate(populations, sample_size)
+
+    rng = random.Random(seed)
+    sample = []
+    for key in sorted(strata):
+        sample.extend(rng.sample(strata[key], allocation[key]))
+    return sample, populations
+
+
+def estimate_kill_rate(results, populations, confidence=0.95):
+    """
+    Stratified estimate of the kill rate from sampled mutation results.
+    As in the full run, only killed and survived mutants are rated; timeouts and errors
+    are left out, and strata without a rated mutant are left out of the weights.
+    Returns:
+        - Dictionary with the point estimate and confidence interval (percentages) and
+          per-stratum counts.
+    """
+    population = sum(populations.values())
+    sampled = {}
+    for result in results:
+        key = (result['filename'], result['operator'])
+        counts = sampled.setdefault(key, {'sampled': 0, 'killed': 0, 'survived': 0})
+        counts['sampled'] += 1
+        if result['status'] in ('killed', 'survived'):
+            counts[result['status']] += 1
+
+    strata = []
+    for key in sorted(populations):
+        counts = sampled.get(key, {'sampled': 0, 'killed': 0, 'survived': 0})
+        strata.append({
+            'module': key[0],
+            'operator': key[1],
+            'population': populations[key],
+            'sampled': counts['sampled'],
+            'killed': counts['killed'],
+            'survived': counts['survived']
+        })
+
+    rated = [stratum for stratum in strata
+             if stratum['killed'] + stratum['survived'] > 0]
+    rated_population = sum(stratum['population'] for stratum in rated)
+    estimate = 0.0
+    variance = 0.0
+    for stratum in rated:
+        size = stratum['population']
+        decided = stratum['killed'] + stratum['survived']
+        weight = size / rated_population
+        rate = stratum['killed'] / decided
+        estimate += weight * rate
+        # Small strata are often all killed or all survived; the adjusted rate keeps
+        # their variance non-zero
+        adjusted_rate = (stratum['killed'] + 0.5) / (decided + 1)
+        finite_correction = 1 - decided / size
+        variance += (weight ** 2 * finite_correction
+                     * adjusted_rate * (1 - adjusted_rate) / decided)
+
+    half_width = _z_score(confidence) * math.sqrt(variance)
+    return {
+        'estimate': estimate * 100.0,
+        'confidence': confidence,
+        'interval': [max(0.0, estimate - half_width) * 100.0,
+                     min(1.0, estimate + half_width) * 100.0],
+        'population': population,
+        'sample_size': len(results),
+        'strata': strata
+    }
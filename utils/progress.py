@@ -0,0 +1,122 @@
+# utils/progress.py
+import json
+import logging
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Event types, in the order a stage goes through them
+RUN_START = 'run_start'
+START = 'start'
+PROGRESS = 'progress'
+RESULT = 'result'
+ERROR = 'error'
+RUN_END = 'run_end'
+
+
+class ProgressStream:
+    """
+    Writes evaluation events as NDJSON, one flushed line per event, and keeps them for
+    assembling the report. Every event has 'event' (one of the types above) and 'time'
+    (seconds since the epoch); stage events also have 'stage'.
+    Parameters:
+        - path: File to write to, replacing its contents; '-' writes to stdout; None
+          only keeps the events.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.events = []
+        self._lock = threading.Lock()
+        if path == '-':
+            self._file = sys.stdout
+        elif path is not None:
+            self._file = open(path, 'w')
+        else:
+            self._file = None
+
+    @property
+    def to_stdout(self):
+        return self.path == '-'
+
+    def emit(self, event, **fields):
+        record = {'event': event, 'time': time.time(), **fields}
+        line = json.dumps(record, default=_to_json)
+        with self._lock:
+            self.events.append(json.loads(line))
+            if self._file is not None:
+                self._file.write(line + '\n')
+                self._file.flush()
+
+    def close(self):
+        if self._file is not None and self._file is not sys.stdout:
+            self._file.close()
+        self._file = None
+
+
+def _to_json(value):
+    # Sets and tuples show up in stage results; anything else unserializable is a bug
+    if isinstance(value, (set, frozenset, tuple)):
+        return sorted(value) if isinstance(value, (set, frozenset)) else list(value)
+    raise TypeError(f"Object of type {value.__class__.__name__} is not JSON "
+                    "serializable")
+
+
+def read_events(path):
+    """
+    Returns:
+        - The events of the last run in an NDJSON stream. A partly written last line,
+          left by a killed run, is ignored.
+    """
+    events = []
+    with open(path, 'r') as f:
+        for line in f:
+            try:
+                event = json.loads(line)
+            except ValueError:
+                logger.warning(f"Ignoring unreadable line in {path}")
+                continue
+            if event.get('event') == RUN_START:
+                events = []
+            events.append(event)
+    return events
+
+
+def completed_stages(events):
+    """
+    Returns:
+        - Dictionary mapping each stage with a result event to that event.
+    """
+    return {event['stage']: event for event in events if event['event'] == RESULT}
+
+
+def assemble_report(events, components):
+    """
+    Builds the evaluation report from a run's events.
+    Parameters:
+        - events: The run's events, e.g. ProgressStream.events or read_events().
+        - components: Names of the stages whose results are component scores, in report
+          order.
+    Returns:
+        - The report. A run without a run_end event gets the scores finished so far and
+          'Status': 'incomplete' instead of a UFEM score.
+    """
+    results = completed_stages(events)
+    scores = {key: results[key]['value'] for key in components if key in results}
+    details = {key: results[key]['details'] for key in components
+               if key in results and results[key].get('details') is not None}
+    end = next((event for event in reversed(events) if event['event'] == RUN_END), None)
+
+    report = {}
+    if end is not None:
+        report['UFEM Score'] = end['ufem']
+    else:
+        report['Status'] = 'incomplete'
+    report['Component Scores'] = scores
+    if details:
+        report['Component Details'] = details
+    if end is not None and end.get('statistics'):
+        report['Run Statistics'] = end['statistics']
+    return report
@@ -0,0 +1,167 @@
+# utils/scheduler.py
+import functools
+import logging
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+
+from utils.instrumentation import measure_call
+
+logger = logging.getLogger(__name__)
+
+
+class SchedulerError(Exception):
+    pass
+
+
+class MetricTask:
+    """
+    A unit of work for run_tasks.
+    Parameters:
+        - name: Task name used in logs.
+        - func: Callable receiving each of its needs as a keyword argument.
+        - needs: Names of the resources the task consumes.
+        - produces: Name of the resource the task's return value is stored under.
+          Defaults to name.
+        - executor: 'thread' for I/O-bound work, 'process' for CPU-bound work.
+          Process tasks must be picklable module-level functions.
+    """
+
+    def __init__(self, name, func, needs=(), produces=None, executor='thread'):
+        if executor not in ('thread', 'process'):
+            raise ValueError(f"Unsupported executor for task '{name}': {executor}")
+        self.name = name
+        self.func = func
+        self.needs = tuple(needs)
+        self.produces = produces or name
+        self.executor = executor
+
+    def __repr__(self):
+        return (f"MetricTask({self.name!r}, needs={list(self.needs)}, "
+                f"produces={self.produces!r})")
+
+
+def validate_tasks(tasks):
+    producers = {}
+    for task in tasks:
+        if task.produces in producers:
+            raise SchedulerError(f"Resource '{task.produces}' is produced by both "
+                                 f"'{producers[task.produces].name}' and '{task.name}'")
+        producers[task.produces] = task
+
+    for task in tasks:
+        for need in task.needs:
+            if need not in producers:
+                raise SchedulerError(f"Task '{task.name}' needs '{need}' but no task "
+                                     "produces it")
+
+    # Kahn's algorithm; anything left over is part of a cycle
+    remaining = {task.name: set(task.needs) for task in tasks}
+    available = set()
+    progress = True
+    while remaining and progress:
+        progress = False
+        for task in tasks:
+            if task.name in remaining and remaining[task.name] <= available:
+                del remaining[task.name]
+                available.add(task.produces)
+                progress = True
+    if remaining:
+        raise SchedulerError(f"Dependency cycle between tasks: {sorted(remaining)}")
+
+
+def select_tasks(tasks, targets):
+    """
+    Returns the tasks needed to produce the target resources, in declaration order.
+    """
+    producers = {task.produces: task for task in tasks}
+    required = set()
+    stack = list(targets)
+    while stack:
+        resource = stack.pop()
+        if resource in required:
+            continue
+        if resource not in producers:
+            raise SchedulerError(f"No task produces '{resource}'")
+        required.add(resource)
+        stack.extend(producers[resource].needs)
+    return [task for task in tasks if task.produces in required]
+
+
+def run_tasks(tasks, max_workers=4, measurements=None, resources=None, on_start=None,
+              on_finish=None):
+    """
+    Runs tasks as soon as their needs are available, with at most max_workers running at
+    once.
+    Parameters:
+        - measurements: Optional dictionary each task's timing and resource measurement
+          (see instrumentation.measure) is stored in, keyed by task name.
+        - resources: Resources already available, e.g. from an interrupted run; tasks
+          producing them are not run.
+        - on_start: Optional callable receiving each task as it is submitted.
+        - on_finish: Optional callable receiving each task and its result as it
+          finishes.
+    Returns:
+        - Dictionary mapping each produced resource name to the value its task returned.
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+    validate_tasks(tasks)
+
+    resources = dict(resources or {})
+    pending = [task for task in tasks if task.produces not in resources]
+    running = {}
+    uses_processes = any(task.executor == 'process' for task in tasks)
+
+    thread_pool = ThreadPoolExecutor(max_workers=max_workers)
+    process_pool = None
+    if uses_processes:
+        process_pool = ProcessPoolExecutor(max_workers=max_workers)
+    try:
+        while pending or running:
+            # Submit every ready task (in declaration order) up to the concurrency cap
+            for task in list(pending):
+                if len(running) >= max_workers:
+                    break
+                if not all(need in resources for need in task.needs):
+                    continue
+                pending.remove(task)
+                kwargs = {need: resources[need] for need in task.needs}
+                pool = process_pool if task.executor == 'process' else thread_pool
+                logger.debug(f"Starting task '{task.name}' on {task.executor} executor")
+                if on_start is not None:
+                    on_start(task)
+                func = task.func
+                if measurements is not None:
+                    func = functools.partial(measure_call, task.name, task.func)
+                running[pool.submit(func, **kwargs)] = task
+
+            if not running:
+                raise SchedulerError("No runnable tasks left: "
+                                     f"{[task.name for task in pending]}")
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                task = running.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.error(f"Task '{task.name}' failed: {e}")
+                    raise SchedulerError(f"Task '{task.name}' failed: {e}") from e
+                if measurements is not None:
+                    result, measurements[task.name] = result
+                resources[task.produces] = result
+                logger.debug(f"Finished task '{task.name}'")
+                if on_finish is not None:
+                    on_finish(task, result)
+    finally:
+        for future in running:
+            future.cancel()
+        thread_pool.shutdown(wait=True)
+        if process_pool is not None:
+            process_pool.shutdown(wait=True)
+
+    return resources
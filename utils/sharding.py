@@ -0,0 +1,155 @@
+# utils/sharding.py
+import heapq
+import json
+import logging
+import os
+import statistics
+
+logger = logging.getLogger(__name__)
+
+# pytest exit codes: tests failed, no tests collected
+TESTS_FAILED = 1
+NO_TESTS_COLLECTED = 5
+
+
+def read_test_durations(json_report):
+    """
+    Returns:
+        - Dictionary mapping each test node id in a pytest JSON report to its setup,
+          call and teardown seconds combined.
+    """
+    with open(json_report, 'r') as f:
+        report = json.load(f)
+    durations = {}
+    for test in report.get('tests', []):
+        durations[test['nodeid']] = sum(
+            test.get(phase, {}).get('duration', 0.0)
+            for phase in ('setup', 'call', 'teardown')
+        )
+    return durations
+
+
+def list_test_files(path):
+    """
+    Returns:
+        - The test modules pytest collects by default under a directory (test_*.py and
+          *_test.py), sorted, or [path] for anything else, e.g. a file or node id.
+    """
+    if not os.path.isdir(path):
+        return [path]
+    files = []
+    for root, dirs, names in os.walk(path):
+        dirs[:] = sorted(d for d in dirs if not d.startswith('.')
+                         and d != '__pycache__')
+        files += [os.path.join(root, name) for name in sorted(names)
+                  if name.endswith('.py')
+                  and (name.startswith('test_') or name.endswith('_test.py'))]
+    return files
+
+
+def _target_duration(target, durations):
+    # A target is a test file, or a node id selecting one test or class of tests
+    path = os.path.normpath(target.split('::')[0])
+    selector = target[len(target.split('::')[0]):]
+    total = None
+    for nodeid, duration in durations.items():
+        node_path = os.path.normpath(nodeid.split('::')[0])
+        node_selector = nodeid[len(nodeid.split('::')[0]):]
+        if node_path == path and (not selector or node_selector == selector
+                                  or node_selector.startswith(selector + '::')):
+            total = (total or 0.0) + duration
+    return total
+
+
+def plan_shards(targets, durations, shards):
+    """
+    Splits pytest targets into shards of similar expected duration, longest first onto
+    the shard with the least work (LPT scheduling).
+    Parameters:
+        - targets: Test files or node ids.
+        - durations: Historical seconds per test node id (see read_test_durations).
+          Targets without history are assumed to take the median duration of those with
+          history.
+        - shards: Maximum number of shards.
+    Returns:
+        - Non-empty lists of targets, each keeping the given order.
+    """
+    if not targets:
+        return []
+    expected = {target: _target_duration(target, durations) for target in targets}
+    known = [duration for duration in expected.values() if duration is not None]
+    default = statistics.median(known) if known else 1.0
+    expected = {target: default if duration is None else duration
+                for target, duration in expected.items()}
+
+    loads = [(0.0, shard) for shard in range(min(shards, len(targets)))]
+    assignment = {}
+    for target in sorted(targets, key=lambda target: -expected[target]):
+        load, shard = heapq.heappop(loads)
+        assignment[target] = shard
+        heapq.heappush(loads, (load + expected[target], shard))
+    planned = [[target for target in targets if assignment[target] == shard]
+               for shard in range(len(loads))]
+    return [shard for shard in planned if shard]
+
+
+def combine_exit_codes(exit_codes):
+    """
+    Returns:
+        - The exit code one pytest run over all shards would have had.
+    """
+    errors = [code for code in exit_codes
+              if code not in (0, TESTS_FAILED, NO_TESTS_COLLECTED)]
+    if errors:
+        return errors[0]
+    if TESTS_FAILED in exit_codes:
+        return TESTS_FAILED
+    if exit_codes and all(code == NO_TESTS_COLLECTED for code in exit_codes):
+        return NO_TESTS_COLLECTED
+    return 0
+
+
+def merge_shard_reports(reports, exit_code):
+    """
+    Combines the pytest JSON reports of shards run side by side into the report of one
+    run.
+    Parameters:
+        - reports: The shards' reports, in shard order.
+        - exit_code: The combined exit code (see combine_exit_codes).
+    Returns:
+        - Report with every shard's tests, collectors and warnings, and summed summary
+          counts.
+    """
+    if not reports:
+        return {}
+    merged = dict(reports[0])
+    summary = {}
+    for report in reports:
+        for key, value in report.get('summary', {}).items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                summary[key] = summary.get(key, 0) + value
+    merged['summary'] = summary
+    merged['tests'] = [test for report in reports for test in report.get('tests', [])]
+    merged['collectors'] = [collector for report in reports
+                            for collector in report.get('collectors', [])]
+    warnings = [warning for report in reports for warning in report.get('warnings', [])]
+    if warnings:
+        merged['warnings'] = warnings
+    merged['created'] = min(report.get('created', 0) for report in reports)
+    # The shards ran side by side
+    merged['duration'] = max(report.get('duration', 0) for report in reports)
+    merged['exitcode'] = exit_code
+    return merged
+
+
+def combine_coverage(data_file, shard_files):
+    """
+    Combines the coverage data files of the shards, with their test contexts, into
+    data_file.
+    """
+    import coverage
+
+    cov = coverage.Coverage(data_file=data_file)
+    cov.erase()
+    cov.combine([path for path in shard_files if os.path.exists(path)], keep=False)
+    cov.save()